@@ -98,6 +98,47 @@ DATABASES = {
 }
 
 
+# Cache
+# 추천 결과 캐시는 gunicorn 워커 간 공유되도록 LRU 파일 캐시를 기본으로 사용
+# (MAX_ENTRIES에 도달하면 가장 오래 사용하지 않은 항목부터 제거)
+# REDIS_URL이 설정되면 Redis(maxmemory-policy allkeys-lru 필요)로 전환
+REDIS_URL = os.getenv("REDIS_URL")
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    },
+    "recommendations": {
+        "BACKEND": "product_recommendation.lru_file_cache.LRUFileBasedCache",
+        "LOCATION": BASE_DIR / ".cache" / "recommendations",
+        "TIMEOUT": 600,
+        "OPTIONS": {"MAX_ENTRIES": 5000},
+    },
+}
+
+if REDIS_URL:
+    CACHES["recommendations"] = {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": REDIS_URL,
+        "TIMEOUT": 600,
+    }
+
+
+# 추천 JSON API (비동기 뷰) - 점수 계산 스레드 수, 대기 허용 작업 수, 요청 시간 제한(초)
+RECOMMEND_API_WORKERS = int(os.getenv("RECOMMEND_API_WORKERS", "4"))
+RECOMMEND_API_MAX_PENDING = int(os.getenv("RECOMMEND_API_MAX_PENDING", "16"))
+RECOMMEND_API_TIMEOUT = float(os.getenv("RECOMMEND_API_TIMEOUT", "5"))
+
+# 사용자 프로필이 저장되면 상품 목록 추천을 백그라운드에서 미리 계산해 사용자 캐시에 저장
+USER_RECOMMENDATION_BACKGROUND_REFRESH = os.getenv("USER_RECOMMENDATION_BACKGROUND_REFRESH", "1") == "1"
+
+
+# FSS 예금/적금 API 응답 캐시 - TTL(초)이 지나면 기존 데이터를 반환하면서 백그라운드에서 갱신
+FSS_API_BASE_URL = os.getenv("FSS_API_BASE_URL", "http://finlife.fss.or.kr/finlifeapi")
+FSS_CACHE_TTL = int(os.getenv("FSS_CACHE_TTL", str(6 * 60 * 60)))
+FSS_CACHE_DIR = BASE_DIR / ".cache" / "fss"
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -1,3 +1,18 @@
 from django.contrib import admin
+from .models import FinancialProduct, ProductOption
 
-# Register your models here.
+
+class ProductOptionInline(admin.TabularInline):
+    model = ProductOption
+    extra = 0
+    fields = ['option_key', 'save_term', 'rate_type', 'reserve_type', 'rate', 'max_rate']
+    readonly_fields = fields
+
+
+@admin.register(FinancialProduct)
+class FinancialProductAdmin(admin.ModelAdmin):
+    list_display = ['name', 'category', 'company_name', 'best_rate', 'best_rate_term', 'risk_level', 'updated_at']
+    list_filter = ['category', 'risk_level']
+    search_fields = ['name', 'company_name', 'product_code']
+    readonly_fields = ['updated_at']
+    inlines = [ProductOptionInline]
@@ -1,6 +1,27 @@
+import os
+import sys
+
 from django.apps import AppConfig
 
 
 class ProductRecommendationConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "product_recommendation"
+
+    def ready(self):
+        # 프로필 저장 시 사용자 추천 캐시 백그라운드 갱신
+        from . import signals
+
+        # 웹 서버 프로세스(runserver / WSGI·ASGI 서버)에서만 추천 시스템을 미리 로드
+        # migrate 등 다른 관리 명령에서는 첫 사용 시점까지 로드를 미룸
+        is_manage_command = os.path.basename(sys.argv[0]) == 'manage.py'
+        if is_manage_command and 'runserver' not in sys.argv:
+            return
+        # runserver 자동 리로더의 감시(부모) 프로세스는 요청을 처리하지 않음
+        if 'runserver' in sys.argv and '--noreload' not in sys.argv and os.environ.get('RUN_MAIN') != 'true':
+            return
+
+        from .registry import recommender_registry
+        recommender_registry.warm_up()
+        # 상품 데이터 파일 변경은 요청 경로가 아닌 백그라운드 스레드에서 확인
+        recommender_registry.start_catalog_watcher()
@@ -0,0 +1,105 @@
+import numpy as np
+
+from .catalog import CATEGORIES, RATE_GRADES, TARGET_TYPES, TERM_TYPES
+
+
+# 가입 방법 문자열(예: '영업점,인터넷,스마트폰')을 채널 단위로 나눌 때 쓰는 구분자
+JOIN_CHANNEL_SEPARATOR = ','
+
+# 비트셋 워드 크기 (상품 64개를 uint64 하나로 결합)
+WORD_BITS = 64
+
+# 워드 안의 비트 위치 (np.unpackbits 순서: 바이트 순서대로, 바이트 안에서는 상위 비트부터)
+_WORD_OFFSETS = np.arange(WORD_BITS, dtype=np.int64)
+
+
+class AttributeIndex:
+    """
+    상품 속성 역색인
+    속성값마다 해당 상품 위치의 비트셋(np.packbits 결과를 uint64 워드로 본 것, 상품 64개당 워드 1개)을
+    카탈로그 로드 시 만들어 두고, 조건을 워드 단위 AND/OR로 결합한 뒤
+    0이 아닌 워드만 풀어 후보 인덱스를 만듦 (카탈로그 길이의 bool 배열은 만들지 않음)
+    속성: category, term_type, target_type, rate_grade, bank, join_channel
+    """
+
+    ATTRIBUTES = ('category', 'term_type', 'target_type', 'rate_grade', 'bank', 'join_channel')
+
+    def __init__(self, catalog):
+        self.size = len(catalog)
+        self.word_count = (self.size + WORD_BITS - 1) // WORD_BITS
+        self._bitsets = {attribute: {} for attribute in self.ATTRIBUTES}
+        self._all = self._pack(np.ones(self.size, dtype=bool))
+
+        self._add_coded('category', catalog.category_code, CATEGORIES)
+        self._add_coded('term_type', catalog.term_code, TERM_TYPES)
+        self._add_coded('target_type', catalog.target_code, TARGET_TYPES)
+        self._add_coded('rate_grade', catalog.rate_grade_code, RATE_GRADES)
+        self._add_coded('bank', catalog.bank_code, catalog.banks)
+
+        # 가입 채널: 고유 가입 방법 문자열별로 채널을 나눈 뒤 해당 코드의 상품을 모음
+        channel_codes = {}
+        for code, join_way in enumerate(catalog.join_ways):
+            for channel in join_way.split(JOIN_CHANNEL_SEPARATOR):
+                channel = channel.strip()
+                if channel:
+                    channel_codes.setdefault(channel, []).append(code)
+        for channel, codes in channel_codes.items():
+            self._bitsets['join_channel'][channel] = self._pack(np.isin(catalog.join_way_code, codes))
+
+    def _pack(self, mask):
+        """bool 마스크 → uint64 워드 비트셋 (마지막 워드의 남는 비트는 0)"""
+        packed = np.zeros(self.word_count * (WORD_BITS // 8), dtype=np.uint8)
+        packed[:(self.size + 7) // 8] = np.packbits(mask)
+        return packed.view(np.uint64)
+
+    def _add_coded(self, attribute, codes, values):
+        for code, value in enumerate(values):
+            mask = codes == code
+            if mask.any():
+                self._bitsets[attribute][value] = self._pack(mask)
+
+    def values(self, attribute):
+        """속성의 색인된 값 목록"""
+        return list(self._bitsets[attribute])
+
+    def count(self, attribute, value):
+        bitset = self._bitsets[attribute].get(value)
+        return int(np.unpackbits(bitset.view(np.uint8)).sum()) if bitset is not None else 0
+
+    def bitset(self, filters):
+        """
+        조건에 맞는 상품 비트셋 (uint64 워드 배열)
+        filters: {속성: 값 또는 값 리스트} - 같은 속성의 값끼리는 OR, 속성끼리는 AND
+        알 수 없는 속성이면 ValueError, 색인에 없는 값은 빈 집합
+        """
+        result = self._all.copy()
+        for attribute, values in dict(filters).items():
+            if attribute not in self._bitsets:
+                raise ValueError(f"알 수 없는 필터 속성: {attribute} (가능: {', '.join(self.ATTRIBUTES)})")
+            if isinstance(values, str):
+                values = [values]
+            union = np.zeros_like(result)
+            for value in values:
+                bitset = self._bitsets[attribute].get(value)
+                if bitset is not None:
+                    union |= bitset
+            result &= union
+        return result
+
+    def select(self, filters, indices=None):
+        """
+        조건에 맞는 상품 인덱스 (오름차순)
+        0이 아닌 워드만 골라 푼 뒤 켜진 비트 위치를 인덱스로 변환하므로 결과 크기에 비례
+        indices가 주어지면 그 안에서만 선택 (입력 순서 유지)
+        """
+        words = self.bitset(filters)
+        nonzero = np.flatnonzero(words)
+        bits = np.unpackbits(words[nonzero].view(np.uint8)).reshape(len(nonzero), WORD_BITS)
+        selected = (nonzero[:, None] * WORD_BITS + _WORD_OFFSETS)[bits.astype(bool)]
+        if indices is None:
+            return selected
+        indices = np.asarray(indices, dtype=np.int64)
+        if len(selected) == 0:
+            return indices[:0]
+        positions = np.minimum(np.searchsorted(selected, indices), len(selected) - 1)
+        return indices[selected[positions] == indices]
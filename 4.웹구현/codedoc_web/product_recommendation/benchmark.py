@@ -0,0 +1,245 @@
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import redirect_stdout
+
+import numpy as np
+
+from .catalog_snapshot import CATALOG_FILES
+from .category_recommendations import build_category_inputs
+from .input_parser import parse_user_input
+from .recommendation_cache import RecommendationCache
+from .recommendation_table import enumerate_profiles
+
+
+# 합성 카탈로그의 카테고리별 비중
+CATEGORY_SHARES = {'deposit': 0.3, 'saving': 0.4, 'funds': 0.1, 'stocks': 0.1, 'mmf': 0.1}
+
+BANKS = [
+    '국민은행', '신한은행', '하나은행', '우리은행', '농협은행주식회사', '중소기업은행', '한국산업은행',
+    '부산은행', '대구은행', '광주은행', '제주은행', '전북은행', '경남은행', '주식회사 카카오뱅크',
+    '주식회사 케이뱅크', '토스뱅크 주식회사', '수협은행', '한국스탠다드차타드은행',
+]
+ASSET_MANAGERS = ['삼성자산운용', '미래에셋자산운용', 'KB자산운용', '한국투자신탁운용', '신한자산운용', 'NH-Amundi자산운용']
+NAME_PREFIXES = ['', 'KB', '우리', '하나', 'NH', '신한', 'BNK', 'DGB', '토스', '카카오']
+NAME_KEYWORDS = [
+    '청년', 'MZ', '젊은', '프리미엄', 'VIP', '골드', '특별', '자유', '간편', '생활', '시작', '기본',
+    '가족', '부부', '신혼', '패밀리', '스마트', '알뜰', '행복', '희망', '드림', '더플러스',
+]
+TERM_WORDS = ['', '1년', '2년', '3년', '5년', '6개월', '장기', '단기', '중기', '10년']
+JOIN_WAYS = ['인터넷,스마트폰', '영업점', '영업점,인터넷,스마트폰', '스마트폰', '영업점,인터넷', '전화(텔레뱅킹)']
+FUND_TYPES = ['주식형', '채권형', '혼합형', '재간접형', '파생형']
+SECTORS = ['반도체', '2차전지', '바이오', '금융', '자동차', '인터넷', '화학', '유통']
+
+# 자유 입력 질의 예시 (추천 벤치마크는 프로필 기반 질의와 섞어서, 파싱 벤치마크는 그대로 사용)
+FREE_FORM_QUERIES = [
+    '30세 남성 미혼 월급 350만원 적금 추천해주세요',
+    '40대 기혼 여성인데 연봉 6000만원이고 아이 교육비 모으기 좋은 상품 알려주세요',
+    '25살 사회초년생 세전 280 정도 받는데 주식 투자 시작하고 싶어요',
+    '결혼자금 마련하려고 하는데 예금이랑 적금 중 뭐가 나을까요',
+    '은퇴 후 연금 수급자인데 MMF 단기투자 상품 있나요',
+    '신혼부부 배우자와 함께 월 500만원 소득으로 재테크 포트폴리오 짜고 싶어요',
+    '50세 자영업자 소득 400만 안전한 예치 상품',
+    '20대 여자 독신 월급 250만 코스피 종목 투자',
+]
+
+
+def _product_name(rng, kind):
+    return f"{rng.choice(NAME_PREFIXES)}{rng.choice(NAME_KEYWORDS)} {rng.choice(TERM_WORDS)} {kind}".replace('  ', ' ').strip()
+
+
+def synthetic_category_data(category, count, rng):
+    """FSS API 응답 형식(result.baseList / result.optionList)의 합성 상품 데이터"""
+    base_list = []
+    option_list = []
+    for i in range(count):
+        code = f"{category[:3].upper()}{i:07d}"
+        if category in ('deposit', 'saving'):
+            base_list.append({
+                'fin_prdt_cd': code,
+                'kor_co_nm': rng.choice(BANKS),
+                'fin_prdt_nm': _product_name(rng, '적금' if category == 'saving' else '예금'),
+                'join_way': rng.choice(JOIN_WAYS),
+                'spcl_cnd': f"{rng.choice(NAME_KEYWORDS)} 우대 {rng.choice(TERM_WORDS)} 연 {rng.randint(1, 10) / 10}%p",
+                'max_limit': rng.choice([None, 1000000, 3000000, 10000000]),
+            })
+            for term in rng.sample([6, 12, 24, 36], rng.randint(1, 4)):
+                rate = round(rng.uniform(1.5, 5.5), 2)
+                option_list.append({
+                    'fin_prdt_cd': code,
+                    'save_trm': str(term),
+                    'intr_rate': rate,
+                    'intr_rate2': round(rate + rng.uniform(0, 1.5), 2),
+                })
+        elif category == 'funds':
+            base_list.append({
+                'fin_prdt_cd': code,
+                'kor_co_nm': rng.choice(ASSET_MANAGERS),
+                'fin_prdt_nm': _product_name(rng, '펀드'),
+                'fund_type': rng.choice(FUND_TYPES),
+                'risk_level': str(rng.randint(1, 6)),
+                'min_invest': rng.choice(['10,000원', '100,000원', '1,000,000원']),
+            })
+            option_list.append({'fin_prdt_cd': code, 'return_rate': round(rng.uniform(-10, 25), 2)})
+        elif category == 'stocks':
+            base_list.append({
+                'stock_code': f"{i:06d}",
+                'stock_nm': _product_name(rng, '홀딩스'),
+                'kor_co_nm': rng.choice(ASSET_MANAGERS),
+                'sector': rng.choice(SECTORS),
+                'market_cap': f"{rng.randint(1, 500)}조",
+            })
+            option_list.append({'stock_code': f"{i:06d}", 'change_rate': round(rng.uniform(-8, 8), 2)})
+        else:  # mmf
+            base_list.append({
+                'fin_prdt_cd': code,
+                'kor_co_nm': rng.choice(ASSET_MANAGERS),
+                'fin_prdt_nm': _product_name(rng, 'MMF'),
+                'liquidity': rng.choice(['당일', '익일']),
+                'risk_level': str(rng.randint(5, 6)),
+                'min_invest': rng.choice(['1원', '10,000원']),
+            })
+            option_list.append({'fin_prdt_cd': code, 'return_rate': round(rng.uniform(2.5, 4.0), 2)})
+    return {'result': {'baseList': base_list, 'optionList': option_list}}
+
+
+def write_synthetic_catalog(data_dir, size, seed=0):
+    """카테고리별 합성 상품 JSON 파일 생성 (seed가 같으면 같은 카탈로그)"""
+    rng = random.Random(seed)
+    os.makedirs(data_dir, exist_ok=True)
+    for category, filename in CATALOG_FILES.items():
+        count = max(1, int(size * CATEGORY_SHARES[category]))
+        with open(os.path.join(data_dir, filename), 'w', encoding='utf-8') as f:
+            json.dump(synthetic_category_data(category, count, rng), f, ensure_ascii=False)
+
+
+def query_corpus(count, seed=0):
+    """프로필 기반 질의(로그인 사용자 추천 입력)와 자유 입력 질의를 섞은 한국어 질의 목록"""
+    rng = random.Random(seed)
+    profile_queries = [
+        query for profile in enumerate_profiles() for query in build_category_inputs(profile).values()
+    ]
+    profile_queries = list(dict.fromkeys(profile_queries))
+    return [
+        rng.choice(FREE_FORM_QUERIES) if rng.random() < 0.2 else rng.choice(profile_queries)
+        for _ in range(count)
+    ]
+
+
+def peak_rss_mb():
+    """
+    프로세스 최대 RSS (MB, Linux는 KB 단위, macOS는 바이트 단위)
+    프로세스 전체에서 증가만 하므로 카탈로그 크기별 값은 run_benchmark처럼 별도 프로세스에서 측정
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 1)
+
+
+def latency_summary(latencies_ms, wall_seconds):
+    latencies = np.asarray(latencies_ms, dtype=np.float64)
+    return {
+        'requests': int(len(latencies)),
+        'p50_ms': round(float(np.percentile(latencies, 50)), 3),
+        'p95_ms': round(float(np.percentile(latencies, 95)), 3),
+        'p99_ms': round(float(np.percentile(latencies, 99)), 3),
+        'mean_ms': round(float(latencies.mean()), 3),
+        'throughput_rps': round(len(latencies) / wall_seconds, 1) if wall_seconds else None,
+    }
+
+
+def _reset_caches(recommender):
+    """cold 측정용 캐시 초기화 (공유 캐시는 사용하지 않음)"""
+    recommender._recommendation_cache = RecommendationCache(alias=None)
+    parse_user_input.cache_clear()
+
+
+def replay(recommender, queries, top_n, threads):
+    """질의 재생 - 요청별 지연 시간(ms)과 전체 소요 시간(초)"""
+    latencies = []
+    lock = threading.Lock()
+
+    def run(query):
+        start_time = time.perf_counter()
+        recommender.recommend(query, top_n=top_n, trace=False)
+        elapsed = (time.perf_counter() - start_time) * 1000
+        with lock:
+            latencies.append(elapsed)
+
+    start_time = time.perf_counter()
+    if threads <= 1:
+        for query in queries:
+            run(query)
+    else:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(run, queries))
+    return latencies, time.perf_counter() - start_time
+
+
+def benchmark_catalog(size, queries, work_dir, top_n=5, threads=4, seed=0):
+    """
+    합성 카탈로그 하나에 대한 측정
+    cold: 추천/파싱 캐시를 비운 상태에서 모든 질의 처리, warm: 같은 질의를 캐시가 찬 상태에서 재생
+    """
+    from .matching import HighPerformanceFinancialRecommender
+
+    data_dir = os.path.join(work_dir, f'catalog_{size}')
+    write_synthetic_catalog(data_dir, size, seed)
+
+    with open(os.devnull, 'w') as devnull, redirect_stdout(devnull):
+        start_time = time.perf_counter()
+        recommender = HighPerformanceFinancialRecommender(snapshot_path=None, data_dir=data_dir)
+        load_ms = (time.perf_counter() - start_time) * 1000
+
+        scenarios = {}
+        for thread_count in sorted({1, threads}):
+            suffix = 'single' if thread_count == 1 else f'{thread_count}_threads'
+            _reset_caches(recommender)
+            scenarios[f'cold_{suffix}'] = latency_summary(*replay(recommender, queries, top_n, thread_count))
+            scenarios[f'warm_{suffix}'] = latency_summary(*replay(recommender, queries, top_n, thread_count))
+
+    return {
+        'catalog_size': len(recommender.catalog),
+        'load_ms': round(load_ms, 1),
+        'scenarios': scenarios,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+
+
+def benchmark_catalog_isolated(size, queries, work_dir, top_n=5, threads=4, seed=0):
+    """새 프로세스(spawn)에서 benchmark_catalog 실행 - 이전 크기의 메모리가 peak_rss_mb에 섞이지 않음"""
+    context = multiprocessing.get_context('spawn')
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(benchmark_catalog, size, queries, work_dir, top_n, threads, seed).result()
+
+
+def run_benchmark(sizes, query_count, work_dir, top_n=5, threads=4, seed=0):
+    """
+    전체 벤치마크 결과 (버전 간 비교용 JSON 직렬화 가능 dict)
+    카탈로그 크기마다 별도 프로세스에서 측정하므로 peak_rss_mb는 크기별 최대 RSS
+    """
+    queries = query_corpus(query_count, seed)
+    return {
+        'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'environment': {
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+        },
+        'config': {
+            'sizes': list(sizes),
+            'queries': query_count,
+            'distinct_queries': len(set(queries)),
+            'top_n': top_n,
+            'threads': threads,
+            'seed': seed,
+        },
+        'results': [benchmark_catalog_isolated(size, queries, work_dir, top_n, threads, seed) for size in sizes],
+    }
@@ -0,0 +1,174 @@
+import json
+
+import numpy as np
+
+from .catalog_snapshot import catalog_version
+from .scoring import CATEGORY_CODES, TARGET_CODES, TERM_CODES, ProductScoringEngine
+
+
+CATEGORIES = list(CATEGORY_CODES)
+TERM_TYPES = list(TERM_CODES)
+TARGET_TYPES = list(TARGET_CODES)
+RATE_GRADES = ['excellent', 'good', 'average', 'low']
+
+
+def _intern(values):
+    """반복되는 값을 (코드 배열, 고유값 테이블)로 변환"""
+    table = {}
+    codes = np.array([table.setdefault(value, len(table)) for value in values], dtype=np.int32)
+    return codes, list(table)
+
+
+def _item(value):
+    """넘파이 스칼라(np.str_ 등) → 파이썬 값"""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class _JSONColumn:
+    """JSON 문자열 배열을 인덱스로 접근할 때만 해석 (스냅샷의 max_limit: 숫자/문자열/None 혼합)"""
+
+    def __init__(self, values):
+        self.values = values
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, index):
+        return json.loads(self.values[index])
+
+
+class ProductCatalog:
+    """
+    컬럼형 상품 카탈로그
+    상품별 dict 대신 필드별 병렬 배열로 보관하고, 반복되는 문자열(은행명, 가입 방법, 우대조건)은
+    코드 + 고유값 테이블로 저장해 워커마다 카탈로그를 들고 있을 때의 메모리를 줄임
+    상품 dict는 최종 추천 결과(top-N)에 대해서만 product()로 만듦
+    카테고리별 상품은 CATEGORIES 순서로 연속 구간에 배치
+    columns()/from_columns()로 컬럼 그대로 저장/복원 (스냅샷은 메모리 매핑된 배열을 그대로 사용)
+    """
+
+    # 스냅샷에 저장하는 컬럼: 상품별 배열, 상품별 문자열, 코드가 가리키는 고유값 테이블, max_limit(JSON 문자열)
+    ARRAY_COLUMNS = (
+        'category_code', 'rate', 'is_loan', 'is_investment', 'bank_code', 'join_way_code', 'features_code',
+        'term_code', 'target_code', 'rate_grade_code',
+    )
+    TEXT_COLUMNS = ('name', 'product_id')
+    TABLE_COLUMNS = ('banks', 'join_ways', 'features')
+    COLUMNS = ARRAY_COLUMNS + TEXT_COLUMNS + TABLE_COLUMNS + ('max_limit',)
+
+    def __init__(self, products_by_category):
+        flat = []
+        self.category_ranges = {}
+        for category in CATEGORIES:
+            start = len(flat)
+            flat.extend(products_by_category.get(category, []))
+            self.category_ranges[category] = (start, len(flat))
+
+        self.size = len(flat)
+        self.category_code = np.empty(self.size, dtype=np.int8)
+        for category, (start, end) in self.category_ranges.items():
+            self.category_code[start:end] = CATEGORY_CODES[category]
+
+        self.name = [p['name'] for p in flat]
+        self.product_id = [p['product_id'] for p in flat]
+        self.max_limit = [p['max_limit'] for p in flat]
+        self.rate = np.array([p['rate'] for p in flat], dtype=np.float64)
+        self.is_loan = np.array([bool(p['is_loan']) for p in flat], dtype=bool)
+        self.is_investment = np.array([bool(p['is_investment']) for p in flat], dtype=bool)
+
+        self.bank_code, self.banks = _intern(p['bank'] for p in flat)
+        self.join_way_code, self.join_ways = _intern(p['join_way'] for p in flat)
+        self.features_code, self.features = _intern(p['features'] for p in flat)
+
+        self.term_code = np.array(
+            [TERM_CODES.get(p['term_type'], TERM_CODES['medium_term']) for p in flat], dtype=np.int8
+        )
+        self.target_code = np.array(
+            [TARGET_CODES.get(p['target_type'], TARGET_CODES['general']) for p in flat], dtype=np.int8
+        )
+        self.rate_grade_code = np.array([RATE_GRADES.index(p['rate_grade']) for p in flat], dtype=np.int8)
+
+    @classmethod
+    def from_columns(cls, columns, category_ranges):
+        """
+        columns()로 저장한 배열로 카탈로그 생성 (행별 dict를 만들지 않음)
+        상품명/상품 코드/최고한도는 배열 그대로 두고 product()에서 필요한 행만 변환
+        """
+        catalog = cls.__new__(cls)
+        catalog.category_ranges = {category: tuple(category_ranges[category]) for category in CATEGORIES}
+        catalog.size = len(columns['rate'])
+        for name in cls.ARRAY_COLUMNS + cls.TEXT_COLUMNS:
+            setattr(catalog, name, columns[name])
+        # 고유값 테이블은 작고 점수 엔진/역색인이 순회하므로 리스트로 변환
+        for name in cls.TABLE_COLUMNS:
+            setattr(catalog, name, columns[name].tolist())
+        catalog.max_limit = _JSONColumn(columns['max_limit'])
+        return catalog
+
+    def columns(self):
+        """스냅샷 저장용 컬럼 배열 (max_limit는 pickle 없이 저장하도록 JSON 문자열)"""
+        columns = {name: np.asarray(getattr(self, name)) for name in self.ARRAY_COLUMNS}
+        for name in self.TEXT_COLUMNS + self.TABLE_COLUMNS:
+            columns[name] = np.array([str(value) for value in getattr(self, name)], dtype=str)
+        columns['max_limit'] = np.array(
+            [json.dumps(self.max_limit[index], ensure_ascii=False) for index in range(self.size)], dtype=str
+        )
+        return columns
+
+    def __len__(self):
+        return self.size
+
+    def category_indices(self, category):
+        """카테고리에 속한 전체 상품의 카탈로그 인덱스"""
+        start, end = self.category_ranges.get(category, (0, 0))
+        return np.arange(start, end, dtype=np.int64)
+
+    def category_size(self, category):
+        start, end = self.category_ranges.get(category, (0, 0))
+        return end - start
+
+    def product(self, index):
+        """인덱스의 상품 dict (기존 상품 dict와 같은 키 순서)"""
+        index = int(index)
+        return {
+            'name': _item(self.name[index]),
+            'bank': self.banks[self.bank_code[index]],
+            'rate': float(self.rate[index]),
+            'is_loan': bool(self.is_loan[index]),
+            'is_investment': bool(self.is_investment[index]),
+            'join_way': self.join_ways[self.join_way_code[index]],
+            'features': self.features[self.features_code[index]],
+            'max_limit': self.max_limit[index],
+            'product_id': _item(self.product_id[index]),
+            'term_type': TERM_TYPES[self.term_code[index]],
+            'target_type': TARGET_TYPES[self.target_code[index]],
+            'rate_grade': RATE_GRADES[self.rate_grade_code[index]],
+        }
+
+    def products_by_category(self):
+        """카테고리별 상품 dict 리스트 (스냅샷 저장 등 전체 목록이 필요한 경우에만 사용)"""
+        return {
+            category: [self.product(index) for index in range(start, end)]
+            for category, (start, end) in self.category_ranges.items()
+        }
+
+
+class CatalogState:
+    """
+    추천에 사용하는 카탈로그 일체 (컬럼형 카탈로그, 점수 엔진, 속성 역색인, 원본 파일 해시/상태, 카탈로그 버전)
+    만든 뒤에는 바꾸지 않고, 재로드 시 새 객체를 만들어 참조를 한 번에 교체 (copy-on-write)
+    """
+
+    def __init__(self, catalog, source_hashes, source_stats=None, scoring_engine=None, attribute_index=None):
+        from .attribute_index import AttributeIndex
+
+        self.catalog = catalog
+        self.scoring_engine = scoring_engine or ProductScoringEngine(catalog)
+        self.attribute_index = attribute_index or AttributeIndex(catalog)
+        self.source_hashes = dict(source_hashes)
+        self.source_stats = dict(source_stats or {})
+        self.version = catalog_version(self.source_hashes)
+
+    def with_source_stats(self, source_stats):
+        """내용은 같고 파일 상태만 바뀐 경우 (카탈로그/점수 엔진 재사용)"""
+        return CatalogState(self.catalog, self.source_hashes, source_stats, self.scoring_engine, self.attribute_index)
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+# 카테고리 → 상품 원본 JSON 파일
+CATALOG_FILES = {
+    'funds': 'funds.json',
+    'stocks': 'stocks.json',
+    'mmf': 'money_market_funds.json',
+    'deposit': 'bank_deposits.json',
+    'saving': 'bank_savings.json',
+}
+
+SNAPSHOT_FORMAT_VERSION = 2
+
+# 스냅샷 폴더: 컬럼별 .npy 파일 + meta.json (.npy는 np.load(mmap_mode='r')로 메모리 매핑 가능, .npz는 불가)
+DEFAULT_SNAPSHOT_PATH = os.path.join(DATA_DIR, 'catalog_snapshot')
+SNAPSHOT_META_FILE = 'meta.json'
+
+
+def catalog_file_paths(data_dir=DATA_DIR):
+    return {category: os.path.join(data_dir, filename) for category, filename in CATALOG_FILES.items()}
+
+
+def file_hash(raw):
+    return hashlib.sha1(raw).hexdigest()
+
+
+def source_hashes(data_dir=DATA_DIR):
+    """카테고리별 원본 파일 해시 (파일이 없으면 None)"""
+    hashes = {}
+    for category, filepath in catalog_file_paths(data_dir).items():
+        try:
+            with open(filepath, 'rb') as f:
+                hashes[category] = file_hash(f.read())
+        except OSError:
+            hashes[category] = None
+    return hashes
+
+
+def source_stats(data_dir=DATA_DIR):
+    """카테고리별 원본 파일 상태 (수정 시각 ns, 크기) - 파일을 읽지 않고 변경 여부를 빠르게 확인"""
+    stats = {}
+    for category, filepath in catalog_file_paths(data_dir).items():
+        try:
+            stat = os.stat(filepath)
+            stats[category] = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            stats[category] = None
+    return stats
+
+
+def catalog_version(hashes):
+    """원본 파일 해시 전체로 만든 카탈로그 버전 (추천 캐시/테이블 무효화 키)"""
+    raw = ';'.join(f"{category}:{hashes.get(category)}" for category in CATALOG_FILES)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:12]
+
+
+def _normalize_stats(stats):
+    """JSON으로 저장된 파일 상태([mtime, size])를 source_stats()와 같은 튜플로"""
+    return {category: tuple(value) if value is not None else None for category, value in (stats or {}).items()}
+
+
+def write_snapshot(catalog, hashes, path=DEFAULT_SNAPSHOT_PATH, stats=None):
+    """
+    컬럼형 카탈로그(ProductCatalog)를 컬럼별 .npy 파일로 저장
+    stats(원본 파일 수정 시각/크기)를 함께 기록해 두면 로드 시 파일 상태가 같을 때 원본을 읽어 해시하지 않음
+    임시 폴더에 모두 쓴 뒤 폴더를 교체 (로드 중인 프로세스는 기존 파일 매핑을 계속 사용)
+    """
+    meta = {
+        'format_version': SNAPSHOT_FORMAT_VERSION,
+        'source_hashes': hashes,
+        'source_stats': stats,
+        'catalog_version': catalog_version(hashes),
+        'category_ranges': catalog.category_ranges,
+    }
+
+    temp_path = f"{path}.tmp"
+    old_path = f"{path}.old"
+    for leftover in (temp_path, old_path):
+        shutil.rmtree(leftover, ignore_errors=True)
+    os.makedirs(temp_path)
+    try:
+        for name, column in catalog.columns().items():
+            np.save(os.path.join(temp_path, f"{name}.npy"), column, allow_pickle=False)
+        with open(os.path.join(temp_path, SNAPSHOT_META_FILE), 'w', encoding='utf-8') as f:
+            json.dump(meta, f, ensure_ascii=False)
+        if os.path.exists(path):
+            os.replace(path, old_path)
+        os.replace(temp_path, path)
+    finally:
+        shutil.rmtree(temp_path, ignore_errors=True)
+        shutil.rmtree(old_path, ignore_errors=True)
+    return meta
+
+
+def load_snapshot(stats, data_dir=DATA_DIR, path=DEFAULT_SNAPSHOT_PATH):
+    """
+    스냅샷 컬럼을 메모리 매핑해 ProductCatalog 생성 (상품 dict는 추천 결과를 만들 때만 생성)
+    - 원본 파일 상태(stats)가 스냅샷에 기록된 것과 같으면 원본 파일을 읽지 않고 기록된 해시 사용
+    - 상태가 다르면(복사/체크아웃 등) 원본 파일 해시를 계산해 비교
+    반환: (ProductCatalog, 원본 파일 해시) - 폴더가 없거나 형식 버전/원본 파일 해시가 다르면 None (JSON 로드로 대체)
+    """
+    from .catalog import ProductCatalog
+
+    meta_path = os.path.join(path, SNAPSHOT_META_FILE)
+    if not os.path.exists(meta_path):
+        return None
+
+    try:
+        with open(meta_path, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('format_version') != SNAPSHOT_FORMAT_VERSION:
+            return None
+        hashes = meta['source_hashes']
+        if _normalize_stats(meta.get('source_stats')) != stats and source_hashes(data_dir) != hashes:
+            return None
+        columns = {
+            name: np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r', allow_pickle=False)
+            for name in ProductCatalog.COLUMNS
+        }
+        catalog = ProductCatalog.from_columns(columns, meta['category_ranges'])
+    except (OSError, ValueError, KeyError) as e:
+        print(f"카탈로그 스냅샷 로드 실패: {e}")
+        return None
+    return catalog, hashes
@@ -1,100 +1,141 @@
 # category_recommendations.py
 # 카테고리별 AI 추천 기능을 위한 추가 함수들
 
+# 연령대분류 → 추천 입력 문구
+AGE_INPUT_MAP = {
+    1: '23세',  # 18-25세
+    2: '30세',  # 26-35세
+    3: '40세',  # 36-45세
+    4: '50세',  # 46-55세
+    5: '60세',  # 56-65세
+    6: '70세'   # 66세 이상
+}
+
+# 직업분류1 → 소득 추정 문구
+INCOME_INPUT_MAP = {
+    1: '월급 350만원',  # 일반 직장인
+    2: '월급 600만원',  # 고소득 전문직
+    3: '연금 수급자',   # 은퇴자
+    4: '월급 200만원'   # 저소득층
+}
+
+# 카테고리별 추천 입력 문구
+CATEGORY_INPUTS = {
+    'deposit': '안전한 예금상품',
+    'saving': '꾸준한 적금상품', 
+    'fund': '펀드 투자',
+    'stock': '주식 투자',
+    'mmf': 'MMF 단기투자'
+}
+
+
+def build_base_user_input(profile):
+    """사용자 프로필(연령대, 성별, 결혼상태, 직업)을 추천 입력 문구로 변환"""
+    base_user_info = []
+    
+    # 연령대 정보
+    if profile.연령대분류:
+        base_user_info.append(AGE_INPUT_MAP.get(profile.연령대분류, '30세'))
+    
+    # 성별 정보
+    if profile.가구주성별 == 1:
+        base_user_info.append('남성')
+    elif profile.가구주성별 == 2:
+        base_user_info.append('여성')
+    
+    # 결혼 상태
+    if profile.결혼상태 == 1:
+        base_user_info.append('기혼')
+    elif profile.결혼상태 == 2:
+        base_user_info.append('미혼')
+    
+    # 소득 추정
+    if profile.직업분류1:
+        base_user_info.append(INCOME_INPUT_MAP.get(profile.직업분류1, '월급 300만원'))
+    
+    return ' '.join(base_user_info)
+
+
+def build_category_inputs(profile):
+    """카테고리별 맞춤 추천 입력 생성"""
+    base_info_str = build_base_user_input(profile)
+    return {
+        category_key: f"{base_info_str} {category_desc} 추천해주세요"
+        for category_key, category_desc in CATEGORY_INPUTS.items()
+    }
+
+
+def attach_holding_probabilities(recommender, profile, user_inputs):
+    """
+    멀티라벨 LGBM 모델이 예측한 카테고리별 보유 확률을 추천 입력에 추가
+    모델을 사용할 수 없으면 입력을 그대로 반환
+    """
+    holding_probabilities = recommender.predict_holding_probabilities([profile])[0]
+    return with_holding_probabilities(recommender, user_inputs, holding_probabilities)
+
+
+def with_holding_probabilities(recommender, user_inputs, holding_probabilities):
+    """이미 예측된 보유 확률을 추천 입력에 추가 (여러 프로필을 한 번에 예측한 경우 사용)"""
+    if not holding_probabilities:
+        return list(user_inputs)
+    
+    return [
+        dict(recommender.parse_input(user_input), holding_probabilities=holding_probabilities)
+        for user_input in user_inputs
+    ]
+
+
+def convert_category_products(category_key, result):
+    """추천 결과를 카테고리 블록용 상품 3개로 변환 (부족하면 기본 상품으로 보충)"""
+    from .product_detail_index import PRODUCT_TYPE_NAMES, product_detail_index
+    
+    # 결과 변환 - 카테고리 필터링 없이 모든 추천 상품 사용
+    # 종류는 상품 이름으로 추정하지 않고 블록의 카테고리 사용 (이름에 '펀드'가 들어간 MMF 등)
+    category_products = []
+    for product in result.get('products', []):
+        located = product_detail_index.locate(product.get('product_id'), product['bank'], [category_key])
+        converted_product = {
+            'fin_prdt_cd': product.get('product_id'),
+            'fin_co_no': located['company_code'] if located else '',
+            'fin_prdt_nm': product['name'],
+            'kor_co_nm': product['bank'],
+            'join_way': product.get('join_way', '온라인 가입 가능'),
+            'product_type': category_key,
+            'product_type_name': PRODUCT_TYPE_NAMES[category_key],
+            'rate': product.get('rate', 0),
+            'score': product.get('score', 0)
+        }
+        category_products.append(converted_product)
+    
+    # 추천 상품이 3개 미만인 경우 기본 상품으로 채우기
+    if len(category_products) < 3:
+        shortage = 3 - len(category_products)
+        category_products.extend(get_default_products_by_category(category_key, shortage))
+        print(f"카테고리 {category_key}: AI 추천 {len(result.get('products', []))}개 + 기본 상품 {shortage}개 보충")
+    
+    return category_products[:3]
+
+
 def get_category_recommendations_for_user(user):
     """
     사용자 맞춤 카테고리별 AI 추천 상품 생성
     각 카테고리(예금, 적금, 펀드, 주식, MMF)별로 3개씩 추천
+    다섯 카테고리를 한 번의 배치 추천(recommend_many)으로 처리
     """
     category_recs = {}
     
     try:
-        profile = user.profile
+        category_inputs = build_category_inputs(user.profile)
         
-        # 기본 사용자 정보 구성
-        base_user_info = []
+        # AI 추천 시스템 (프로세스 공유 인스턴스)
+        from .registry import get_recommender
+        recommender = get_recommender()
         
-        # 연령대 정보
-        age_map = {
-            1: '23세', 2: '30세', 3: '40세', 
-            4: '50세', 5: '60세', 6: '70세'
-        }
-        if profile.연령대분류:
-            base_user_info.append(age_map.get(profile.연령대분류, '30세'))
-        
-        # 성별 정보
-        if profile.가구주성별 == 1:
-            base_user_info.append('남성')
-        elif profile.가구주성별 == 2:
-            base_user_info.append('여성')
-        
-        # 결혼 상태
-        if profile.결혼상태 == 1:
-            base_user_info.append('기혼')
-        elif profile.결혼상태 == 2:
-            base_user_info.append('미혼')
-        
-        # 소득 추정
-        income_map = {
-            1: '월급 350만원', 2: '월급 600만원',
-            3: '연금 수급자', 4: '월급 200만원'
-        }
-        if profile.직업분류1:
-            base_user_info.append(income_map.get(profile.직업분류1, '월급 300만원'))
-        
-        base_info_str = ' '.join(base_user_info)
-        
-        # AI 추천 시스템 임포트
-        from .matching import HighPerformanceFinancialRecommender
-        recommender = HighPerformanceFinancialRecommender()
-        
-        # 각 카테고리별 추천 생성
-        categories = {
-            'deposit': '안전한 예금상품',
-            'saving': '꾸준한 적금상품', 
-            'fund': '펀드 투자',
-            'stock': '주식 투자',
-            'mmf': 'MMF 단기투자'
-        }
+        user_inputs = attach_holding_probabilities(recommender, user.profile, category_inputs.values())
+        results = recommender.recommend_many(user_inputs, top_n=3)
         
-        for category_key, category_desc in categories.items():
-            try:
-                # 카테고리별 맞춤 입력 생성
-                category_input = f"{base_info_str} {category_desc} 추천해주세요"
-                print(f"카테고리 {category_key} AI 추천 입력: {category_input}")
-                
-                # AI 추천 실행
-                result = recommender.recommend(category_input, top_n=3)
-                
-                # 결과 변환 - 카테고리 필터링 없이 모든 추천 상품 사용
-                category_products = []
-                for product in result.get('products', []):
-                    from .views import get_product_type_from_ai_result, get_product_type_name_from_ai_result
-                    product_type = get_product_type_from_ai_result(product)
-                    
-                    converted_product = {
-                        'fin_prdt_nm': product['name'],
-                        'kor_co_nm': product['bank'],
-                        'join_way': product.get('join_way', '온라인 가입 가능'),
-                        'product_type': product_type,
-                        'product_type_name': get_product_type_name_from_ai_result(product),
-                        'rate': product.get('rate', 0),
-                        'score': product.get('score', 0)
-                    }
-                    category_products.append(converted_product)
-                
-                # 추천 상품이 3개 미만인 경우 기본 상품으로 채우기
-                if len(category_products) < 3:
-                    category_products.extend(get_default_products_by_category(category_key, 3 - len(category_products)))
-                    print(f"카테고리 {category_key}: AI 추천 {len(result.get('products', []))}개 + 기본 상품 {3 - len(category_products)}개 보충")
-                
-                category_recs[f'recommended_{category_key}'] = category_products[:3]
-                print(f"카테고리 {category_key} 추천 완료: {len(category_products[:3])}개 상품")
-                
-            except Exception as e:
-                print(f"카테고리 {category_key} 추천 오류: {e}")
-                # 오류 발생 시 기본 상품 제공
-                category_recs[f'recommended_{category_key}'] = get_default_products_by_category(category_key, 3)
+        for category_key, result in zip(category_inputs, results):
+            category_recs[f'recommended_{category_key}'] = convert_category_products(category_key, result)
         
         print(f"전체 카테고리별 추천 완료: {len(category_recs)}개 카테고리")
         return category_recs
@@ -9,6 +9,8 @@ class FinancialProductAPI:
         load_dotenv()
         self.api_key = os.getenv('FSS_API_KEY')
         self.base_url = 'https://finlife.fss.or.kr/finlifeapi'
+        # 연결 재사용 (요청마다 새 TCP/TLS 연결을 맺지 않도록)
+        self.session = requests.Session()
         
         if not self.api_key:
             raise ValueError("FSS_API_KEY가 .env 파일에 설정되지 않았습니다.")
@@ -23,7 +25,7 @@ class FinancialProductAPI:
                 'pageNo': page_no
             }
 
-            response = requests.get(url, params = params)
+            response = self.session.get(url, params = params, timeout = 10)
             response.raise_for_status()
             return response.json()
 
@@ -41,7 +43,7 @@ class FinancialProductAPI:
                 'pageNo': page_no
             }
 
-            response = requests.get(url, params = params)
+            response = self.session.get(url, params = params, timeout = 10)
             response.raise_for_status()
             return response.json()
 
@@ -107,7 +109,7 @@ class FinancialProductAPI:
                 'pageNo': page_no
             }
 
-            response = requests.get(url, params = params)
+            response = self.session.get(url, params = params, timeout = 10)
             response.raise_for_status()
             return response.json()
 
@@ -140,8 +142,11 @@ class FinancialProductAPI:
             else:
                 print(f"새로운 {full_filename} 파일을 생성합니다...")
             
-            with open(full_filename, 'w', encoding='utf-8') as f:
+            # 임시 파일에 쓴 뒤 교체 (추천 시스템 카탈로그 재로드가 쓰는 중인 파일을 읽지 않도록)
+            temp_filename = f"{full_filename}.tmp"
+            with open(temp_filename, 'w', encoding='utf-8') as f:
                 json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(temp_filename, full_filename)
             
             print(f"{filename} 데이터가 {full_filename}에 저장되었습니다!")
             return full_filename
@@ -151,7 +156,11 @@ class FinancialProductAPI:
             return None
         
     def save_all_data_to_json(self, filename="financial_data"):
-        """모든 금융상품 데이터를 하나의 JSON 파일로 저장 (기존 파일 업데이트)"""
+        """
+        모든 금융상품 데이터를 하나의 JSON 파일로 저장 (기존 파일 업데이트)
+        참고: 상품 목록/검색은 상품 DB를 읽으므로 이 파일은 목록에 반영되지 않음
+        (목록 갱신은 collect_fss_products 또는 ingest_products 사용)
+        """
         os.makedirs("data", exist_ok=True)  # data 폴더 생성
         full_filename = f"data/{filename}.json"
         
@@ -192,13 +201,27 @@ class FinancialProductAPI:
         try:
             print("📥 데이터 수집 중...")
             
-            # 각 상품별 데이터 수집
-            print("  - 은행 예금 상품...")
-            all_data['products']['bank_deposits'] = self.get_deposit_products('020000')
-            
-            print("  - 은행 적금 상품...")
-            all_data['products']['bank_savings'] = self.get_saving_products('020000')
-            
+            # API 상품(은행 예금/적금, 금융회사, 저축은행 예금)은 전체 페이지를 동시에 수집
+            # (패키지 내부 모듈이므로 스크립트 단독 실행 시에도 main()이 동작하도록 여기서 import)
+            from .fss_collector import DEFAULT_JOBS, FSSCollector, print_timings
+            from .fss_delta import DeltaSync
+            
+            print("  - 은행 예금/적금, 금융회사 목록, 저축은행 예금 (동시 수집)...")
+            collector = FSSCollector(self.api_key, base_url=self.base_url, session=self.session)
+            collected = collector.collect(DEFAULT_JOBS)
+            print_timings(collected['timings'])
+            if collected['errors']:
+                raise RuntimeError(', '.join(f"{key}: {error}" for key, error in collected['errors'].items()))
+            all_data['products'].update(collected['data'])
+            all_data['sync_timings'] = collected['timings']
+            
+            # 이전 수집 결과와 비교해 바뀐 작업만 개별 파일/변경 로그/manifest에 반영
+            manifest = DeltaSync("data").sync(collected['data'])
+            for key, counts in manifest['changed'].items():
+                print(f"  - {key}: 추가 {counts['inserted']}, 변경 {counts['updated']}, 삭제 {counts['removed']}")
+            all_data['sync_sequence'] = manifest['sequence']
+            
+            # 파일 기반 상품
             print("  - 펀드...")
             all_data['products']['funds'] = self.get_fund_products('020000')
             
@@ -208,15 +231,19 @@ class FinancialProductAPI:
             print("  - 머니마켓펀드...")
             all_data['products']['money_market_funds'] = self.get_money_market_fund_products('020000')
             
-            print("  - 금융회사 목록...")
-            all_data['products']['companies'] = self.get_company_list('020000')
+            # 바뀐 상품이 없으면 전체 파일을 다시 쓰지 않음 (변경 여부는 manifest에 기록됨)
+            file_products = ('funds', 'stocks', 'money_market_funds')
+            if existing_data and not manifest['changed'] and all(
+                existing_data.get('products', {}).get(key) == all_data['products'][key] for key in file_products
+            ):
+                print(f"\n변경된 상품이 없어 {full_filename}을 그대로 둡니다 (동기화 #{manifest['sequence']})")
+                return full_filename
             
-            print("  - 저축은행 예금...")
-            all_data['products']['savings_bank_deposits'] = self.get_deposit_products('030300')
-            
-            # JSON 파일로 저장 (덮어쓰기)
-            with open(full_filename, 'w', encoding='utf-8') as f:
-                json.dump(all_data, f, ensure_ascii=False, indent=2)
+            # JSON 파일로 저장 (덮어쓰기, 공백 없이 저장해 파일 크기 축소)
+            temp_filename = f"{full_filename}.tmp"
+            with open(temp_filename, 'w', encoding='utf-8') as f:
+                json.dump(all_data, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(temp_filename, full_filename)
             
             # 수집 결과 요약
             print(f"\n모든 데이터가 {full_filename}에 업데이트되었습니다!")
@@ -247,7 +274,7 @@ class FinancialProductAPI:
                 all_data['update_history'][-1]['status'] = f'failed: {str(e)}'
                 try:
                     with open(full_filename, 'w', encoding='utf-8') as f:
-                        json.dump(all_data, f, ensure_ascii=False, indent=2)
+                        json.dump(all_data, f, ensure_ascii=False, separators=(',', ':'))
                 except:
                     pass
             
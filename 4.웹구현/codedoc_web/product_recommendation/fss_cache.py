@@ -0,0 +1,169 @@
+import json
+import os
+import tempfile
+import threading
+import time
+
+import requests
+
+
+# 금융감독원 금융상품통합비교공시 API
+FSS_API_BASE_URL = 'http://finlife.fss.or.kr/finlifeapi'
+FSS_ENDPOINTS = {
+    'deposit': 'depositProductsSearch.json',
+    'saving': 'savingProductsSearch.json',
+}
+FSS_REQUEST_TIMEOUT = 10
+
+# 상품 공시는 하루 단위로 바뀌므로 기본 6시간 동안은 새로 받지 않음
+DEFAULT_TTL_SECONDS = 6 * 60 * 60
+DEFAULT_CACHE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'fss'
+)
+
+
+class FSSCatalogCache:
+    """
+    FSS 예금/적금 상품 목록 캐시 (stale-while-revalidate)
+    - 마지막으로 성공한 응답(baseList)을 메모리와 디스크(JSON)에 보관해 재시작 후에도 다시 받지 않음
+    - TTL 이내: 캐시 그대로 반환
+    - TTL 경과: 기존 데이터를 바로 반환하고 백그라운드 스레드에서 갱신 (카테고리당 동시에 하나만)
+    - 캐시가 전혀 없을 때만 요청 스레드에서 받아옴, 실패하면 None (호출 측에서 대체 데이터 사용)
+    갱신이 실패해도 마지막 정상 데이터는 유지
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, ttl=DEFAULT_TTL_SECONDS, base_url=FSS_API_BASE_URL,
+                 timeout=FSS_REQUEST_TIMEOUT):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self._entries = {}
+        self._refreshing = {}
+        self._lock = threading.Lock()
+        self.stats = {'fresh_hits': 0, 'stale_hits': 0, 'fetches': 0, 'fetch_errors': 0}
+
+    def _cache_path(self, category):
+        return os.path.join(self.cache_dir, f'{category}.json')
+
+    def _read_disk(self, category):
+        try:
+            with open(self._cache_path(category), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry.get('base_list'), list) or 'fetched_at' not in entry:
+            return None
+        return entry
+
+    def _write_disk(self, category, entry):
+        """임시 파일에 쓴 뒤 교체 (다른 프로세스가 읽는 도중 잘린 파일을 보지 않도록)"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_path, self._cache_path(category))
+        except OSError as e:
+            print(f"FSS 캐시 저장 실패: {category} ({e})")
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def _entry(self, category):
+        entry = self._entries.get(category)
+        if entry is None:
+            entry = self._read_disk(category)
+            if entry is not None:
+                self._entries[category] = entry
+        return entry
+
+    def fetch(self, category, api_key):
+        """FSS API에서 상품 목록(baseList)을 받아옴 (비어 있으면 ValueError)"""
+        url = f"{self.base_url}/{FSS_ENDPOINTS[category]}"
+        params = {'auth': api_key, 'topFinGrpNo': '020000', 'pageNo': 1}
+        response = requests.get(url, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        base_list = (response.json().get('result') or {}).get('baseList')
+        if not base_list:
+            raise ValueError('API 응답에 상품 데이터가 없습니다')
+        return base_list
+
+    def refresh(self, category, api_key):
+        """
+        받아와서 캐시 교체, 반환: 새 엔트리 (실패하면 None, 기존 캐시 유지)
+        """
+        try:
+            self.stats['fetches'] += 1
+            base_list = self.fetch(category, api_key)
+        except Exception as e:
+            self.stats['fetch_errors'] += 1
+            print(f"FSS {category} 상품 갱신 실패: {e}")
+            return None
+
+        entry = {'fetched_at': time.time(), 'base_list': base_list}
+        with self._lock:
+            self._entries[category] = entry
+        self._write_disk(category, entry)
+        print(f"FSS {category} 상품 갱신 완료: {len(base_list)}개")
+        return entry
+
+    def _refresh_in_background(self, category, api_key):
+        with self._lock:
+            thread = self._refreshing.get(category)
+            if thread is not None and thread.is_alive():
+                return thread
+            thread = threading.Thread(
+                target=self.refresh, args=(category, api_key), name=f'fss-refresh-{category}', daemon=True
+            )
+            self._refreshing[category] = thread
+        thread.start()
+        return thread
+
+    def get(self, category, api_key):
+        """
+        상품 목록 (호출 측에서 수정해도 캐시에 영향 없도록 상품 dict는 복사본)
+        캐시가 없고 받아오기도 실패하면 None
+        """
+        with self._lock:
+            entry = self._entry(category)
+
+        if entry is None:
+            entry = self.refresh(category, api_key)
+            if entry is None:
+                return None
+        elif time.time() - entry['fetched_at'] >= self.ttl:
+            self.stats['stale_hits'] += 1
+            self._refresh_in_background(category, api_key)
+        else:
+            self.stats['fresh_hits'] += 1
+
+        return [dict(product) for product in entry['base_list']]
+
+    def wait_for_refresh(self, timeout=None):
+        """진행 중인 백그라운드 갱신 완료 대기 (테스트/관리 명령용)"""
+        with self._lock:
+            threads = list(self._refreshing.values())
+        for thread in threads:
+            thread.join(timeout)
+
+    def age(self, category):
+        """캐시된 데이터의 경과 시간(초), 없으면 None"""
+        with self._lock:
+            entry = self._entry(category)
+        return time.time() - entry['fetched_at'] if entry else None
+
+
+def _build_cache():
+    try:
+        from django.conf import settings
+        return FSSCatalogCache(
+            cache_dir=str(getattr(settings, 'FSS_CACHE_DIR', DEFAULT_CACHE_DIR)),
+            ttl=getattr(settings, 'FSS_CACHE_TTL', DEFAULT_TTL_SECONDS),
+            base_url=getattr(settings, 'FSS_API_BASE_URL', FSS_API_BASE_URL),
+        )
+    except Exception:
+        return FSSCatalogCache()
+
+
+# 전역 인스턴스
+fss_catalog_cache = _build_cache()
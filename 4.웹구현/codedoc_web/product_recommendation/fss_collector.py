@@ -0,0 +1,249 @@
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .fss_cache import FSS_API_BASE_URL, FSS_ENDPOINTS, FSS_REQUEST_TIMEOUT
+
+
+# 수집 대상 API (fss_cache의 예금/적금 + 금융회사 목록)
+COLLECTOR_ENDPOINTS = {
+    **FSS_ENDPOINTS,
+    'company': 'companySearch.json',
+}
+
+# 권역 코드 (topFinGrpNo)
+FSS_GROUPS = {
+    '020000': '은행',
+    '030200': '여신전문금융',
+    '030300': '저축은행',
+    '050000': '보험',
+    '060000': '금융투자',
+}
+
+# 기존 financial_data.json / 개별 파일과 같은 키로 수집하는 기본 작업 (키, API, 권역)
+DEFAULT_JOBS = (
+    ('bank_deposits', 'deposit', '020000'),
+    ('bank_savings', 'saving', '020000'),
+    ('companies', 'company', '020000'),
+    ('savings_bank_deposits', 'deposit', '030300'),
+)
+
+# 재시도 대상 HTTP 상태 코드
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class FSSAPIError(Exception):
+    """FSS API가 오류 코드(err_cd != '000')를 반환함 - 인증키 오류 등이라 재시도하지 않음"""
+
+
+def build_jobs(endpoints=('deposit', 'saving', 'company'), groups=FSS_GROUPS):
+    """API × 권역 전체 수집 작업 목록 (키: '{api}_{권역코드}')"""
+    return [(f'{endpoint}_{group}', endpoint, group) for endpoint in endpoints for group in groups]
+
+
+class RateLimiter:
+    """
+    초당 요청 수 제한 (스레드 간 공유)
+    요청마다 다음 허용 시각을 예약하고 그때까지 대기하므로 요청 간격이 1/rate초 이상으로 유지됨
+    rate가 None이나 0이면 제한 없음
+    """
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next_time = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            scheduled = max(now, self._next_time)
+            self._next_time = scheduled + self.interval
+        if scheduled > now:
+            time.sleep(scheduled - now)
+
+
+class FSSCollector:
+    """
+    FSS 금융상품 API 동시 수집기
+    - requests.Session + HTTPAdapter 연결 풀을 모든 요청이 공유 (keep-alive 재사용)
+    - 작업별 1페이지를 동시에 요청하고, 응답의 max_page_no를 보고 나머지 페이지를 바로 이어서 요청
+    - 전체 요청은 RateLimiter(초당 rate개)를 거치고, 연결 오류/429/5xx는 지수 백오프로 재시도
+    - 작업별 요청 수/재시도/페이지/소요 시간을 기록해 전체 수집 시간이 가장 느린 작업에 맞춰지는지 확인 가능
+    """
+
+    def __init__(self, api_key, base_url=FSS_API_BASE_URL, max_workers=8, rate=10, max_retries=3,
+                 backoff=0.5, timeout=FSS_REQUEST_TIMEOUT, session=None):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip('/')
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.rate_limiter = RateLimiter(rate)
+        self.session = session or self._build_session(max_workers)
+        self._timings = {}
+        self._timings_lock = threading.Lock()
+
+    @staticmethod
+    def _build_session(max_workers):
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_workers)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+    def _record(self, key, **values):
+        with self._timings_lock:
+            timing = self._timings[key]
+            for name, value in values.items():
+                if name == 'slowest_request_ms':
+                    timing[name] = max(timing[name], value)
+                else:
+                    timing[name] += value
+
+    def _retry_delay(self, attempt, response=None):
+        """지수 백오프 + 지터, 429의 Retry-After(초)가 있으면 우선"""
+        if response is not None:
+            retry_after = response.headers.get('Retry-After')
+            if retry_after and retry_after.isdigit():
+                return float(retry_after)
+        return self.backoff * (2 ** attempt) + random.uniform(0, self.backoff)
+
+    def fetch_page(self, key, endpoint, group, page):
+        """
+        한 페이지 요청 (재시도 포함), 반환: 응답의 result dict
+        재시도를 모두 실패하면 마지막 예외를 그대로 발생
+        """
+        url = f"{self.base_url}/{COLLECTOR_ENDPOINTS[endpoint]}"
+        params = {'auth': self.api_key, 'topFinGrpNo': group, 'pageNo': page}
+
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            start_time = time.perf_counter()
+            response = None
+            try:
+                response = self.session.get(url, params=params, timeout=self.timeout)
+                if response.status_code in RETRY_STATUS_CODES and attempt < self.max_retries:
+                    raise requests.HTTPError(f"{response.status_code} 응답", response=response)
+                response.raise_for_status()
+                result = response.json().get('result') or {}
+            except (requests.ConnectionError, requests.Timeout, requests.HTTPError) as e:
+                elapsed_ms = (time.perf_counter() - start_time) * 1000
+                self._record(key, requests=1, request_ms=elapsed_ms, slowest_request_ms=elapsed_ms)
+                retryable = response is None or response.status_code in RETRY_STATUS_CODES
+                if not retryable or attempt >= self.max_retries:
+                    raise
+                self._record(key, retries=1)
+                delay = self._retry_delay(attempt, response)
+                print(f"FSS {key} {page}페이지 재시도 {attempt + 1}/{self.max_retries} ({delay:.2f}초 후): {e}")
+                time.sleep(delay)
+                continue
+
+            elapsed_ms = (time.perf_counter() - start_time) * 1000
+            self._record(key, requests=1, request_ms=elapsed_ms, slowest_request_ms=elapsed_ms)
+            if result.get('err_cd', '000') != '000':
+                raise FSSAPIError(f"{result.get('err_cd')} {result.get('err_msg', '')}".strip())
+            return result
+
+    @staticmethod
+    def _merge_pages(pages):
+        """페이지별 result를 순서대로 합쳐 1페이지 응답과 같은 형식으로 반환"""
+        first = pages[1]
+        merged = {key: value for key, value in first.items() if key not in ('baseList', 'optionList')}
+        merged['baseList'] = []
+        merged['optionList'] = []
+        for page in sorted(pages):
+            merged['baseList'].extend(pages[page].get('baseList') or [])
+            merged['optionList'].extend(pages[page].get('optionList') or [])
+        merged['now_page_no'] = max(pages)
+        return {'result': merged}
+
+    def collect(self, jobs=DEFAULT_JOBS):
+        """
+        작업 목록을 동시에 수집
+        jobs: (키, API 이름, 권역 코드) 목록
+        반환: {'data': {키: 응답}, 'errors': {키: 오류 메시지}, 'timings': {...}}
+        한 작업이 실패해도 나머지 작업은 계속 수집
+        """
+        jobs = [tuple(job) for job in jobs]
+        self._timings = {
+            key: {'endpoint': endpoint, 'group': group, 'pages': 0, 'items': 0, 'requests': 0, 'retries': 0,
+                  'request_ms': 0.0, 'slowest_request_ms': 0.0, 'elapsed_ms': None}
+            for key, endpoint, group in jobs
+        }
+        pages = {key: {} for key, _, _ in jobs}
+        expected_pages = {}
+        errors = {}
+        start_time = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='fss-collector') as executor:
+            futures = {
+                executor.submit(self.fetch_page, key, endpoint, group, 1): (key, endpoint, group, 1)
+                for key, endpoint, group in jobs
+            }
+            pending = set(futures)
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key, endpoint, group, page = futures.pop(future)
+                    if key in errors:
+                        continue
+                    try:
+                        pages[key][page] = future.result()
+                    except Exception as e:
+                        errors[key] = f"{type(e).__name__}: {e}"
+                        print(f"FSS {key} 수집 실패: {errors[key]}")
+                        continue
+
+                    if page == 1:
+                        # 첫 페이지에서 전체 페이지 수를 확인하고 나머지 페이지를 한꺼번에 요청
+                        expected_pages[key] = max(1, int(pages[key][1].get('max_page_no') or 1))
+                        for next_page in range(2, expected_pages[key] + 1):
+                            next_future = executor.submit(self.fetch_page, key, endpoint, group, next_page)
+                            futures[next_future] = (key, endpoint, group, next_page)
+                            pending.add(next_future)
+
+                    if len(pages[key]) == expected_pages.get(key):
+                        self._timings[key]['elapsed_ms'] = (time.perf_counter() - start_time) * 1000
+
+        data = {}
+        for key, _, _ in jobs:
+            if key in errors:
+                continue
+            data[key] = self._merge_pages(pages[key])
+            self._timings[key]['pages'] = len(pages[key])
+            self._timings[key]['items'] = len(data[key]['result']['baseList'])
+
+        elapsed_ms = (time.perf_counter() - start_time) * 1000
+        timings = {
+            'elapsed_ms': round(elapsed_ms, 1),
+            'sequential_ms': round(sum(timing['request_ms'] for timing in self._timings.values()), 1),
+            'endpoints': {
+                key: {
+                    name: round(value, 1) if isinstance(value, float) else value
+                    for name, value in timing.items()
+                }
+                for key, timing in self._timings.items()
+            },
+        }
+        return {'data': data, 'errors': errors, 'timings': timings}
+
+    def close(self):
+        self.session.close()
+
+
+def print_timings(timings, write=print):
+    """작업별 수집 시간 표"""
+    for key, timing in timings['endpoints'].items():
+        elapsed = f"{timing['elapsed_ms']:.1f}ms" if timing['elapsed_ms'] is not None else '실패'
+        write(
+            f"  {key:<24} {timing['pages']:>3}페이지 {timing['items']:>5}개  요청 {timing['requests']:>3}회 "
+            f"(재시도 {timing['retries']})  최대 {timing['slowest_request_ms']:.1f}ms  완료 {elapsed}"
+        )
+    write(f"  전체 {timings['elapsed_ms']:.1f}ms (요청 시간 합 {timings['sequential_ms']:.1f}ms)")
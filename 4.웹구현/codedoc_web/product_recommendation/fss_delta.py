@@ -0,0 +1,211 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+
+from .catalog_snapshot import CATALOG_FILES, DATA_DIR
+
+
+# 상품 식별 키 (금융회사 코드 + 상품 코드, 금융회사 목록은 금융회사 코드만)
+PRODUCT_KEY_FIELDS = ('fin_co_no', 'fin_prdt_cd')
+# 같은 상품의 옵션(금리/지역/수익률 기간) 행을 구분하는 키
+OPTION_KEY_FIELDS = ('save_trm', 'intr_rate_type', 'rsrv_type', 'area_cd', 'return_type', 'analysis_type')
+# 매월 모든 상품에서 바뀌는 공시 제출월은 변경으로 보지 않음
+IGNORED_FIELDS = ('dcls_month',)
+
+CHANGE_LOG_PATH = os.path.join(DATA_DIR, 'fss_changes.jsonl')
+MANIFEST_PATH = os.path.join(DATA_DIR, 'fss_sync_manifest.json')
+
+# 수집 작업 키 → 추천 시스템 카탈로그 카테고리 (bank_deposits → deposit 등)
+CATALOG_CATEGORY_BY_KEY = {os.path.splitext(filename)[0]: category for category, filename in CATALOG_FILES.items()}
+
+
+def product_key(row):
+    return ':'.join(str(row[field]) for field in PRODUCT_KEY_FIELDS if row.get(field) is not None)
+
+
+def option_key(row):
+    return ':'.join(f'{field}={row[field]}' for field in OPTION_KEY_FIELDS if row.get(field) is not None)
+
+
+def _comparable(row):
+    return {field: value for field, value in row.items() if field not in IGNORED_FIELDS}
+
+
+def index_products(response):
+    """
+    FSS 응답(result.baseList/optionList)을 {상품 키: {'base': 기본 정보, 'options': {옵션 키: 옵션}}}로 변환
+    """
+    result = (response or {}).get('result') or {}
+    products = {}
+    for base in result.get('baseList') or []:
+        products[product_key(base)] = {'base': base, 'options': {}}
+    for option in result.get('optionList') or []:
+        product = products.get(product_key(option))
+        if product is not None:
+            product['options'][option_key(option)] = option
+    return products
+
+
+def diff_products(previous, current):
+    """
+    이전/현재 상품 색인 비교
+    반환: {'inserted': [상품], 'updated': [{'key', 'fields', 'options', 'product'}], 'removed': [키]}
+    updated의 fields는 바뀐 기본 정보 필드, options는 추가/변경/삭제된 옵션 키
+    """
+    inserted = [current[key] for key in current if key not in previous]
+    removed = [key for key in previous if key not in current]
+    updated = []
+    for key, product in current.items():
+        before = previous.get(key)
+        if before is None:
+            continue
+        old_base, new_base = _comparable(before['base']), _comparable(product['base'])
+        fields = sorted(field for field in old_base.keys() | new_base.keys() if old_base.get(field) != new_base.get(field))
+        options = sorted(
+            option for option in before['options'].keys() | product['options'].keys()
+            if _comparable(before['options'].get(option, {})) != _comparable(product['options'].get(option, {}))
+        )
+        if fields or options:
+            updated.append({'key': key, 'fields': fields, 'options': options, 'product': product})
+    return {'inserted': inserted, 'updated': updated, 'removed': removed}
+
+
+def content_hash(response):
+    """변경 비교 대상 내용의 해시 (무시 필드 제외, 순서 무관)"""
+    products = index_products(response)
+    canonical = {
+        key: [_comparable(product['base']), sorted((option, _comparable(row)) for option, row in product['options'].items())]
+        for key, product in sorted(products.items())
+    }
+    return hashlib.sha1(json.dumps(canonical, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()
+
+
+def _write_json_atomic(path, data, indent=None):
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=indent, separators=None if indent else (',', ':'))
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_manifest(path=MANIFEST_PATH):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+class DeltaSync:
+    """
+    수집 결과 증분 동기화
+    - 작업별 이전 파일(data_dir/{키}.json)과 상품 키 + 옵션 키 단위로 비교
+    - 바뀐 작업만 파일을 다시 쓰고(바뀌지 않은 파일은 mtime도 그대로라 카탈로그 재로드 대상이 아님)
+      추가/변경/삭제 내역을 append-only 변경 로그(JSONL)에 한 줄씩 기록
+    - 동기화마다 바뀐 카테고리 manifest(JSON)를 갱신해 하위 캐시가 해당 카테고리만 무효화하도록 함
+    - 파일만 갱신하므로 상품 DB는 product_store.ingest_synced(manifest)로 따로 적재해야 함
+    """
+
+    def __init__(self, data_dir=DATA_DIR, change_log_path=None, manifest_path=None):
+        self.data_dir = data_dir
+        self.change_log_path = change_log_path or os.path.join(data_dir, os.path.basename(CHANGE_LOG_PATH))
+        self.manifest_path = manifest_path or os.path.join(data_dir, os.path.basename(MANIFEST_PATH))
+        self._lock = threading.Lock()
+
+    def _data_path(self, key):
+        return os.path.join(self.data_dir, f'{key}.json')
+
+    def _load_previous(self, key):
+        try:
+            with open(self._data_path(key), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _append_change_log(self, entries):
+        """변경 로그에 추가 (한 줄 = 작업 하나의 변경, 기존 내용은 수정하지 않음)"""
+        if not entries:
+            return
+        os.makedirs(os.path.dirname(self.change_log_path) or '.', exist_ok=True)
+        with open(self.change_log_path, 'a', encoding='utf-8') as f:
+            for entry in entries:
+                f.write(json.dumps(entry, ensure_ascii=False, separators=(',', ':')) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def sync(self, collected):
+        """
+        collected: {작업 키: FSS 응답}
+        반환: 이번 동기화 manifest ({'sequence', 'synced_at', 'changed': {...}, 'unchanged': [...], ...})
+        """
+        with self._lock:
+            previous_manifest = load_manifest(self.manifest_path) or {}
+            sequence = previous_manifest.get('sequence', 0) + 1
+            synced_at = datetime.now().isoformat(timespec='seconds')
+            hashes = dict(previous_manifest.get('hashes', {}))
+
+            changed = {}
+            unchanged = []
+            entries = []
+            for key, response in collected.items():
+                previous = self._load_previous(key)
+                delta = diff_products(index_products(previous), index_products(response))
+                if previous is not None and not any(delta.values()):
+                    unchanged.append(key)
+                    hashes.setdefault(key, content_hash(previous))
+                    continue
+
+                _write_json_atomic(self._data_path(key), response, indent=2)
+                hashes[key] = content_hash(response)
+                changed[key] = {
+                    'inserted': len(delta['inserted']),
+                    'updated': len(delta['updated']),
+                    'removed': len(delta['removed']),
+                    'hash': hashes[key],
+                }
+                entries.append({
+                    'sequence': sequence,
+                    'synced_at': synced_at,
+                    'key': key,
+                    'inserted': delta['inserted'],
+                    'updated': delta['updated'],
+                    'removed': delta['removed'],
+                })
+
+            self._append_change_log(entries)
+            manifest = {
+                'sequence': sequence,
+                'synced_at': synced_at,
+                'changed': changed,
+                'unchanged': sorted(unchanged),
+                'changed_catalog_categories': sorted(
+                    CATALOG_CATEGORY_BY_KEY[key] for key in changed if key in CATALOG_CATEGORY_BY_KEY
+                ),
+                'hashes': hashes,
+            }
+            _write_json_atomic(self.manifest_path, manifest)
+            return manifest
+
+    def read_changes(self, since_sequence=0):
+        """since_sequence 이후의 변경 로그 항목"""
+        entries = []
+        try:
+            with open(self.change_log_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    entry = json.loads(line)
+                    if entry['sequence'] > since_sequence:
+                        entries.append(entry)
+        except OSError:
+            pass
+        return entries
@@ -0,0 +1,117 @@
+import re
+from functools import lru_cache
+
+
+# 나이: '30살', '30세', '30대'(→ 35세)
+AGE_PATTERN = re.compile(r'(\d{1,2})살|(\d{1,2})세|(\d{2})대')
+
+# 소득: (트리거 키워드, 패턴, 연봉 여부) - 앞에 있는 패턴이 우선
+INCOME_PATTERNS = [
+    ('월급', re.compile(r'월급.*?(\d+)만'), False),
+    ('월', re.compile(r'월.*?(\d+)만'), False),
+    ('연봉', re.compile(r'연봉.*?(\d+)만'), True),
+    ('소득', re.compile(r'소득.*?(\d+)만'), False),
+    ('세전', re.compile(r'세전.*?(\d+)'), False),  # 세전 400 등
+]
+
+GENDER_KEYWORDS = [
+    ('male', ['남자', '남성']),
+    ('female', ['여자', '여성']),
+]
+
+# 결혼 여부: 미혼 키워드 > 기혼 키워드 > 결혼준비/결혼자금(미혼) 순으로 판단
+UNMARRIED_KEYWORDS = ['미혼', '독신', '솔로']
+MARRIED_KEYWORDS = ['기혼', '부부', '신혼부부', '아내', '남편', '배우자']
+WEDDING_PLAN_KEYWORDS = ['결혼준비', '결혼자금']
+
+# 목적: 앞에 있는 목적이 우선
+PURPOSE_KEYWORDS = [
+    ('funds', ['펀드', '투자신탁', '자산운용', '포트폴리오']),
+    ('stocks', ['주식', '주식투자', '주식매수', '주식매매', '주식시장', '종목', '상장', '코스피', '코스닥']),
+    ('saving', ['적금', '저축', '모으기']),
+    ('deposit', ['예금', '예치']),
+    ('mmf', ['MMF', '머니마켓펀드', '단기금융', '현금관리']),
+    ('investment', ['투자', '재테크']),
+]
+
+
+def _all_keywords():
+    keywords = [trigger for trigger, _, _ in INCOME_PATTERNS]
+    keywords += UNMARRIED_KEYWORDS + MARRIED_KEYWORDS + WEDDING_PLAN_KEYWORDS
+    for _, words in GENDER_KEYWORDS + PURPOSE_KEYWORDS:
+        keywords += words
+    return sorted(set(keywords), key=lambda keyword: (-len(keyword), keyword))
+
+
+KEYWORDS = _all_keywords()
+
+# 모든 키워드를 한 번에 찾는 결합 패턴
+# 전방탐색으로 겹치는 위치도 모두 검사하고, 같은 위치에서는 가장 긴 키워드가 잡힘
+KEYWORD_PATTERN = re.compile('(?=(' + '|'.join(re.escape(keyword) for keyword in KEYWORDS) + '))')
+
+# 잡힌 키워드 → 그 안에 포함된 키워드 전체 (예: '주식투자' → 주식, 투자, 주식투자)
+KEYWORD_EXPANSIONS = {
+    keyword: frozenset(other for other in KEYWORDS if other in keyword)
+    for keyword in KEYWORDS
+}
+
+
+def find_keywords(user_input):
+    """입력에 부분 문자열로 포함된 키워드 집합 (한 번의 정규식 탐색)"""
+    found = set()
+    for keyword in set(KEYWORD_PATTERN.findall(user_input)):
+        found |= KEYWORD_EXPANSIONS[keyword]
+    return found
+
+
+@lru_cache(maxsize=4096)
+def parse_user_input(user_input):
+    """
+    자연어 입력에서 나이, 월소득, 성별, 결혼 여부, 목적 추출
+    반환: 정렬된 (키, 값) 튜플 (추천 캐시 키로 사용)
+    인스턴스와 무관한 프로세스 전역 캐시 사용
+    """
+    result = {}
+    keywords = find_keywords(user_input)
+
+    age_match = AGE_PATTERN.search(user_input)
+    if age_match:
+        if age_match.group(3):  # 20대, 30대 등
+            result['age'] = int(age_match.group(3)) + 5
+        else:
+            result['age'] = int(age_match.group(1) or age_match.group(2))
+
+    # 키워드가 있는 소득 패턴만 검사
+    for trigger, pattern, is_annual in INCOME_PATTERNS:
+        if trigger not in keywords:
+            continue
+        income_match = pattern.search(user_input)
+        if income_match:
+            income_value = int(income_match.group(1))
+            result['monthly_income'] = income_value // 12 if is_annual else income_value
+            break
+
+    for gender, words in GENDER_KEYWORDS:
+        if not keywords.isdisjoint(words):
+            result['gender'] = gender
+            break
+
+    if not keywords.isdisjoint(UNMARRIED_KEYWORDS):
+        result['married'] = False
+    elif not keywords.isdisjoint(MARRIED_KEYWORDS):
+        result['married'] = True
+    elif not keywords.isdisjoint(WEDDING_PLAN_KEYWORDS):
+        result['married'] = False
+
+    for purpose, words in PURPOSE_KEYWORDS:
+        if not keywords.isdisjoint(words):
+            result['purpose'] = purpose
+            break
+
+    return tuple(sorted(result.items()))
+
+
+def parse_user_inputs(user_inputs):
+    """여러 입력 일괄 파싱 (같은 입력은 한 번만 파싱)"""
+    parsed = {user_input: parse_user_input(user_input) for user_input in dict.fromkeys(user_inputs)}
+    return [parsed[user_input] for user_input in user_inputs]
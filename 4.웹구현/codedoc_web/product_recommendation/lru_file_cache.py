@@ -0,0 +1,56 @@
+import os
+import time
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT
+from django.core.cache.backends.filebased import FileBasedCache
+
+
+_MISSING = object()
+
+
+class LRUFileBasedCache(FileBasedCache):
+    """
+    최근 사용 순서로 제거하는 파일 캐시 (gunicorn 워커 간 공유)
+    저장/조회 적중 시 파일 mtime을 현재 시각(ns)으로 갱신하고,
+    MAX_ENTRIES에 도달하면 mtime이 가장 오래된(가장 오래 사용하지 않은) 항목부터
+    num_entries / CULL_FREQUENCY개 삭제 (기본 FileBasedCache는 무작위 삭제)
+    """
+
+    def get(self, key, default=None, version=None):
+        value = super().get(key, _MISSING, version)
+        if value is _MISSING:
+            return default
+        self._mark_used(self._key_to_file(key, version))
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        super().set(key, value, timeout, version)
+        self._mark_used(self._key_to_file(key, version))
+
+    @staticmethod
+    def _mark_used(fname):
+        # 파일시스템 타임스탬프는 거친 시계를 쓰므로 명시적인 ns 값으로 기록
+        now = time.time_ns()
+        try:
+            os.utime(fname, ns=(now, now))
+        except FileNotFoundError:
+            # 다른 프로세스가 먼저 삭제한 경우
+            pass
+
+    def _cull(self):
+        filelist = self._list_cache_files()
+        num_entries = len(filelist)
+        if num_entries < self._max_entries:
+            return
+        if self._cull_frequency == 0:
+            return self.clear()
+
+        last_used = {}
+        for fname in filelist:
+            try:
+                last_used[fname] = os.stat(fname).st_mtime_ns
+            except FileNotFoundError:
+                continue
+
+        for fname in sorted(last_used, key=last_used.get)[:max(1, int(num_entries / self._cull_frequency))]:
+            self._delete(fname)
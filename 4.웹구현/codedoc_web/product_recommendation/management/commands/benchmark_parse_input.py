@@ -0,0 +1,51 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from product_recommendation.benchmark import FREE_FORM_QUERIES
+from product_recommendation.category_recommendations import build_category_inputs
+from product_recommendation.input_parser import parse_user_input, parse_user_inputs
+from product_recommendation.recommendation_table import enumerate_profiles
+
+
+class Command(BaseCommand):
+    help = 'parse_input 입력 파싱 비용을 측정합니다 (호출당 마이크로초)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=5,
+            help='측정 반복 횟수'
+        )
+
+    def handle(self, *args, **options):
+        inputs = list(FREE_FORM_QUERIES)
+        for profile in enumerate_profiles():
+            inputs.extend(build_category_inputs(profile).values())
+        distinct_inputs = list(dict.fromkeys(inputs))
+
+        self.stdout.write(f'입력 {len(inputs)}개 (고유 {len(distinct_inputs)}개), 반복 {options["repeat"]}회')
+
+        uncached = self._measure(options['repeat'], lambda: [parse_user_input.__wrapped__(text) for text in distinct_inputs])
+        self.stdout.write(f'캐시 미적용: {uncached / len(distinct_inputs) * 1e6:.2f}µs/호출')
+
+        parse_user_input.cache_clear()
+        parse_user_inputs(distinct_inputs)
+        cached = self._measure(options['repeat'], lambda: [parse_user_input(text) for text in distinct_inputs])
+        self.stdout.write(f'캐시 적중: {cached / len(distinct_inputs) * 1e6:.2f}µs/호출')
+
+        batch = self._measure(options['repeat'], lambda: parse_user_inputs(inputs))
+        self.stdout.write(f'배치 파싱(중복 포함): {batch / len(inputs) * 1e6:.2f}µs/입력')
+
+        self.stdout.write(self.style.SUCCESS(f'캐시 상태: {parse_user_input.cache_info()}'))
+
+    @staticmethod
+    def _measure(repeat, func):
+        """반복 측정 중 가장 빠른 실행 시간(초)"""
+        best = float('inf')
+        for _ in range(repeat):
+            start_time = time.perf_counter()
+            func()
+            best = min(best, time.perf_counter() - start_time)
+        return best
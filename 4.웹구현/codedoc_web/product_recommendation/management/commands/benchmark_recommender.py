@@ -0,0 +1,71 @@
+import json
+import tempfile
+
+from django.core.management.base import BaseCommand
+
+from product_recommendation.benchmark import run_benchmark
+
+
+class Command(BaseCommand):
+    help = '합성 카탈로그(1k/10k/100k)로 추천 지연 시간/처리량/메모리를 측정해 JSON으로 저장합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            type=str,
+            default='1000,10000,100000',
+            help='카탈로그 상품 수 (쉼표로 구분)'
+        )
+        parser.add_argument(
+            '--queries',
+            type=int,
+            default=300,
+            help='재생할 질의 수'
+        )
+        parser.add_argument(
+            '--threads',
+            type=int,
+            default=4,
+            help='멀티스레드 측정 스레드 수'
+        )
+        parser.add_argument(
+            '--top-n',
+            type=int,
+            default=5,
+            help='추천 상품 수'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='합성 카탈로그/질의 생성 시드'
+        )
+        parser.add_argument(
+            '--output',
+            type=str,
+            default='recommender_benchmark.json',
+            help='결과 JSON 파일 경로'
+        )
+
+    def handle(self, *args, **options):
+        sizes = [int(size) for size in options['sizes'].split(',')]
+        self.stdout.write(f"추천 벤치마크 시작: 카탈로그 {sizes}, 질의 {options['queries']}개, 스레드 {options['threads']}개")
+
+        with tempfile.TemporaryDirectory() as work_dir:
+            report = run_benchmark(
+                sizes, options['queries'], work_dir,
+                top_n=options['top_n'], threads=options['threads'], seed=options['seed'],
+            )
+
+        for result in report['results']:
+            self.stdout.write(f"\n상품 {result['catalog_size']}개 (로드 {result['load_ms']}ms, 최대 RSS {result['peak_rss_mb']}MB (크기별 별도 프로세스))")
+            for name, summary in result['scenarios'].items():
+                self.stdout.write(
+                    f"  {name:<16} p50 {summary['p50_ms']:>8.3f}ms  p95 {summary['p95_ms']:>8.3f}ms  "
+                    f"p99 {summary['p99_ms']:>8.3f}ms  {summary['throughput_rps']:>9.1f} req/s"
+                )
+
+        with open(options['output'], 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+        self.stdout.write(self.style.SUCCESS(f"\n벤치마크 결과 저장: {options['output']}"))
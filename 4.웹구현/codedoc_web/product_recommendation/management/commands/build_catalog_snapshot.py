@@ -0,0 +1,49 @@
+import io
+import os
+import time
+from contextlib import redirect_stdout
+
+from django.core.management.base import BaseCommand
+
+from product_recommendation.catalog_snapshot import DEFAULT_SNAPSHOT_PATH, write_snapshot
+
+
+def snapshot_size(path):
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+
+class Command(BaseCommand):
+    help = '특성 계산이 끝난 상품 카탈로그를 컬럼별 바이너리 스냅샷(.npy 폴더, 메모리 매핑 로드)으로 저장합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            type=str,
+            default=DEFAULT_SNAPSHOT_PATH,
+            help='스냅샷 폴더 경로'
+        )
+
+    def handle(self, *args, **options):
+        from product_recommendation.matching import HighPerformanceFinancialRecommender
+
+        output = options['output']
+        start_time = time.time()
+
+        try:
+            # 원본 JSON에서 직접 로드 (초기화 로그는 생략)
+            with redirect_stdout(io.StringIO()):
+                recommender = HighPerformanceFinancialRecommender(snapshot_path=None)
+            meta = write_snapshot(
+                recommender.catalog, recommender.source_hashes, output, recommender.source_stats
+            )
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f'카탈로그 스냅샷 생성 오류: {e}'))
+            return
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"카탈로그 스냅샷 생성 완료! 상품 {len(recommender.catalog)}개, "
+                f"카탈로그 버전 {meta['catalog_version']}, {snapshot_size(output) / 1024:.1f}KB, "
+                f"{(time.time() - start_time) * 1000:.0f}ms"
+            )
+        )
@@ -0,0 +1,57 @@
+import io
+import os
+import time
+from contextlib import redirect_stdout
+
+from django.core.management.base import BaseCommand
+
+from product_recommendation.recommendation_table import (
+    DEFAULT_TABLE_PATH, RecommendationTable, build_table, write_table,
+)
+from product_recommendation.registry import get_recommender
+
+
+class Command(BaseCommand):
+    help = '로그인 사용자 프로필 조합 전체의 추천 결과를 미리 계산해 추천 테이블 파일로 저장합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output',
+            type=str,
+            default=DEFAULT_TABLE_PATH,
+            help='추천 테이블 파일 경로'
+        )
+        parser.add_argument(
+            '--if-stale',
+            action='store_true',
+            help='기존 테이블이 현재 카탈로그 버전과 같으면 다시 만들지 않음'
+        )
+
+    def handle(self, *args, **options):
+        from product_recommendation.views import compute_user_recommendations
+
+        output = options['output']
+        recommender = get_recommender()
+
+        if options['if_stale'] and RecommendationTable(output).is_current(recommender.catalog_version):
+            self.stdout.write(f'추천 테이블이 최신입니다 (카탈로그 버전 {recommender.catalog_version})')
+            return
+
+        self.stdout.write(f'추천 테이블 생성 시작 (카탈로그 버전 {recommender.catalog_version})')
+        start_time = time.time()
+
+        try:
+            # 프로필마다 출력되는 추천 로그는 생략
+            with redirect_stdout(io.StringIO()):
+                table = build_table(recommender, compute_user_recommendations)
+            write_table(table, output)
+        except Exception as e:
+            self.stdout.write(self.style.ERROR(f'추천 테이블 생성 오류: {e}'))
+            return
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"추천 테이블 생성 완료! 프로필 {len(table['entries'])}개 → 고유 결과 {len(table['results'])}개, "
+                f"{os.path.getsize(output) / 1024:.1f}KB, {time.time() - start_time:.1f}초"
+            )
+        )
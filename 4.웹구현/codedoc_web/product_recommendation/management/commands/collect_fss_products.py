@@ -0,0 +1,112 @@
+import json
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from product_recommendation.catalog_snapshot import DATA_DIR
+from product_recommendation.fss_cache import FSS_API_BASE_URL
+from product_recommendation.fss_collector import DEFAULT_JOBS, FSSCollector, build_jobs, print_timings
+from product_recommendation.fss_delta import DeltaSync
+from product_recommendation.product_store import ingest_synced
+
+
+class Command(BaseCommand):
+    help = (
+        'FSS 금융상품 API를 전체 페이지/권역까지 동시에 수집해 바뀐 작업만 JSON 파일로 저장하고, '
+        '바뀐 종류는 상품 DB(목록/검색이 읽는 테이블)에도 다시 적재합니다. '
+        '--no-ingest로 적재를 건너뛰면 이후 반드시 ingest_products를 실행해야 목록이 갱신됩니다'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--output-dir',
+            type=str,
+            default=DATA_DIR,
+            help='저장 폴더 (기본: 추천 시스템 상품 데이터 폴더)'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=8,
+            help='동시 요청 수 (연결 풀 크기)'
+        )
+        parser.add_argument(
+            '--rate',
+            type=float,
+            default=10,
+            help='초당 최대 요청 수 (0이면 제한 없음)'
+        )
+        parser.add_argument(
+            '--retries',
+            type=int,
+            default=3,
+            help='요청별 최대 재시도 횟수'
+        )
+        parser.add_argument(
+            '--all-groups',
+            action='store_true',
+            help='예금/적금/금융회사를 모든 권역(topFinGrpNo)에 대해 수집 (파일명: {api}_{권역코드}.json)'
+        )
+        parser.add_argument(
+            '--no-ingest',
+            action='store_true',
+            help='상품 DB 적재를 건너뜀 (이후 ingest_products를 직접 실행해야 함)'
+        )
+        parser.add_argument(
+            '--timings-output',
+            type=str,
+            default=None,
+            help='작업별 수집 시간을 저장할 JSON 파일 경로'
+        )
+
+    def handle(self, *args, **options):
+        api_key = os.getenv('FSS_API_KEY') or getattr(settings, 'FSS_API_KEY', None)
+        if not api_key:
+            raise CommandError('FSS_API_KEY가 설정되지 않았습니다.')
+
+        jobs = build_jobs() if options['all_groups'] else DEFAULT_JOBS
+        collector = FSSCollector(
+            api_key,
+            base_url=getattr(settings, 'FSS_API_BASE_URL', FSS_API_BASE_URL),
+            max_workers=options['workers'],
+            rate=options['rate'],
+            max_retries=options['retries'],
+        )
+        self.stdout.write(f"FSS 수집 시작: 작업 {len(jobs)}개, 동시 요청 {options['workers']}개, 초당 {options['rate']}회")
+        try:
+            collected = collector.collect(jobs)
+        finally:
+            collector.close()
+
+        print_timings(collected['timings'], write=self.stdout.write)
+
+        # 이전 파일과 비교해 바뀐 작업만 다시 쓰고 변경 로그/manifest 기록
+        manifest = DeltaSync(options['output_dir']).sync(collected['data'])
+        for key, counts in manifest['changed'].items():
+            self.stdout.write(f"  {key}: 추가 {counts['inserted']}, 변경 {counts['updated']}, 삭제 {counts['removed']}")
+        if manifest['unchanged']:
+            self.stdout.write(f"  변경 없음: {', '.join(manifest['unchanged'])}")
+
+        # 목록 탭/검색은 DB 상품 테이블을 읽으므로 바뀐 종류는 바로 다시 적재
+        if options['no_ingest']:
+            if manifest['changed_catalog_categories']:
+                self.stdout.write(self.style.WARNING(
+                    '상품 DB 적재를 건너뛰었습니다. ingest_products를 실행해야 목록에 반영됩니다'
+                ))
+        else:
+            for category, result in ingest_synced(manifest, options['output_dir']).items():
+                self.stdout.write(f"  {category} 적재: 상품 {result['products']}개, 옵션 {result['options']}개")
+
+        if options['timings_output']:
+            with open(options['timings_output'], 'w', encoding='utf-8') as f:
+                json.dump(collected['timings'], f, ensure_ascii=False, indent=2)
+
+        for key, error in collected['errors'].items():
+            self.stderr.write(f"{key} 수집 실패: {error}")
+        if collected['errors']:
+            raise CommandError(f"{len(collected['errors'])}개 작업 수집 실패 (성공한 작업은 저장됨)")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"동기화 #{manifest['sequence']}: {len(manifest['changed'])}개 파일 갱신 ({options['output_dir']})"
+        ))
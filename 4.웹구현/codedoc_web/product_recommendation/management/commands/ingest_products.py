@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from product_recommendation.catalog_snapshot import DATA_DIR
+from product_recommendation.product_store import STORE_FILES, ingest_from_files
+
+
+class Command(BaseCommand):
+    help = '상품 JSON 파일(FSS 형식)을 상품/옵션 테이블에 일괄 적재합니다'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--data-dir',
+            type=str,
+            default=DATA_DIR,
+            help='상품 JSON 파일 폴더'
+        )
+        parser.add_argument(
+            '--categories',
+            type=str,
+            default=','.join(STORE_FILES),
+            help='적재할 상품 종류 (쉼표로 구분)'
+        )
+
+    def handle(self, *args, **options):
+        categories = [category.strip() for category in options['categories'].split(',') if category.strip()]
+        unknown = [category for category in categories if category not in STORE_FILES]
+        if unknown:
+            raise CommandError(f"알 수 없는 상품 종류: {', '.join(unknown)} (가능: {', '.join(STORE_FILES)})")
+
+        start_time = time.time()
+        results = ingest_from_files(options['data_dir'], categories)
+        for category, result in results.items():
+            self.stdout.write(
+                f"  {category:<8} 상품 {result['products']}개, 옵션 {result['options']}개, 삭제 {result['removed']}개"
+            )
+        self.stdout.write(self.style.SUCCESS(
+            f"{len(results)}개 종류 적재 완료 ({(time.time() - start_time) * 1000:.1f}ms)"
+        ))
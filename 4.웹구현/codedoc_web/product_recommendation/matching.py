@@ -1,86 +1,137 @@
+import copy
 import json
+import time
 import numpy as np
-import joblib
-import re
 import os
 from typing import Dict, List, Optional
-from functools import lru_cache
 import threading
 
+from .catalog import CatalogState, ProductCatalog
+from .catalog_snapshot import (
+    DATA_DIR, DEFAULT_SNAPSHOT_PATH, catalog_file_paths, catalog_version, file_hash, load_snapshot, source_stats,
+)
+from .input_parser import parse_user_input, parse_user_inputs
+from .metrics import StageTimer, recommender_metrics, trace_enabled
+from .model_inference import HoldingProbabilityPredictor
+from .model_loader import MULTILABEL_MODEL_PATH, get_model_artifact
+from .recommendation_cache import RecommendationCache
+
+# 구조화된 프로필 입력에서 사용하는 키 (parse_input 결과와 동일)
+PROFILE_KEYS = ('age', 'monthly_income', 'gender', 'married', 'purpose', 'holding_probabilities', 'filters')
+
+# 목적별 후보 카테고리와 카테고리별 최대 추천 수 (단일 카테고리 목적은 top_n까지 모두 허용)
+PURPOSE_CATEGORY_QUOTAS = {
+    'funds': [('funds', None)],
+    'stocks': [('stocks', None)],
+    'mmf': [('mmf', None)],
+    'deposit': [('deposit', None)],
+    'saving': [('saving', None)],
+    # 투자 목적일 때 다양한 상품 포함
+    'investment': [('funds', 4), ('stocks', 3), ('mmf', 3)],
+    # 기본적으로 다양한 카테고리 제공
+    'general': [('saving', 3), ('deposit', 2), ('funds', 2), ('mmf', 2), ('stocks', 1)],
+}
+
+
+def purpose_category_quotas(purpose, holding_probabilities=None):
+    """
+    목적별 (카테고리, 할당량) 리스트
+    여러 카테고리를 섞는 목적에 모델 보유 확률이 있으면 카테고리마다 1개는 남기고
+    나머지 할당량을 보유 확률에 비례해 재분배 (최대 잔여 방식, 동률은 기본 순서 유지)
+    """
+    category_quotas = PURPOSE_CATEGORY_QUOTAS.get(purpose, PURPOSE_CATEGORY_QUOTAS['general'])
+    if len(category_quotas) == 1 or not holding_probabilities:
+        return category_quotas
+    
+    probabilities = [max(float(holding_probabilities.get(category, 0)), 0.0) for category, _ in category_quotas]
+    total_probability = sum(probabilities)
+    if total_probability <= 0:
+        return category_quotas
+    
+    spare = sum(quota for _, quota in category_quotas) - len(category_quotas)
+    shares = [spare * probability / total_probability for probability in probabilities]
+    extra = [int(share) for share in shares]
+    by_remainder = sorted(range(len(shares)), key=lambda i: shares[i] - extra[i], reverse=True)
+    for i in by_remainder[:spare - sum(extra)]:
+        extra[i] += 1
+    return [(category, 1 + extra[i]) for i, (category, _) in enumerate(category_quotas)]
+
+
 class HighPerformanceFinancialRecommender:
     """고성능 금융상품 추천 시스템"""
     
-    def __init__(self):
+    def __init__(self, snapshot_path=DEFAULT_SNAPSHOT_PATH, data_dir=DATA_DIR):
+        """
+        snapshot_path: 카탈로그 스냅샷 경로 (None이면 항상 JSON에서 로드)
+        data_dir: 카테고리별 상품 JSON 파일 폴더
+        """
         import os
         
         print("== 고성능 금융상품 추천 시스템 초기화 중...==")
         
-        # Django 앱 내 파일 경로 설정
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        model_file = os.path.join(current_dir, 'multilabel_lgbm.joblib')
-        
-        print(f" Django 앱 디렉토리: {current_dir}")
-        print(f" 모델 파일 경로: {model_file}")
-        print(f" 모델 파일 존재: {' 존재' if os.path.exists(model_file) else ' 없음'}")
+        # 모델은 첫 예측 때 로드 (프로세스당 한 번, 가능하면 메모리 매핑)
+        self.model_artifact = get_model_artifact(MULTILABEL_MODEL_PATH)
+        print(f" 모델 파일 경로: {self.model_artifact.path}")
+        print(f" 모델 파일 존재: {' 존재' if self.model_artifact.exists else ' 없음'} (첫 예측 시 로드)")
         
-        # 모델 로드
-        self.model = None
-        try:
-            print(f" 모델 로드 시도중...")
-            self.model = joblib.load(model_file)
-            print(f" LGBM 모델 로드 성공!")
-        except Exception as e:
-            print(f" 모델 로드 실패: {e}")
-            print(f" 에러 상세: {type(e).__name__}")
+        # 모델 예측기 (특성 벡터별 결과 메모이제이션)
+        self.holding_predictor = HoldingProbabilityPredictor(self.model_artifact)
         
-        # 데이터 로드 및 전처리
+        # 데이터 로드 및 전처리 (원본 파일 해시가 같으면 스냅샷 사용)
+        # 파일 상태는 읽기 전에 기록해 로드 중에 바뀐 파일은 다음 refresh_catalog에서 다시 읽음
         print(f" 데이터 로드 시작...")
-        self.products = self._load_products()
-        print(f" 데이터 로드 완료: {sum(len(v) for v in self.products.values())}개 상품")
-        self._precompute_product_features()
-        
-        # 캐시 초기화
-        self._recommendation_cache = {}
-        self._cache_lock = threading.Lock()
+        self.data_dir = data_dir
+        self._reload_lock = threading.Lock()
+        # 스냅샷은 컬럼을 메모리 매핑해 그대로 사용 (파일 상태가 스냅샷 기록과 같으면 원본 파일도 읽지 않음)
+        stats = source_stats(data_dir)
+        snapshot = load_snapshot(stats, data_dir, snapshot_path) if snapshot_path else None
+        if snapshot is not None:
+            catalog, hashes = snapshot
+            self.catalog_source = 'snapshot'
+            self._state = CatalogState(catalog, hashes, stats)
+            print(f" 카탈로그 스냅샷 로드: {snapshot_path}")
+        else:
+            products, hashes = self._load_products()
+            self.catalog_source = 'json'
+            self._precompute_product_features(products)
+            self._build_catalog(products, hashes, stats)
+        print(f" 데이터 로드 완료: {len(self.catalog)}개 상품 (카탈로그 버전: {self.catalog_version})")
+        
+        # 캐시 초기화 (프로세스 내 LRU + 워커 간 공유 캐시)
+        self._recommendation_cache = RecommendationCache()
     
     def _load_products(self):
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        """상품 데이터 로드 - 병렬 처리"""
+        """
+        상품 데이터 로드 (원본 JSON 파싱)
+        반환: (카테고리별 상품 dict 리스트, 카테고리별 원본 파일 해시)
+        """
         products = {}
+        hashes = {}
         
-        # Django 앱 내 data 폴더 경로
-        data_path = os.path.join(current_dir, 'data')
-        
-        files = {
-            'funds': os.path.join(data_path, 'funds.json'),
-            'stocks': os.path.join(data_path, 'stocks.json'),
-            'mmf': os.path.join(data_path, 'money_market_funds.json'),
-            'deposit': os.path.join(data_path, 'bank_deposits.json'),
-            'saving': os.path.join(data_path, 'bank_savings.json')
-        }
-        
-        print(f" 데이터 폴더 경로: {data_path}")
-        print(f" 데이터 폴더 존재: {' 존재' if os.path.exists(data_path) else ' 없음'}")
-        
-        # 각 파일 존재 여부 확인
-        for category, filepath in files.items():
-            exists = os.path.exists(filepath)
-            print(f" {category} 파일: {filepath} -> {' 존재' if exists else ' 없음'}")
+        print(f" 데이터 폴더 경로: {self.data_dir}")
+        print(f" 데이터 폴더 존재: {' 존재' if os.path.exists(self.data_dir) else ' 없음'}")
         
         # 간단한 단일 스레드 로드
-        for category, filepath in files.items():
+        for category, filepath in catalog_file_paths(self.data_dir).items():
             try:
-                print(f" {category} 로드 시도: {filepath}")
-                with open(filepath, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                parsed_products = self._parse_product_data(data, category)
-                products[category] = parsed_products
-                print(f" {category} 로드 성공: {len(parsed_products)}개 상품")
+                products[category], hashes[category] = self._load_category(category, filepath)
             except Exception as e:
                 print(f" {category} 로드 실패: {e}")
                 products[category] = []
+                hashes[category] = None
         
-        return products
+        print(f" 카탈로그 버전: {catalog_version(hashes)}")
+        return products, hashes
+    
+    def _load_category(self, category, filepath):
+        """카테고리 파일 하나를 읽어 (상품 dict 리스트, 파일 해시) 반환"""
+        print(f" {category} 로드 시도: {filepath}")
+        with open(filepath, 'rb') as f:
+            raw = f.read()
+        data = json.loads(raw.decode('utf-8'))
+        parsed_products = self._parse_product_data(data, category)
+        print(f" {category} 로드 성공: {len(parsed_products)}개 상품")
+        return parsed_products, file_hash(raw)
     
     def _parse_product_data(self, data, category):
         """JSON 데이터 파싱 - 최적화"""
@@ -162,7 +213,7 @@ class HighPerformanceFinancialRecommender:
             print(f"파싱 오류: {e}")
             return []
     
-    def _precompute_product_features(self):
+    def _precompute_product_features(self, products):
         """상품 특성 사전 계산으로 성능 향상"""
         print(" 상품 특성 사전 계산 중...")
         
@@ -182,8 +233,8 @@ class HighPerformanceFinancialRecommender:
         }
         
         # 각 상품별 특성 사전 계산
-        for category in self.products:
-            for product in self.products[category]:
+        for category in products:
+            for product in products[category]:
                 name_lower = product['name'].lower()
                 features_lower = product['features'].lower()
                 text = f"{name_lower} {features_lower}"
@@ -225,250 +276,324 @@ class HighPerformanceFinancialRecommender:
         
         print(" 특성 계산 완료!")
     
-    @lru_cache(maxsize=1000)
+    def _build_catalog(self, products, hashes=None, stats=None):
+        """카테고리별 상품 dict를 컬럼형 카탈로그로 변환하고 벡터화 점수 엔진 생성 (dict는 보관하지 않음)"""
+        self._state = CatalogState(ProductCatalog(products), hashes or {}, stats)
+    
+    def refresh_catalog(self):
+        """
+        변경된 카테고리 파일만 다시 파싱해 카탈로그 교체
+        파일 상태(수정 시각, 크기)가 그대로인 카테고리는 읽지 않고, 바뀐 파일은 해시를 비교해
+        내용이 실제로 바뀐 카테고리만 파싱/특성 계산
+        새 카탈로그를 완성한 뒤 참조를 한 번에 교체하므로 처리 중인 추천은 이전 카탈로그를 끝까지 사용
+        반환: 다시 읽은 카테고리 리스트
+        """
+        with self._reload_lock:
+            state = self._state
+            stats = source_stats(self.data_dir)
+            if stats == state.source_stats:
+                return []
+            
+            hashes = dict(state.source_hashes)
+            changed = {}
+            for category, filepath in catalog_file_paths(self.data_dir).items():
+                if stats[category] == state.source_stats.get(category):
+                    continue
+                try:
+                    products, new_hash = self._load_category(category, filepath)
+                except Exception as e:
+                    # 저장 중인 파일 등 - 기존 상품을 유지하고 다음 확인 때 다시 시도
+                    print(f" {category} 재로드 실패 (기존 상품 유지): {e}")
+                    stats[category] = state.source_stats.get(category)
+                    continue
+                if new_hash != hashes.get(category):
+                    hashes[category] = new_hash
+                    changed[category] = products
+            
+            if not changed:
+                self._state = state.with_source_stats(stats)
+                return []
+            
+            self._precompute_product_features(changed)
+            products = state.catalog.products_by_category()
+            products.update(changed)
+            self._state = CatalogState(ProductCatalog(products), hashes, stats)
+            print(f" 카탈로그 재로드: {', '.join(changed)} (카탈로그 버전 {state.version} → {self._state.version})")
+            return list(changed)
+    
+    @property
+    def model(self):
+        """멀티라벨 LGBM 모델 (첫 접근 시 로드, 없으면 None)"""
+        return self.model_artifact.get()
+    
+    @property
+    def catalog(self):
+        return self._state.catalog
+    
+    @property
+    def scoring_engine(self):
+        return self._state.scoring_engine
+    
+    @property
+    def catalog_version(self):
+        """현재 카탈로그 버전 (원본 파일 해시 기반, 추천 캐시/테이블 키에 사용)"""
+        return self._state.version
+    
+    @property
+    def source_hashes(self):
+        return dict(self._state.source_hashes)
+    
+    @property
+    def source_stats(self):
+        return dict(self._state.source_stats)
+    
+    @property
+    def products(self):
+        """카테고리별 상품 dict 리스트 (호출할 때마다 카탈로그에서 새로 생성)"""
+        return self.catalog.products_by_category()
+    
     def parse_input(self, user_input):
-        """사용자 입력 파싱 - 캐싱으로 성능 향상"""
-        result = {}
-        user_input_lower = user_input.lower()
-        
-        # 정규식 컴파일된 패턴 사용
-        age_pattern = re.compile(r'(\d{1,2})살|(\d{1,2})세|(\d{2})대')
-        age_match = age_pattern.search(user_input)
-        if age_match:
-            if age_match.group(3):  # 20대, 30대 등
-                result['age'] = int(age_match.group(3)) + 5
-            else:
-                result['age'] = int(age_match.group(1) or age_match.group(2))
-        
-        # 소득 패턴들을 한 번에 처리
-        income_patterns = [
-            (re.compile(r'월급.*?(\d+)만'), 1),
-            (re.compile(r'월.*?(\d+)만'), 1),
-            (re.compile(r'연봉.*?(\d+)만'), 12),
-            (re.compile(r'소득.*?(\d+)만'), 1),
-            (re.compile(r'세전.*?(\d+)'), 1)  # 세전 400 등
-        ]
-        
-        for pattern, divisor in income_patterns:
-            income_match = pattern.search(user_input)
-            if income_match:
-                income_value = int(income_match.group(1))
-                if divisor == 12:  # 연봉의 경우
-                    result['monthly_income'] = income_value // 12
-                else:
-                    result['monthly_income'] = income_value
-                break
-        
-        # 성별 판단
-        if any(word in user_input for word in ['남자', '남성']):
-            result['gender'] = 'male'
-        elif any(word in user_input for word in ['여자', '여성']):
-            result['gender'] = 'female'
-        
-        # 결혼 여부 판단 개선 - 더 정확한 키워드 매칭
-        married_keywords = ['기혼', '부부', '신혼부부', '아내', '남편', '배우자']
-        unmarried_keywords = ['미혼', '독신', '솔로']
-        
-        # 미혼 키워드가 명시적으로 있는 경우
-        if any(word in user_input for word in unmarried_keywords):
-            result['married'] = False
-        # 기혼 키워드가 명시적으로 있는 경우
-        elif any(word in user_input for word in married_keywords):
-            result['married'] = True
-        # '결혼준비', '결혼자금' 등은 미혼으로 판단
-        elif '결혼준비' in user_input or '결혼자금' in user_input or '결혼자금' in user_input:
-            result['married'] = False
-        
-        # 목적 추출 - 우선순위 기반 (더 정확한 키워드)
-        purpose_keywords = [
-            ('funds', ['펀드', '투자신탁', '자산운용', '포트폴리오']),
-            ('stocks', ['주식', '주식투자', '주식매수', '주식매매', '주식시장', '종목', '상장', '코스피', '코스닥']),
-            ('saving', ['적금', '저축', '모으기']),
-            ('deposit', ['예금', '예치']),
-            ('mmf', ['MMF', '머니마켓펀드', '단기금융', '현금관리']),
-            ('investment', ['투자', '재테크'])
+        """사용자 입력 파싱 (모듈 전역 추출기 사용, 프로세스 전역 LRU 캐시)"""
+        return parse_user_input(user_input)
+    
+    def _customize_products_advanced(self, user_profiles, state=None, indices=None):
+        """
+        고급 상품 맞춤화 - 여러 사용자의 전체 카탈로그 점수를 벡터화 엔진으로 한 번에 계산
+        indices가 주어지면 해당 상품들만 계산
+        """
+        state = state or self._state
+        scoring_profiles = [
+            (
+                user_profile.get('age', 30),
+                user_profile.get('monthly_income', 300),
+                user_profile.get('purpose', 'general'),
+                user_profile.get('married', False),
+                self._model_bonus_probabilities(user_profile),
+            )
+            for user_profile in user_profiles
         ]
-        
-        for purpose, keywords in purpose_keywords:
-            if any(keyword in user_input for keyword in keywords):
-                result['purpose'] = purpose
-                break
-        
-        print(f"파싱 결과: {result}")
-        return tuple(sorted(result.items()))  # 튜플로 변환하여 캐싱 가능
+        return state.scoring_engine.score_many(scoring_profiles, indices=indices)
     
-    def _calculate_advanced_score(self, product, age, income, purpose, married=False):
-        """고급 점수 계산 알고리즘"""
-        score = 40  # 기본 점수
-        
-        # 1. 나이별 맞춤 점수
-        age_score = 0
-        if purpose == 'saving':
-            if age <= 30:
-                if product['term_type'] == 'long_term':
-                    age_score = 25
-                elif product['term_type'] == 'medium_term':
-                    age_score = 15
-                else:
-                    age_score = 5
-            elif age <= 40:
-                if product['term_type'] == 'medium_term':
-                    age_score = 20
-                elif product['term_type'] == 'long_term':
-                    age_score = 15
-                else:
-                    age_score = 10
-            else:
-                if product['term_type'] == 'short_term':
-                    age_score = 20
-                elif product['term_type'] == 'medium_term':
-                    age_score = 12
-                else:
-                    age_score = 5
-        
-        # 2. 소득별 맞춤 점수
-        income_score = 0
-        if income >= 500:
-            if product['target_type'] == 'premium':
-                income_score = 20
-            else:
-                income_score = 10
-        elif income >= 300:
-            income_score = 15
-        elif income > 0:
-            if product['target_type'] == 'simple':
-                income_score = 15
-            else:
-                income_score = 8
-        else:
-            income_score = 12
-        
-        # 3. 금리 점수
-        rate = product['rate']
-        if product['is_loan']:
-            if rate <= 3.0:
-                rate_score = 20
-            elif rate <= 4.0:
-                rate_score = 15
-            elif rate <= 5.0:
-                rate_score = 10
-            else:
-                rate_score = 5
+    @staticmethod
+    def _model_bonus_probabilities(user_profile):
+        """
+        점수 가산점에 쓸 보유 확률 - 여러 카테고리가 경쟁하는 목적일 때만 사용
+        단일 카테고리 후보는 모든 상품에 같은 가산점이 붙어 순서는 그대로이고 MAX_SCORE 절삭만 늘어남
+        """
+        purpose = user_profile.get('purpose', 'general')
+        if len(PURPOSE_CATEGORY_QUOTAS.get(purpose, PURPOSE_CATEGORY_QUOTAS['general'])) == 1:
+            return None
+        return dict(user_profile.get('holding_probabilities') or ())
+    
+    def _candidate_segments(self, user_profile, state):
+        """
+        목적별 카테고리 할당 순서대로 후보 인덱스 구간 리스트
+        프로필에 filters가 있으면 속성 역색인 비트셋으로 고른 후보(오름차순)를
+        카테고리 구간 경계로 잘라 사용 (카테고리 전체 인덱스는 만들지 않음)
+        """
+        category_quotas = purpose_category_quotas(
+            user_profile.get('purpose', 'general'), dict(user_profile.get('holding_probabilities') or ())
+        )
+        
+        filters = user_profile.get('filters')
+        if not filters:
+            return category_quotas, [state.catalog.category_indices(category) for category, _ in category_quotas]
+        
+        candidates = state.attribute_index.select(filters)
+        bounds = np.searchsorted(candidates, [
+            state.catalog.category_ranges.get(category, (0, 0)) for category, _ in category_quotas
+        ])
+        return category_quotas, [candidates[start:end] for start, end in bounds]
+    
+    def _retrieve_top_products(self, user_profile, catalog_scores, top_n, state=None, timer=None):
+        """
+        목적에 해당하는 카테고리의 전체 상품 점수에서 부분 선택으로 상위 top_n개 추출
+        여러 카테고리를 섞는 목적은 카테고리별 할당량만큼 점수 상위 상품을 뽑은 뒤 합쳐서 정렬
+        정렬 기준: 점수 → 금리 키 → 은행명 (모두 내림차순, 동점은 카탈로그 순서 유지)
+        catalog_scores가 None이면 (filters로 좁힌) 후보 상품만 점수 계산
+        timer가 주어지면 후보 수집(candidate_selection)과 선택/정렬(sort) 시간을 기록
+        """
+        state = state or self._state
+        category_quotas, segments = self._candidate_segments(user_profile, state)
+        candidate_indices = np.concatenate(segments)
+        total_candidates = len(candidate_indices)
+        if catalog_scores is None:
+            if timer is not None:
+                timer.lap('candidate_selection')
+            scores = self._customize_products_advanced([user_profile], state, indices=candidate_indices)[0]
+            if timer is not None:
+                timer.lap('scoring')
         else:
-            if rate >= 6.0:
-                rate_score = 20
-            elif rate >= 5.0:
-                rate_score = 15
-            elif rate >= 4.0:
-                rate_score = 10
-            elif rate >= 3.0:
-                rate_score = 8
-            else:
-                rate_score = 5
-        
-        # 4. 특화 보너스
-        bonus_score = 0
-        
-        if age <= 35 and product['target_type'] == 'youth':
-            bonus_score += 10
-        elif married and product['target_type'] == 'family':
-            bonus_score += 8
-        
-        if age <= 40 and '스마트폰' in product['join_way']:
-            bonus_score += 3
-        elif age > 40 and '영업점' in product['join_way']:
-            bonus_score += 3
-        
-        major_banks = ['국민은행', '신한은행', '하나은행', '우리은행']
-        if any(bank in product['bank'] for bank in major_banks):
-            bonus_score += 5
-        
-        total_score = score + age_score + income_score + rate_score + bonus_score
-        return min(total_score, 100)
+            scores = catalog_scores[candidate_indices]
+            if timer is not None:
+                timer.lap('candidate_selection')
+        
+        if len(category_quotas) == 1:
+            top_indices, top_scores = state.scoring_engine.top_k(candidate_indices, scores, top_n)
+            if timer is not None:
+                timer.lap('sort')
+            return top_indices, top_scores, total_candidates
+        
+        selected_indices = []
+        selected_scores = []
+        offset = 0
+        for (_, quota), segment in zip(category_quotas, segments):
+            segment_scores = scores[offset:offset + len(segment)]
+            offset += len(segment)
+            segment_indices, segment_scores = state.scoring_engine.top_k(segment, segment_scores, min(quota, top_n))
+            selected_indices.append(segment_indices)
+            selected_scores.append(segment_scores)
+        
+        top_indices, top_scores = state.scoring_engine.top_k(
+            np.concatenate(selected_indices), np.concatenate(selected_scores), top_n
+        )
+        if timer is not None:
+            timer.lap('sort')
+        return top_indices, top_scores, total_candidates
     
-    def _customize_products_advanced(self, products, user_profile):
-        """고급 상품 맞춤화"""
-        age = user_profile.get('age', 30)
-        income = user_profile.get('monthly_income', 300)
-        purpose = user_profile.get('purpose', 'general')
-        married = user_profile.get('married', False)
-        
+    def _materialize_products(self, indices, scores, state=None):
+        """최종 결과 상품만 컬럼형 카탈로그에서 딕셔너리로 만들고 점수 추가"""
+        catalog = (state or self._state).catalog
         scored_products = []
-        for product in products:
-            score = self._calculate_advanced_score(product, age, income, purpose, married)
-            
-            product_copy = product.copy()
-            product_copy['score'] = score
-            scored_products.append(product_copy)
-        
-        return sorted(scored_products, 
-                     key=lambda x: (x['score'], 
-                                   -x['rate'] if not x['is_loan'] else x['rate'],
-                                   x['bank']), 
-                     reverse=True)
+        for index, score in zip(indices, scores):
+            product = catalog.product(index)
+            product['score'] = int(score)
+            scored_products.append(product)
+        return scored_products
     
-    def recommend(self, user_input, top_n=5):
-        """고성능 상품 추천"""
-        parsed_tuple = self.parse_input(user_input)
-        parsed = dict(parsed_tuple)
-        
-        cache_key = (parsed_tuple, top_n)
-        
-        with self._cache_lock:
-            if cache_key in self._recommendation_cache:
+    def _normalize_profile(self, user_input):
+        """
+        추천 입력을 파싱 결과 튜플로 변환
+        자연어 문자열은 parse_input으로 파싱하고, 구조화된 프로필(dict)은 알려진 키만 남김
+        """
+        if isinstance(user_input, dict):
+            profile = {key: value for key, value in user_input.items() if key in PROFILE_KEYS and value is not None}
+            # 모델 보유 확률/필터는 캐시 키로 쓸 수 있도록 정렬된 튜플로 변환
+            if isinstance(profile.get('holding_probabilities'), dict):
+                profile['holding_probabilities'] = tuple(sorted(profile['holding_probabilities'].items()))
+            if isinstance(profile.get('filters'), dict):
+                profile['filters'] = tuple(sorted(
+                    (attribute, (values,) if isinstance(values, str) else tuple(sorted(values)))
+                    for attribute, values in profile['filters'].items()
+                ))
+                if not profile['filters']:
+                    del profile['filters']
+            return tuple(sorted(profile.items()))
+        return self.parse_input(user_input)
+    
+    def predict_holding_probabilities(self, user_profiles):
+        """
+        UserProfile 리스트의 카테고리별 보유 확률 예측 (멀티라벨 LGBM, 배치 호출)
+        모델을 사용할 수 없으면 각 항목이 None
+        """
+        return self.holding_predictor.predict_many(user_profiles)
+    
+    def recommend(self, user_input, top_n=5, trace=None):
+        """고성능 상품 추천 (trace: recommend_many 참고)"""
+        return self.recommend_many([user_input], top_n=top_n, trace=trace)[0]
+    
+    def recommend_many(self, user_inputs, top_n=5, trace=None):
+        """
+        여러 입력에 대한 일괄 추천
+        user_inputs: 자연어 문자열 또는 구조화된 프로필 dict
+            (age, monthly_income, gender, married, purpose, holding_probabilities, filters)의 리스트
+            filters: 속성 조건 {속성: 값 또는 값 리스트} (AttributeIndex.bitset 참고)
+        trace: True면 각 결과에 단계별 소요 시간(ms) 'trace' 추가 (None이면 DEBUG 설정을 따름)
+        같은 입력은 한 번만 파싱하고, 캐시에 없는 프로필들은 한 번의 점수 계산으로 처리
+        단계별 소요 시간은 호출 단위로 recommender_metrics 히스토그램에 기록
+        반환: 입력 순서와 같은 추천 결과 리스트
+        """
+        timer = StageTimer()
+        
+        # 처리 중 카탈로그가 교체되어도 한 요청은 같은 카탈로그만 사용
+        state = self._state
+        
+        # 자연어 입력은 한 번에 파싱
+        texts = [user_input for user_input in user_inputs if isinstance(user_input, str)]
+        parsed_texts = dict(zip(texts, parse_user_inputs(texts)))
+        parsed_tuples = [
+            parsed_texts[user_input] if isinstance(user_input, str) else self._normalize_profile(user_input)
+            for user_input in user_inputs
+        ]
+        timer.lap('parse')
+        
+        results = {}
+        pending = []
+        for parsed_tuple in dict.fromkeys(parsed_tuples):
+            cache_key = RecommendationCache.make_key(parsed_tuple, top_n, state.version)
+            cached_result = self._recommendation_cache.get(cache_key)
+            if cached_result is not None:
                 print("캐시에서 결과 반환")
-                cached_result = self._recommendation_cache[cache_key].copy()
-                cached_result['user_info'] = parsed
-                return cached_result
-        
-        purpose = parsed.get('purpose', 'general')
-        
-        # 목적에 따른 상품 선택 (더 많은 상품을 포함하도록 개선)
-        if purpose == 'funds':
-            base_products = self.products.get('funds', [])[:10]  # 더 많은 후보 상품
-        elif purpose == 'stocks':
-            base_products = self.products.get('stocks', [])[:10]
-        elif purpose == 'mmf':
-            base_products = self.products.get('mmf', [])[:10]
-        elif purpose == 'deposit':
-            base_products = self.products.get('deposit', [])[:10]
-        elif purpose == 'saving':
-            base_products = self.products.get('saving', [])[:10]
-        elif purpose == 'investment':
-            # 투자 목적일 때 다양한 상품 포함
-            base_products = (
-                self.products.get('funds', [])[:4] + 
-                self.products.get('stocks', [])[:3] + 
-                self.products.get('mmf', [])[:3]
-            )
-        else:
-            # 기본적으로 다양한 카테고리 제공
-            base_products = (
-                self.products.get('saving', [])[:3] + 
-                self.products.get('deposit', [])[:2] + 
-                self.products.get('funds', [])[:2] + 
-                self.products.get('mmf', [])[:2] + 
-                self.products.get('stocks', [])[:1]
-            )
-        
-        customized_products = self._customize_products_advanced(base_products, parsed)
-        
-        recommendation_reason = self._generate_recommendation_reason(parsed, customized_products[0] if customized_products else None)
-        
-        result = {
-            'products': customized_products[:top_n],
-            'recommendation_reason': recommendation_reason,
-            'total_candidates': len(base_products)
-        }
-        
-        with self._cache_lock:
-            if len(self._recommendation_cache) > 100:
-                oldest_key = next(iter(self._recommendation_cache))
-                del self._recommendation_cache[oldest_key]
-            self._recommendation_cache[cache_key] = result.copy()
+                results[parsed_tuple] = cached_result
+            else:
+                pending.append((parsed_tuple, cache_key))
+        timer.lap('cache_lookup')
         
-        result['user_info'] = parsed
-        return result
+        if pending:
+            start_time = time.perf_counter()
+            
+            pending_profiles = [dict(parsed_tuple) for parsed_tuple, _ in pending]
+            
+            # 필터가 없는 프로필은 전체 카탈로그 점수를 한 번에 계산하고,
+            # 필터가 있는 프로필은 검색 단계에서 좁힌 후보만 계산
+            unfiltered = [i for i, parsed in enumerate(pending_profiles) if not parsed.get('filters')]
+            catalog_score_rows = [None] * len(pending_profiles)
+            if unfiltered:
+                score_matrix = self._customize_products_advanced([pending_profiles[i] for i in unfiltered], state)
+                for i, row in zip(unfiltered, score_matrix):
+                    catalog_score_rows[i] = row
+            timer.lap('scoring')
+            
+            computed = []
+            for (parsed_tuple, cache_key), parsed, catalog_scores in zip(pending, pending_profiles, catalog_score_rows):
+                # 목적에 해당하는 전체 상품 점수 중 상위 top_n개 선택
+                top_indices, top_scores, total_candidates = self._retrieve_top_products(
+                    parsed, catalog_scores, top_n, state, timer
+                )
+                top_products = self._materialize_products(top_indices, top_scores, state)
+                timer.lap('materialize')
+                
+                recommendation_reason = self._generate_recommendation_reason(parsed, top_products[0] if top_products else None)
+                timer.lap('reason')
+                
+                results[parsed_tuple] = {
+                    'products': top_products,
+                    'recommendation_reason': recommendation_reason,
+                    'total_candidates': total_candidates
+                }
+                computed.append((cache_key, results[parsed_tuple]))
+            
+            compute_ms = (time.perf_counter() - start_time) * 1000 / len(pending)
+            for cache_key, result in computed:
+                self._recommendation_cache.set(cache_key, result, compute_ms)
+            timer.lap('cache_store')
+        
+        # 같은 입력이 여러 번 들어온 경우 결과 객체를 공유하지 않도록 두 번째부터 복사
+        output = []
+        returned = set()
+        for parsed_tuple in parsed_tuples:
+            result = results[parsed_tuple]
+            if parsed_tuple in returned:
+                result = copy.deepcopy(result)
+            else:
+                result = dict(result)
+                returned.add(parsed_tuple)
+            result['user_info'] = dict(parsed_tuple)
+            output.append(result)
+        
+        recommender_metrics.observe_many(timer.finish())
+        if trace is None:
+            trace = trace_enabled()
+        if trace:
+            stage_trace = timer.trace()
+            print(f"추천 단계별 시간(ms): {stage_trace}")
+            for result in output:
+                result['trace'] = dict(stage_trace)
+        return output
+    
+    def cache_stats(self):
+        """추천 캐시 적중/미스 통계"""
+        return self._recommendation_cache.stats()
     
     def _generate_recommendation_reason(self, user_info, top_product):
         """추천 이유 생성"""
@@ -0,0 +1,141 @@
+import bisect
+import threading
+import time
+
+
+# 단계별 지연 시간 히스토그램 버킷 상한 (ms)
+LATENCY_BUCKETS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+# recommend_many의 측정 단계 (출력 순서)
+RECOMMEND_STAGES = (
+    'parse',                # 입력 파싱/정규화
+    'cache_lookup',         # 추천 캐시 조회
+    'scoring',              # 전체 카탈로그 점수 계산
+    'candidate_selection',  # 목적별 카테고리 후보 인덱스/점수 수집
+    'sort',                 # 상위 top_n 부분 선택 + 정렬
+    'materialize',          # 결과 상품 dict 생성
+    'reason',               # 추천 이유 생성
+    'cache_store',          # 추천 캐시 저장
+    'total',
+)
+
+
+class LatencyHistogram:
+    """고정 버킷 누적 히스토그램 (Prometheus histogram과 같은 형식)"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # 마지막 칸은 +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value_ms):
+        self.counts[bisect.bisect_left(self.buckets, value_ms)] += 1
+        self.count += 1
+        self.sum += value_ms
+
+    def quantile(self, q):
+        """버킷 상한 기준 근사 분위수 (ms)"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return bound
+        return float('inf')
+
+
+class StageMetrics:
+    """
+    단계별 지연 시간 히스토그램 레지스트리
+    observe는 버킷 탐색 + 정수 증가만 하므로 요청 경로에서 호출해도 부담이 적음
+    """
+
+    def __init__(self, namespace='recommender'):
+        self.namespace = namespace
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def observe_many(self, durations):
+        """{단계: ms} 한 번에 기록"""
+        with self._lock:
+            for stage, value_ms in durations.items():
+                histogram = self._histograms.get(stage)
+                if histogram is None:
+                    histogram = self._histograms[stage] = LatencyHistogram()
+                histogram.observe(value_ms)
+
+    def snapshot(self):
+        """단계별 요약 (count, 평균, 근사 p50/p95/p99)"""
+        with self._lock:
+            return {
+                stage: {
+                    'count': histogram.count,
+                    'mean_ms': round(histogram.sum / histogram.count, 3) if histogram.count else 0.0,
+                    'p50_ms': histogram.quantile(0.5),
+                    'p95_ms': histogram.quantile(0.95),
+                    'p99_ms': histogram.quantile(0.99),
+                }
+                for stage, histogram in self._histograms.items()
+            }
+
+    def render_prometheus(self):
+        """Prometheus 텍스트 형식 (stage 라벨별 누적 버킷)"""
+        name = f"{self.namespace}_stage_duration_ms"
+        lines = [
+            f"# HELP {name} Recommender stage duration in milliseconds.",
+            f"# TYPE {name} histogram",
+        ]
+        with self._lock:
+            for stage, histogram in self._histograms.items():
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f'{name}_bucket{{stage="{stage}",le="{bound}"}} {cumulative}')
+                lines.append(f'{name}_bucket{{stage="{stage}",le="+Inf"}} {histogram.count}')
+                lines.append(f'{name}_sum{{stage="{stage}"}} {histogram.sum:.6f}')
+                lines.append(f'{name}_count{{stage="{stage}"}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+
+class StageTimer:
+    """요청 하나의 단계별 경과 시간 측정 (lap 호출 사이의 시간을 단계에 누적)"""
+
+    __slots__ = ('durations', '_started', '_last')
+
+    def __init__(self):
+        self.durations = {}
+        self._started = self._last = time.perf_counter()
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        self.durations[stage] = self.durations.get(stage, 0.0) + (now - self._last) * 1000
+        self._last = now
+
+    def finish(self):
+        """전체 시간을 기록하고 단계별 시간(ms) 반환"""
+        self.durations['total'] = (time.perf_counter() - self._started) * 1000
+        return self.durations
+
+    def trace(self):
+        """단계 순서대로 정리한 요청 추적 정보 (소수점 3자리 ms)"""
+        return {stage: round(self.durations[stage], 3) for stage in RECOMMEND_STAGES if stage in self.durations}
+
+
+def trace_enabled():
+    """요청별 추적 사용 여부 (Django DEBUG 설정)"""
+    try:
+        from django.conf import settings
+        return settings.configured and settings.DEBUG
+    except Exception:
+        return False
+
+
+# 전역 인스턴스
+recommender_metrics = StageMetrics()
@@ -0,0 +1,58 @@
+# Generated by Django 5.2.5 on 2026-10-18 19:14
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FinancialProduct',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(choices=[('deposit', '예금'), ('saving', '적금'), ('fund', '펀드'), ('stock', '주식'), ('mmf', '머니마켓펀드')], max_length=10, verbose_name='상품 종류')),
+                ('category_rank', models.PositiveSmallIntegerField(default=0, verbose_name='종류 정렬 순서')),
+                ('product_code', models.CharField(max_length=40, verbose_name='상품 코드')),
+                ('company_code', models.CharField(blank=True, default='', max_length=20, verbose_name='금융회사 코드')),
+                ('company_name', models.CharField(blank=True, default='', max_length=100, verbose_name='금융회사')),
+                ('name', models.CharField(max_length=200, verbose_name='상품명')),
+                ('join_way', models.CharField(blank=True, default='', max_length=200, verbose_name='가입 방법')),
+                ('risk_level', models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='위험등급')),
+                ('best_rate', models.FloatField(blank=True, null=True, verbose_name='최고 금리/수익률')),
+                ('best_base_rate', models.FloatField(blank=True, null=True, verbose_name='최고 기본금리')),
+                ('best_rate_term', models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='최고 금리 기간(개월)')),
+                ('disclosure_month', models.CharField(blank=True, default='', max_length=6, verbose_name='공시 제출월')),
+                ('raw', models.JSONField(default=dict, verbose_name='원본 데이터')),
+                ('display', models.JSONField(default=dict, verbose_name='화면용 데이터')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['category', 'best_rate'], name='product_category_rate_idx'), models.Index(fields=['category', 'risk_level'], name='product_category_risk_idx'), models.Index(fields=['company_name'], name='product_company_idx'), models.Index(fields=['best_rate'], name='product_rate_idx'), models.Index(fields=['category_rank', 'id'], name='product_listing_idx')],
+                'constraints': [models.UniqueConstraint(fields=('category', 'company_code', 'product_code'), name='unique_financial_product')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ProductOption',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('option_key', models.CharField(max_length=80, verbose_name='옵션 키')),
+                ('save_term', models.PositiveSmallIntegerField(blank=True, null=True, verbose_name='저축 기간(개월)')),
+                ('rate_type', models.CharField(blank=True, default='', max_length=20, verbose_name='금리 유형')),
+                ('reserve_type', models.CharField(blank=True, default='', max_length=20, verbose_name='적립 유형')),
+                ('rate', models.FloatField(blank=True, null=True, verbose_name='기본 금리/수익률')),
+                ('max_rate', models.FloatField(blank=True, null=True, verbose_name='최고 우대금리')),
+                ('raw', models.JSONField(default=dict, verbose_name='원본 데이터')),
+                ('product', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='options', to='product_recommendation.financialproduct')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['save_term', 'max_rate'], name='option_term_rate_idx')],
+                'constraints': [models.UniqueConstraint(fields=('product', 'option_key'), name='unique_product_option')],
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+from django.db import migrations, models
+
+
+def create_search_table(apps, schema_editor):
+    from product_recommendation.product_search import INSERT_SQL, create_search_table, search_row
+
+    if not create_search_table(schema_editor.connection):
+        return
+
+    # 이미 적재된 상품 색인
+    FinancialProduct = apps.get_model('product_recommendation', 'FinancialProduct')
+    rows = [
+        search_row(*values)
+        for values in FinancialProduct.objects.values_list('id', 'category', 'name', 'company_name', 'raw')
+    ]
+    with schema_editor.connection.cursor() as cursor:
+        cursor.executemany(INSERT_SQL, rows)
+
+
+def drop_search_table(apps, schema_editor):
+    from product_recommendation.product_search import drop_search_table
+
+    drop_search_table(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product_recommendation', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='financialproduct',
+            index=models.Index(
+                fields=['category', 'risk_level', 'join_way', 'best_rate', 'name', 'company_name'],
+                name='product_search_facet_idx',
+            ),
+        ),
+        migrations.RunPython(create_search_table, drop_search_table),
+    ]
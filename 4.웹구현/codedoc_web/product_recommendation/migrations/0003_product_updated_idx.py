@@ -0,0 +1,15 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('product_recommendation', '0002_product_search'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='financialproduct',
+            index=models.Index(fields=['updated_at'], name='product_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,203 @@
+import csv
+import statistics
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from .model_loader import ModelArtifact
+
+
+# 멀티라벨 LGBM 모델의 타겟(상품 보유 여부) → 추천 카탈로그 카테고리
+TARGET_CATEGORIES = {
+    'MMMF': 'mmf',        # 단기금융상품펀드
+    'CDS': 'deposit',     # 양도성예금증서
+    'NMMF': 'funds',      # 비머니마켓펀드
+    'STOCKS': 'stocks',   # 주식보유
+    'RETQLIQ': 'saving',  # 퇴직준비금유동성
+}
+TARGET_ORDER = ['MMMF', 'CDS', 'NMMF', 'STOCKS', 'RETQLIQ']
+
+# 학습 데이터(cleaned_scf_data.csv)의 특성 컬럼 순서
+# 모델에 feature_names_in_가 있으면 그 순서를 우선 사용
+DEFAULT_FEATURE_ORDER = [
+    '연령대분류', '교육수준분류', '사업농업소득', '자본이득소득', '연령', '금융위험감수',
+    '저축여부', '급여소득', '금융위험회피', '교육수준', '가구주성별', '결혼상태', '자녀수', '직업분류1',
+]
+
+# 아래 대표값은 학습 데이터(cleaned_scf_data.csv, SCF 원자료 단위: 세/교육 코드/USD)의 그룹별 중앙값
+# 모델 입력은 학습 분포 안에 있어야 하므로 데이터가 바뀌면 training_group_medians()로 다시 계산
+
+# 연령대분류 → 연령 중앙값
+AGE_BY_GROUP = {1: 29, 2: 40, 3: 50, 4: 60, 5: 69, 6: 79}
+
+# 교육수준분류 → 교육수준 코드 중앙값
+EDUCATION_BY_GROUP = {1: 5, 2: 8, 3: 9, 4: 12}
+
+# 직업분류1 → 급여소득 중앙값 (USD/년, SCF 직업 코드 2는 자영업자)
+SALARY_BY_JOB = {1: 81068.39, 2: 31346.44, 3: 0.0, 4: 18915.96}
+
+# 대표값 테이블: (특성, 그룹 특성)
+GROUP_MEDIAN_TABLES = {
+    '연령': ('연령대분류', AGE_BY_GROUP),
+    '교육수준': ('교육수준분류', EDUCATION_BY_GROUP),
+    '급여소득': ('직업분류1', SALARY_BY_JOB),
+}
+
+
+def training_group_medians(csv_path):
+    """학습 CSV에서 GROUP_MEDIAN_TABLES와 같은 구조의 {특성: {그룹: 중앙값}} 계산"""
+    values = {feature: {} for feature in GROUP_MEDIAN_TABLES}
+    with open(csv_path, encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            for feature, (group_feature, _) in GROUP_MEDIAN_TABLES.items():
+                group = int(float(row[group_feature]))
+                values[feature].setdefault(group, []).append(float(row[feature]))
+    return {
+        feature: {group: statistics.median(samples) for group, samples in sorted(groups.items())}
+        for feature, groups in values.items()
+    }
+
+
+def profile_features(profile):
+    """
+    UserProfile(또는 같은 필드를 가진 dict)을 모델 특성 dict로 변환
+    프로필에 없는 값(사업/자본 소득, 자녀수)은 0, 범주값이 없으면 학습 데이터의 최빈 구간으로 대체
+    """
+    def field(name, default):
+        value = profile.get(name) if isinstance(profile, dict) else getattr(profile, name, None)
+        return default if value is None else value
+
+    age_group = field('연령대분류', 2)
+    education_group = field('교육수준분류', 3)
+    job_group = field('직업분류1', 1)
+    risk_attitude = field('금융위험태도', 0)
+
+    # 금융위험태도 >= 0 : 위험회피형, < 0 : 위험감수형 (views.calculate_risk_preference와 동일)
+    risk_taking = 1 if risk_attitude < 0 else 0
+
+    return {
+        '연령대분류': age_group,
+        '교육수준분류': education_group,
+        '사업농업소득': 0.0,
+        '자본이득소득': 0.0,
+        '연령': AGE_BY_GROUP.get(age_group, AGE_BY_GROUP[2]),
+        '금융위험감수': risk_taking,
+        '저축여부': field('저축여부', 2),
+        '급여소득': SALARY_BY_JOB.get(job_group, SALARY_BY_JOB[1]),
+        '금융위험회피': 1 - risk_taking,
+        '교육수준': EDUCATION_BY_GROUP.get(education_group, EDUCATION_BY_GROUP[3]),
+        '가구주성별': field('가구주성별', 1),
+        '결혼상태': field('결혼상태', 2),
+        '자녀수': 0,
+        '직업분류1': job_group,
+    }
+
+
+class HoldingProbabilityPredictor:
+    """
+    멀티라벨 LGBM 모델로 사용자별 금융상품 보유 확률 예측
+    프로필 특성은 모두 이산값이므로 특성 벡터 단위로 결과를 메모이제이션하고,
+    캐시에 없는 프로필만 모아 predict_proba를 한 번에 호출
+    """
+
+    def __init__(self, model, max_cache_entries=4096):
+        """model: 학습된 모델, ModelArtifact(첫 예측 때 지연 로드) 또는 None"""
+        self._model_source = model
+        self.max_cache_entries = max_cache_entries
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._feature_names = None
+        self._feature_names_resolved = False
+
+    @property
+    def model(self):
+        source = self._model_source
+        return source.get() if isinstance(source, ModelArtifact) else source
+
+    @property
+    def feature_names(self):
+        if not self._feature_names_resolved:
+            self._feature_names = self._resolve_feature_names(self.model)
+            self._feature_names_resolved = True
+        return self._feature_names
+
+    @staticmethod
+    def _resolve_feature_names(model):
+        if model is None:
+            return None
+        names = getattr(model, 'feature_names_in_', None)
+        if names is not None:
+            return [str(name) for name in names]
+        n_features = getattr(model, 'n_features_in_', len(DEFAULT_FEATURE_ORDER))
+        if n_features != len(DEFAULT_FEATURE_ORDER):
+            print(f"모델 특성 수({n_features})가 프로필 특성 수와 달라 예측을 사용하지 않습니다.")
+            return None
+        return DEFAULT_FEATURE_ORDER
+
+    @property
+    def available(self):
+        return self.model is not None and self.feature_names is not None
+
+    def feature_vector(self, profile):
+        """모델 입력 순서의 특성 튜플 (메모이제이션 키로도 사용)"""
+        features = profile_features(profile)
+        return tuple(features.get(name, 0) for name in self.feature_names)
+
+    def predict_many(self, profiles):
+        """
+        여러 프로필의 카테고리별 보유 확률 일괄 예측
+        반환: 프로필 순서대로 {카테고리: 확률} dict 리스트 (모델을 사용할 수 없으면 None 리스트)
+        """
+        if not self.available:
+            return [None] * len(profiles)
+
+        vectors = [self.feature_vector(profile) for profile in profiles]
+
+        with self._lock:
+            missing = [vector for vector in dict.fromkeys(vectors) if vector not in self._cache]
+
+        if missing:
+            probabilities = self._predict_proba(missing)
+            with self._lock:
+                for vector, row in zip(missing, probabilities):
+                    self._cache[vector] = row
+                    while len(self._cache) > self.max_cache_entries:
+                        self._cache.popitem(last=False)
+
+        results = []
+        with self._lock:
+            for vector in vectors:
+                row = self._cache.get(vector)
+                if row is None:
+                    # 캐시 크기보다 큰 배치에서 밀려난 경우
+                    row = self._predict_proba([vector])[0]
+                else:
+                    self._cache.move_to_end(vector)
+                results.append(dict(row))
+        return results
+
+    def predict(self, profile):
+        """단일 프로필 보유 확률"""
+        return self.predict_many([profile])[0]
+
+    def _predict_proba(self, vectors):
+        """predict_proba 배치 호출 결과를 (카테고리, 확률) 튜플 리스트로 변환"""
+        try:
+            import pandas as pd
+            batch = pd.DataFrame(list(vectors), columns=self.feature_names)
+        except ImportError:
+            batch = np.array(vectors, dtype=np.float64)
+
+        raw = self.model.predict_proba(batch)
+
+        # MultiOutputClassifier는 타겟별 (n, 2) 배열 리스트를 반환
+        if isinstance(raw, list):
+            positive = np.column_stack([target_proba[:, -1] for target_proba in raw])
+        else:
+            positive = np.asarray(raw)
+
+        return [
+            tuple((TARGET_CATEGORIES[target], round(float(value), 3)) for target, value in zip(TARGET_ORDER, row))
+            for row in positive
+        ]
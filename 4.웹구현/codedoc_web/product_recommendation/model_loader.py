@@ -0,0 +1,112 @@
+import os
+import resource
+import sys
+import threading
+import time
+
+import joblib
+
+
+# 추천 시스템의 멀티라벨 LGBM 모델
+MULTILABEL_MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'multilabel_lgbm.joblib')
+
+
+def current_rss_mb():
+    """현재 프로세스 RSS (MB) - /proc이 없으면 최대 RSS로 대체"""
+    try:
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE') / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+class ModelArtifact:
+    """
+    지연 로드 모델 아티팩트
+    생성 시에는 파일을 읽지 않고 첫 get() 호출 때 한 번만 로드 (동시 호출은 완료까지 대기)
+    joblib.load(mmap_mode='r')로 압축되지 않은 numpy 배열은 메모리 매핑되어 워커 간 페이지를 공유
+    로드 실패 시 None을 반환하고 다시 시도하지 않음
+    """
+
+    def __init__(self, path, mmap_mode='r'):
+        self.path = path
+        self.mmap_mode = mmap_mode
+        self._model = None
+        self._loaded = False
+        self._lock = threading.Lock()
+        self.load_ms = None
+        self.rss_delta_mb = None
+        self.error = None
+
+    @property
+    def exists(self):
+        return os.path.exists(self.path)
+
+    @property
+    def is_loaded(self):
+        return self._loaded
+
+    def get(self):
+        """모델 객체 (필요하면 로드, 없거나 실패하면 None)"""
+        if self._loaded:
+            return self._model
+
+        with self._lock:
+            if not self._loaded:
+                self._model = self._load()
+                self._loaded = True
+            return self._model
+
+    def _load(self):
+        if not self.exists:
+            self.error = 'FileNotFoundError'
+            print(f"모델 파일 없음: {self.path}")
+            return None
+
+        rss_before = current_rss_mb()
+        start_time = time.perf_counter()
+        try:
+            model = joblib.load(self.path, mmap_mode=self.mmap_mode)
+        except Exception as e:
+            self.error = f"{type(e).__name__}: {e}"
+            print(f"모델 로드 실패: {self.path} ({self.error})")
+            return None
+
+        self.load_ms = round((time.perf_counter() - start_time) * 1000, 1)
+        self.rss_delta_mb = round(current_rss_mb() - rss_before, 1)
+        print(f"모델 로드 완료: {os.path.basename(self.path)} {self.load_ms}ms, RSS +{self.rss_delta_mb}MB")
+        return model
+
+    def stats(self):
+        """로드 상태/시간/메모리 증가량"""
+        return {
+            'path': self.path,
+            'exists': self.exists,
+            'size_mb': round(os.path.getsize(self.path) / (1024 * 1024), 2) if self.exists else None,
+            'loaded': self._loaded,
+            'load_ms': self.load_ms,
+            'rss_delta_mb': self.rss_delta_mb,
+            'error': self.error,
+        }
+
+
+_artifacts = {}
+_artifacts_lock = threading.Lock()
+
+
+def get_model_artifact(path=MULTILABEL_MODEL_PATH, mmap_mode='r'):
+    """경로별 프로세스 공유 ModelArtifact (같은 파일은 프로세스당 한 번만 로드)"""
+    path = os.path.abspath(path)
+    with _artifacts_lock:
+        artifact = _artifacts.get(path)
+        if artifact is None:
+            artifact = _artifacts[path] = ModelArtifact(path, mmap_mode)
+        return artifact
+
+
+def model_artifact_stats():
+    """등록된 모든 모델 아티팩트 상태"""
+    with _artifacts_lock:
+        return [artifact.stats() for artifact in _artifacts.values()]
@@ -1,3 +1,109 @@
 from django.db import models
 
-# Create your models here.
+
+class FinancialProductQuerySet(models.QuerySet):
+    # 정렬 옵션 → 색인된 컬럼 기준 정렬 (동점은 id 순서로 고정해 페이지 간 중복/누락 방지)
+    SORT_FIELDS = {
+        'rate': ('-best_rate', 'id'),
+        'rate_asc': ('best_rate', 'id'),
+        'name': ('name', 'id'),
+        'company': ('company_name', 'id'),
+        'risk': ('risk_level', 'id'),
+        'default': ('category_rank', 'id'),
+    }
+
+    def listing(self, category=None, company=None, min_rate=None, max_risk=None, sort='default'):
+        """
+        상품 목록 조회 (category/company_name/best_rate/risk_level 색인 사용)
+        category: 상품 종류 또는 종류 리스트, company: 금융회사명(정확히 일치)
+        min_rate: 최고 금리/수익률 하한, max_risk: 위험등급 상한 (위험등급이 없는 예적금은 제외하지 않음)
+        """
+        queryset = self
+        if category:
+            queryset = queryset.filter(category__in=[category] if isinstance(category, str) else category)
+        if company:
+            queryset = queryset.filter(company_name=company)
+        if min_rate is not None:
+            queryset = queryset.filter(best_rate__gte=min_rate)
+        if max_risk is not None:
+            queryset = queryset.filter(models.Q(risk_level__lte=max_risk) | models.Q(risk_level__isnull=True))
+        return queryset.order_by(*self.SORT_FIELDS.get(sort, self.SORT_FIELDS['default']))
+
+
+class FinancialProduct(models.Model):
+    CATEGORY_CHOICES = [
+        ('deposit', '예금'),
+        ('saving', '적금'),
+        ('fund', '펀드'),
+        ('stock', '주식'),
+        ('mmf', '머니마켓펀드'),
+    ]
+    # 전체 목록 기본 정렬 순서 (예금 → 적금 → 펀드 → 주식 → MMF)
+    CATEGORY_RANKS = {category: rank for rank, (category, _) in enumerate(CATEGORY_CHOICES)}
+
+    category = models.CharField(max_length=10, choices=CATEGORY_CHOICES, verbose_name='상품 종류')
+    category_rank = models.PositiveSmallIntegerField(default=0, verbose_name='종류 정렬 순서')
+    product_code = models.CharField(max_length=40, verbose_name='상품 코드')  # fin_prdt_cd / stock_code
+    company_code = models.CharField(max_length=20, blank=True, default='', verbose_name='금융회사 코드')
+    company_name = models.CharField(max_length=100, blank=True, default='', verbose_name='금융회사')
+    name = models.CharField(max_length=200, verbose_name='상품명')
+    join_way = models.CharField(max_length=200, blank=True, default='', verbose_name='가입 방법')
+    risk_level = models.PositiveSmallIntegerField(null=True, blank=True, verbose_name='위험등급')
+
+    # 수집 시 미리 계산한 최고 금리 (예적금: 옵션 중 최고 우대금리, 펀드/MMF: 수익률, 주식: 등락률)
+    best_rate = models.FloatField(null=True, blank=True, verbose_name='최고 금리/수익률')
+    best_base_rate = models.FloatField(null=True, blank=True, verbose_name='최고 기본금리')
+    best_rate_term = models.PositiveSmallIntegerField(null=True, blank=True, verbose_name='최고 금리 기간(개월)')
+
+    disclosure_month = models.CharField(max_length=6, blank=True, default='', verbose_name='공시 제출월')
+    raw = models.JSONField(default=dict, verbose_name='원본 데이터')  # FSS baseList 행
+    display = models.JSONField(default=dict, verbose_name='화면용 데이터')  # 목록 템플릿에서 쓰는 dict
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = FinancialProductQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['category', 'company_code', 'product_code'], name='unique_financial_product'),
+        ]
+        indexes = [
+            models.Index(fields=['category', 'best_rate'], name='product_category_rate_idx'),
+            models.Index(fields=['category', 'risk_level'], name='product_category_risk_idx'),
+            models.Index(fields=['company_name'], name='product_company_idx'),
+            models.Index(fields=['best_rate'], name='product_rate_idx'),
+            models.Index(fields=['category_rank', 'id'], name='product_listing_idx'),
+            # 상품 DB 버전(마지막 적재 시각) 조회 - 검색 결과/패싯 캐시 키
+            models.Index(fields=['updated_at'], name='product_updated_idx'),
+            # 상품 검색 필터/패싯 집계와 짧은 검색어 LIKE를 원본 JSON이 든 넓은 행 대신 색인만으로 처리
+            models.Index(
+                fields=['category', 'risk_level', 'join_way', 'best_rate', 'name', 'company_name'],
+                name='product_search_facet_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f"[{self.get_category_display()}] {self.name}"
+
+
+class ProductOption(models.Model):
+    """상품별 금리/수익률 옵션 (FSS optionList 행)"""
+
+    product = models.ForeignKey(FinancialProduct, on_delete=models.CASCADE, related_name='options')
+    option_key = models.CharField(max_length=80, verbose_name='옵션 키')
+    save_term = models.PositiveSmallIntegerField(null=True, blank=True, verbose_name='저축 기간(개월)')
+    rate_type = models.CharField(max_length=20, blank=True, default='', verbose_name='금리 유형')  # 단리/복리, 수익률 기간
+    reserve_type = models.CharField(max_length=20, blank=True, default='', verbose_name='적립 유형')
+    rate = models.FloatField(null=True, blank=True, verbose_name='기본 금리/수익률')
+    max_rate = models.FloatField(null=True, blank=True, verbose_name='최고 우대금리')
+    raw = models.JSONField(default=dict, verbose_name='원본 데이터')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['product', 'option_key'], name='unique_product_option'),
+        ]
+        indexes = [
+            models.Index(fields=['save_term', 'max_rate'], name='option_term_rate_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.product.name} {self.option_key}"
@@ -0,0 +1,286 @@
+import copy
+import json
+import os
+import threading
+
+from .catalog_snapshot import DATA_DIR, catalog_version, file_hash
+from .models import FinancialProduct
+from .product_search import join_channels
+from .product_store import STORE_FILES, build_rows
+
+
+PRODUCT_TYPE_NAMES = dict(FinancialProduct.CATEGORY_CHOICES)
+
+# 상세 페이지 기본 정보 (원본 필드, 표시 이름)
+DETAIL_FIELDS = {
+    'deposit': [
+        ('join_member', '가입대상'), ('spcl_cnd', '우대조건'), ('mtrt_int', '만기 후 이자율'),
+        ('max_limit', '최고한도'), ('etc_note', '기타 유의사항'),
+    ],
+    'saving': [
+        ('join_member', '가입대상'), ('spcl_cnd', '우대조건'), ('mtrt_int', '만기 후 이자율'),
+        ('max_limit', '최고한도'), ('etc_note', '기타 유의사항'),
+    ],
+    'fund': [('fund_type', '펀드유형'), ('risk_level', '위험등급'), ('fee_info', '수수료'), ('min_invest', '최소투자금액')],
+    'mmf': [
+        ('fund_type', '펀드유형'), ('risk_level', '위험등급'), ('fee_info', '수수료'), ('min_invest', '최소투자금액'),
+        ('liquidity', '유동성'),
+    ],
+    'stock': [
+        ('market_div', '시장'), ('sector', '업종'), ('current_price', '현재가'), ('prev_close', '전일종가'),
+        ('change_rate', '등락률(%)'), ('volume', '거래량'), ('market_cap', '시가총액'),
+    ],
+}
+
+# 옵션 표 컬럼 (원본 필드, 표시 이름) - 예적금은 기간별 금리, 펀드/MMF는 기간별 수익률, 주식은 분석 지표
+OPTION_COLUMNS = {
+    'deposit': [('save_trm', '기간(개월)'), ('intr_rate_type_nm', '금리유형'), ('intr_rate', '기본금리(%)'), ('intr_rate2', '최고우대금리(%)')],
+    'saving': [
+        ('save_trm', '기간(개월)'), ('intr_rate_type_nm', '금리유형'), ('rsrv_type_nm', '적립유형'),
+        ('intr_rate', '기본금리(%)'), ('intr_rate2', '최고우대금리(%)'),
+    ],
+    'fund': [('return_type', '기간'), ('return_rate', '수익률(%)'), ('nav', '기준가'), ('total_assets', '순자산')],
+    'mmf': [
+        ('return_type', '기간'), ('return_rate', '수익률(%)'), ('yield_today', '당일 수익률(%)'), ('nav', '기준가'),
+        ('total_assets', '순자산'),
+    ],
+    'stock': [
+        ('analysis_type', '분석'), ('rsi', 'RSI'), ('macd_signal', 'MACD'), ('bollinger_position', '볼린저밴드'),
+        ('target_price', '목표가'),
+    ],
+}
+
+# 비슷한 상품: 같은 종류에서 금리/수익률이 가까운 상품 (위험등급 차이, 펀드유형/업종이 다르면 거리 추가)
+SIMILAR_COUNT = 4
+SIMILAR_WINDOW = 10  # 금리 순으로 정렬한 뒤 앞뒤 몇 개까지 후보로 볼지
+RISK_DISTANCE_WEIGHT = 0.5
+GROUP_MISMATCH_DISTANCE = 1.0
+MISSING_RATE_DISTANCE = 100.0
+SIMILAR_GROUP_FIELDS = {'fund': 'fund_type', 'mmf': 'fund_type', 'stock': 'sector'}
+
+# 상품 종류 → 추천 카탈로그 카테고리 (파일이 같으므로 버전도 추천 시스템과 동일)
+CATALOG_CATEGORIES = {'deposit': 'deposit', 'saving': 'saving', 'fund': 'funds', 'stock': 'stocks', 'mmf': 'mmf'}
+
+
+def _summary(entry):
+    """비슷한 상품 목록에 쓰는 요약"""
+    return {
+        'product_type': entry['product_type'],
+        'product_code': entry['product_code'],
+        'company_code': entry['company_code'],
+        'name': entry['name'],
+        'company_name': entry['company_name'],
+        'best_rate': entry['best_rate'],
+        'risk_level': entry['risk_level'],
+    }
+
+
+def build_entries(category, response):
+    """FSS 응답 → 상세 항목 리스트 (옵션은 기간/유형 순, 같은 옵션 키는 마지막 행)"""
+    columns = OPTION_COLUMNS[category]
+    entries = []
+    for fields, options in build_rows(category, response):
+        raw = fields['raw']
+        options = sorted(
+            {option['option_key']: option for option in options}.values(),
+            key=lambda option: (option['save_term'] is None, option['save_term'] or 0, option['rate_type'], option['reserve_type']),
+        )
+        entries.append({
+            'product_type': category,
+            'product_type_name': PRODUCT_TYPE_NAMES[category],
+            'product_code': fields['product_code'],
+            'company_code': fields['company_code'],
+            'company_name': fields['company_name'],
+            'name': fields['name'],
+            'join_way': fields['join_way'],
+            'join_channels': join_channels(fields['join_way']),
+            'risk_level': fields['risk_level'],
+            'best_rate': fields['best_rate'],
+            'best_base_rate': fields['best_base_rate'],
+            'best_rate_term': fields['best_rate_term'],
+            'disclosure_month': fields['disclosure_month'],
+            'details': [
+                {'label': label, 'value': raw[field]}
+                for field, label in DETAIL_FIELDS[category] if raw.get(field) not in (None, '')
+            ],
+            'option_columns': [label for _, label in columns],
+            'options': [
+                {
+                    'save_term': option['save_term'],
+                    'rate_type': option['rate_type'],
+                    'reserve_type': option['reserve_type'],
+                    'rate': option['rate'],
+                    'max_rate': option['max_rate'],
+                    'cells': [option['raw'].get(field) for field, _ in columns],
+                }
+                for option in options
+            ],
+            'display': fields['display'],
+            'similar': [],
+            '_group': raw.get(SIMILAR_GROUP_FIELDS.get(category)),
+        })
+    return entries
+
+
+def attach_similar(entries, count=SIMILAR_COUNT, window=SIMILAR_WINDOW):
+    """
+    같은 종류 상품들의 비슷한 상품 목록을 미리 계산
+    금리 순으로 정렬해 앞뒤 window개만 비교하므로 O(n log n + n·window)
+    """
+    order = sorted(
+        range(len(entries)),
+        key=lambda i: (entries[i]['best_rate'] is None, entries[i]['best_rate'] or 0, entries[i]['name']),
+    )
+    for position, index in enumerate(order):
+        entry = entries[index]
+        candidates = []
+        for other_index in order[max(0, position - window):position + window + 1]:
+            if other_index == index:
+                continue
+            other = entries[other_index]
+            if entry['best_rate'] is None or other['best_rate'] is None:
+                distance = MISSING_RATE_DISTANCE
+            else:
+                distance = abs(entry['best_rate'] - other['best_rate'])
+            if entry['risk_level'] is not None and other['risk_level'] is not None:
+                distance += RISK_DISTANCE_WEIGHT * abs(entry['risk_level'] - other['risk_level'])
+            if entry['_group'] != other['_group']:
+                distance += GROUP_MISMATCH_DISTANCE
+            candidates.append((distance, other['name'], other_index))
+        entry['similar'] = [_summary(entries[other_index]) for _, _, other_index in sorted(candidates)[:count]]
+
+
+class ProductDetailIndex:
+    """
+    상품 상세 조회용 색인 (예금/적금/펀드/주식/MMF)
+    - (상품 종류, 상품 코드) → 상세 항목 dict 조회 O(1), 같은 코드가 여러 금융회사에 있으면 금융회사 코드로 구분
+    - 항목에는 옵션 행 전체(기간별 금리/수익률 등)와 미리 계산한 비슷한 상품 목록 포함
+    - 원본 파일 상태(mtime, 크기)가 바뀌면 다음 조회 때 다시 만들고, 버전(원본 해시 기반, 추천 카탈로그 버전과 동일)이
+      바뀌면 렌더링된 상세 HTML 캐시도 함께 버림
+    """
+
+    def __init__(self, data_dir=DATA_DIR):
+        self.data_dir = data_dir
+        self._state = None
+        self._lock = threading.Lock()
+        self.stats = {'builds': 0, 'lookups': 0, 'render_hits': 0, 'render_misses': 0}
+
+    def _source_stats(self):
+        stats = {}
+        for category, filename in STORE_FILES.items():
+            try:
+                stat = os.stat(os.path.join(self.data_dir, filename))
+                stats[category] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                stats[category] = None
+        return stats
+
+    def _build(self, source_stats):
+        products = {}
+        by_company = {}
+        by_code = {}
+        hashes = {}
+        for category, filename in STORE_FILES.items():
+            path = os.path.join(self.data_dir, filename)
+            try:
+                with open(path, 'rb') as f:
+                    raw = f.read()
+                response = json.loads(raw)
+            except (OSError, ValueError) as e:
+                print(f"상품 상세 색인 파일 로드 실패: {path} ({e})")
+                hashes[CATALOG_CATEGORIES[category]] = None
+                continue
+            hashes[CATALOG_CATEGORIES[category]] = file_hash(raw)
+
+            entries = build_entries(category, response)
+            attach_similar(entries)
+            for entry in entries:
+                del entry['_group']
+                products.setdefault((category, entry['product_code']), entry)
+                by_company[(category, entry['company_code'], entry['product_code'])] = entry
+                by_code.setdefault(entry['product_code'], []).append(entry)
+
+        self.stats['builds'] += 1
+        return {
+            'source_stats': source_stats,
+            'version': catalog_version(hashes),
+            'products': products,
+            'by_company': by_company,
+            'by_code': by_code,
+            'fragments': {},
+        }
+
+    def _current(self):
+        source_stats = self._source_stats()
+        state = self._state
+        if state is not None and state['source_stats'] == source_stats:
+            return state
+        with self._lock:
+            if self._state is None or self._state['source_stats'] != source_stats:
+                new_state = self._build(source_stats)
+                # 파일만 다시 쓰이고 내용(버전)이 같으면 렌더링 캐시 유지
+                if self._state is not None and self._state['version'] == new_state['version']:
+                    new_state['fragments'] = self._state['fragments']
+                self._state = new_state
+            return self._state
+
+    @property
+    def version(self):
+        return self._current()['version']
+
+    def _entry(self, state, product_type, product_code, company_code=None):
+        if company_code:
+            return state['by_company'].get((product_type, company_code, product_code))
+        return state['products'].get((product_type, product_code))
+
+    def get(self, product_type, product_code, company_code=None):
+        """상세 항목 복사본 (없으면 None)"""
+        state = self._current()
+        self.stats['lookups'] += 1
+        entry = self._entry(state, product_type, product_code, company_code)
+        return copy.deepcopy(entry) if entry is not None else None
+
+    def summary(self, product_type, product_code, company_code=None):
+        """이름/금융회사/금리 요약 (없으면 None)"""
+        entry = self._entry(self._current(), product_type, product_code, company_code)
+        return _summary(entry) if entry is not None else None
+
+    def locate(self, product_code, company_name=None, product_types=None):
+        """
+        종류를 모르는 상품 코드(추천 결과 등) → 요약 (종류, 금융회사 코드 포함, 없으면 None)
+        product_types로 종류를 제한하고, 같은 코드가 여러 개면 금융회사 이름이 같은 상품 우선
+        """
+        candidates = [
+            entry for entry in self._current()['by_code'].get(str(product_code or ''), [])
+            if not product_types or entry['product_type'] in product_types
+        ]
+        if not candidates:
+            return None
+        entry = next((entry for entry in candidates if entry['company_name'] == company_name), candidates[0])
+        return _summary(entry)
+
+    def render(self, product_type, product_code, render_fn, company_code=None):
+        """
+        render_fn(상세 항목)으로 만든 HTML 조각을 색인 버전 동안 캐시
+        반환: (요약, HTML 문자열) - 둘 다 같은 색인 상태의 항목에서 만듦 (상품이 없으면 None)
+        """
+        state = self._current()
+        entry = self._entry(state, product_type, product_code, company_code)
+        if entry is None:
+            return None
+        key = (product_type, entry['company_code'], entry['product_code'])
+        fragment = state['fragments'].get(key)
+        if fragment is not None:
+            self.stats['render_hits'] += 1
+            return _summary(entry), fragment
+        self.stats['render_misses'] += 1
+        fragment = render_fn(copy.deepcopy(entry))
+        state['fragments'][key] = fragment
+        return _summary(entry), fragment
+
+    def __len__(self):
+        return len(self._current()['by_company'])
+
+
+# 전역 상품 상세 색인 인스턴스
+product_detail_index = ProductDetailIndex()
@@ -0,0 +1,316 @@
+import hashlib
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+
+from .models import FinancialProduct
+
+
+# 상품 검색용 SQLite FTS5 가상 테이블 (rowid = FinancialProduct.id)
+# trigram 토크나이저: 띄어쓰기 없는 한국어 상품명('정기예금', '자유적금')도 부분 문자열로 검색
+SEARCH_TABLE = 'product_recommendation_search'
+SEARCH_COLUMNS = ('name', 'company_name', 'conditions', 'features')
+# bm25 컬럼 가중치 (상품명 > 금융회사 > 특징 > 우대조건)
+SEARCH_WEIGHTS = (10.0, 5.0, 1.0, 2.0)
+
+# 원본(raw) 필드 → 검색 컬럼
+CONDITION_FIELDS = ('spcl_cnd', 'join_member', 'etc_note')
+FEATURE_FIELDS = ('fund_type', 'fee_info', 'min_invest', 'liquidity', 'market_div', 'sector')
+
+# trigram 토크나이저가 MATCH로 찾을 수 있는 최소 글자 수 (더 짧은 검색어는 LIKE로 검색)
+MIN_MATCH_LENGTH = 3
+
+SEARCH_MAX_PER_PAGE = 50
+
+# 검색 결과/패싯 캐시 (워커 간 공유 캐시, 키에 상품 DB 버전이 들어가므로 적재 후에는 자동으로 새 키)
+SEARCH_CACHE_TIMEOUT = 10 * 60
+
+PRODUCT_TABLE = FinancialProduct._meta.db_table
+
+INSERT_SQL = (
+    f"INSERT INTO {SEARCH_TABLE} (rowid, {', '.join(SEARCH_COLUMNS)}, category) "
+    f"VALUES ({', '.join(['%s'] * (len(SEARCH_COLUMNS) + 2))})"
+)
+
+
+def create_search_table(schema_connection=None):
+    """
+    FTS5 검색 테이블 생성 (SQLite가 아니거나 FTS5/trigram을 지원하지 않으면 생성하지 않음)
+    반환: 생성 여부
+    """
+    db = schema_connection or connection
+    if db.vendor != 'sqlite':
+        return False
+    columns = ', '.join(SEARCH_COLUMNS)
+    try:
+        with db.cursor() as cursor:
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} "
+                f"USING fts5({columns}, category UNINDEXED, tokenize='trigram')"
+            )
+    except Exception as e:
+        print(f"상품 검색 테이블 생성 실패 (FTS5 trigram 미지원): {e}")
+        return False
+    return True
+
+
+def drop_search_table(schema_connection=None):
+    db = schema_connection or connection
+    if db.vendor == 'sqlite':
+        with db.cursor() as cursor:
+            cursor.execute(f"DROP TABLE IF EXISTS {SEARCH_TABLE}")
+
+
+def search_available():
+    """FTS5 검색 테이블 사용 가능 여부"""
+    return connection.vendor == 'sqlite' and SEARCH_TABLE in connection.introspection.table_names()
+
+
+def _joined(raw, fields):
+    return ' '.join(str(raw[field]) for field in fields if raw.get(field) not in (None, ''))
+
+
+def search_row(product_id, category, name, company_name, raw):
+    """검색 테이블 한 행 (rowid, 상품명, 금융회사, 우대조건, 특징, 종류)"""
+    return (product_id, name, company_name, _joined(raw, CONDITION_FIELDS), _joined(raw, FEATURE_FIELDS), category)
+
+
+def index_products(category=None):
+    """
+    상품 테이블 → 검색 테이블 동기화 (category가 주어지면 해당 종류만 다시 색인)
+    반환: 색인한 상품 수 (검색 테이블이 없으면 None)
+    """
+    if not search_available():
+        return None
+
+    queryset = FinancialProduct.objects.all()
+    if category:
+        queryset = queryset.filter(category=category)
+    rows = [
+        search_row(*values)
+        for values in queryset.values_list('id', 'category', 'name', 'company_name', 'raw').iterator()
+    ]
+
+    with connection.cursor() as cursor:
+        if category:
+            cursor.execute(f"DELETE FROM {SEARCH_TABLE} WHERE category = %s", [category])
+        else:
+            cursor.execute(f"DELETE FROM {SEARCH_TABLE}")
+        cursor.executemany(INSERT_SQL, rows)
+    return len(rows)
+
+
+def split_query(query):
+    """검색어 → (MATCH용 토큰, LIKE용 짧은 토큰)"""
+    tokens = [token for token in (query or '').split() if token]
+    return (
+        [token for token in tokens if len(token) >= MIN_MATCH_LENGTH],
+        [token for token in tokens if len(token) < MIN_MATCH_LENGTH],
+    )
+
+
+def match_expression(tokens):
+    """FTS5 MATCH 식 (토큰을 문자열로 감싸 연산자/특수문자를 그대로 검색, 모든 토큰 AND)"""
+    return ' AND '.join('"{}"'.format(token.replace('"', '""')) for token in tokens)
+
+
+def join_channels(join_way):
+    """'영업점,인터넷,스마트폰' → ['영업점', '인터넷', '스마트폰']"""
+    return [channel.strip() for channel in (join_way or '').split(',') if channel.strip()]
+
+
+def _query_source(query, with_score=False):
+    """
+    검색어 → (WITH 절 + FROM 절, 파라미터, 순위 사용 여부)
+    MATCH 결과(rowid, bm25)를 먼저 구체화(MATERIALIZED)한 뒤 상품 테이블과 조인
+    → 상품 테이블 행마다 FTS를 다시 조회하는 실행 계획을 막음 (FTS5 MATCH/bm25는 별칭 없이 테이블 이름으로 참조)
+    bm25는 매칭 행 수에 비례해 비싸므로 순위가 필요한 페이지 조회(with_score)에서만 계산
+    검색어가 없으면 상품 테이블만 사용
+    """
+    match_tokens, _ = split_query(query)
+    if not match_tokens:
+        return f"FROM {PRODUCT_TABLE} AS p", [], False
+    weights = ', '.join(str(weight) for weight in SEARCH_WEIGHTS)
+    score = f"bm25({SEARCH_TABLE}, {weights})" if with_score else '0'
+    return (
+        f"WITH hits AS MATERIALIZED (SELECT rowid AS id, {score} AS score "
+        f"FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH %s) "
+        f"{{select}} FROM hits JOIN {PRODUCT_TABLE} AS p ON p.id = hits.id",
+        [match_expression(match_tokens)],
+        True,
+    )
+
+
+def _select(query, select, where_sql, where_params, with_score=False):
+    """SELECT 문 조립 (WITH 절이 SELECT보다 앞에 와야 하므로 검색어 유무에 따라 위치를 맞춤)"""
+    source, params, ranked = _query_source(query, with_score)
+    if ranked:
+        sql = source.format(select=f"SELECT {select}")
+    else:
+        sql = f"SELECT {select} {source}"
+    return f"{sql} WHERE {where_sql}", params + where_params, ranked
+
+
+def _where(query, categories=None, max_risk=None, join_way=None, min_rate=None):
+    """
+    필터 조건 SQL과 파라미터 (p: 상품 테이블)
+    trigram으로 찾을 수 없는 짧은 검색어는 상품명/금융회사 LIKE (긴 우대조건 텍스트까지 훑지 않도록 두 컬럼만)
+    """
+    _, like_tokens = split_query(query)
+    clauses = []
+    params = []
+    for token in like_tokens:
+        pattern = '%' + token.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        clauses.append("(p.name LIKE %s ESCAPE '\\' OR p.company_name LIKE %s ESCAPE '\\')")
+        params.extend([pattern, pattern])
+    if categories:
+        clauses.append(f"p.category IN ({', '.join(['%s'] * len(categories))})")
+        params.extend(categories)
+    if max_risk is not None:
+        # 위험등급이 없는 예적금은 제외하지 않음 (FinancialProductQuerySet.listing과 동일)
+        clauses.append("(p.risk_level <= %s OR p.risk_level IS NULL)")
+        params.append(max_risk)
+    if join_way:
+        clauses.append("(',' || p.join_way || ',') LIKE %s")
+        params.append(f'%,{join_way},%')
+    if min_rate is not None:
+        clauses.append("p.best_rate >= %s")
+        params.append(min_rate)
+    return (' AND '.join(clauses) or '1'), params
+
+
+def _facet_counts(cursor, query, categories, max_risk, join_way, min_rate):
+    """
+    전체 결과 수와 패싯별 상품 수를 한 번의 GROUP BY(종류 × 위험등급 × 가입 방법)로 집계
+    - 각 패싯은 자기 필터를 뺀 나머지 조건으로 집계 (선택을 바꿨을 때의 결과 수)
+    - 가입 방법은 쉼표로 묶인 값을 채널 단위로 나눠 합산
+    반환: (전체 결과 수, {'category': {...}, 'risk_level': {...}, 'join_way': {...}})
+    """
+    sql, params, _ = _select(
+        query, 'p.category, p.risk_level, p.join_way, COUNT(*)', *_where(query, min_rate=min_rate)
+    )
+    cursor.execute(f"{sql} GROUP BY p.category, p.risk_level, p.join_way", params)
+
+    total = 0
+    facets = {'category': {}, 'risk_level': {}, 'join_way': {}}
+    for category, risk_level, join_value, count in cursor.fetchall():
+        channels = join_channels(join_value)
+        checks = {
+            'category': not categories or category in categories,
+            'risk_level': max_risk is None or risk_level is None or risk_level <= max_risk,
+            'join_way': not join_way or join_way in channels,
+        }
+        if all(checks.values()):
+            total += count
+        for facet in facets:
+            if not all(passed for name, passed in checks.items() if name != facet):
+                continue
+            if facet == 'category':
+                values = [category]
+            elif facet == 'risk_level':
+                values = [str(risk_level) if risk_level is not None else 'none']
+            else:
+                values = channels
+            for value in values:
+                facets[facet][value] = facets[facet].get(value, 0) + count
+
+    facets['join_way'] = dict(sorted(facets['join_way'].items(), key=lambda item: -item[1]))
+    return total, facets
+
+
+def store_version():
+    """
+    상품 DB 버전 (상품 수 + 마지막 적재 시각, updated_at 색인 사용)
+    적재(ingest_category)마다 해당 종류 상품의 updated_at이 갱신되고, 삭제만 있는 경우는 상품 수가 바뀜
+    """
+    # 한 SELECT에서 COUNT와 MAX를 함께 집계하면 색인 전체를 훑으므로 각각 스칼라 서브쿼리로
+    # (COUNT(*)는 b-tree 개수, MAX는 updated_at 색인 끝 한 번 조회)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT (SELECT COUNT(*) FROM {PRODUCT_TABLE}), (SELECT MAX(updated_at) FROM {PRODUCT_TABLE})"
+        )
+        count, updated_at = cursor.fetchone()
+    return f"{count}:{updated_at or ''}"
+
+
+def _search_cache():
+    return caches[getattr(settings, 'PRODUCT_SEARCH_CACHE', 'recommendations')]
+
+
+def _cache_key(kind, *parts):
+    return f'product-search:{kind}:' + hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+
+def search_products(query='', categories=None, max_risk=None, join_way=None, min_rate=None, page=1, per_page=10):
+    """
+    상품 검색 (상품명/금융회사/우대조건(spcl_cnd 등)/펀드·주식 특징)
+    - 3글자 이상 검색어는 FTS5 MATCH + bm25 순위, 더 짧은 검색어는 상품명/금융회사 LIKE
+    - 필터: 상품 종류(여러 개), 위험등급 상한, 가입 방법(채널), 최고 금리/수익률 하한
+    - 검색어가 없으면 필터만 적용해 금리 높은 순
+    - 상품 DB 버전별 캐시: 같은 조건의 페이지 결과는 통째로, 패싯(전체 결과 수 포함)은 페이지와 무관하게 재사용
+      → 필터만 쓰는 목록/자주 쓰는 검색어는 버전 조회 한 번으로 응답, 다음 페이지는 패싯 집계 생략
+    반환: {'query', 'page', 'per_page', 'num_pages', 'total', 'results', 'facets', 'took_ms', 'cached'}
+    """
+    start_time = time.perf_counter()
+    per_page = max(1, min(int(per_page), SEARCH_MAX_PER_PAGE))
+    page = max(1, int(page))
+    categories = sorted({category for category in (categories or []) if category in FinancialProduct.CATEGORY_RANKS})
+
+    cache = _search_cache()
+    version = store_version()
+    conditions = (query or '', tuple(categories), max_risk, join_way, min_rate)
+    result_key = _cache_key('result', version, conditions, page, per_page)
+    cached = cache.get(result_key)
+    if cached is not None:
+        return dict(cached, took_ms=round((time.perf_counter() - start_time) * 1000, 2), cached=True)
+
+    where = _where(query, categories, max_risk, join_way, min_rate)
+    _, _, ranked = _query_source(query)
+
+    with connection.cursor() as cursor:
+        facets_key = _cache_key('facets', version, conditions)
+        counted = cache.get(facets_key)
+        if counted is None:
+            counted = _facet_counts(cursor, query, categories, max_risk, join_way, min_rate)
+            cache.set(facets_key, counted, SEARCH_CACHE_TIMEOUT)
+        total, facets = counted
+        num_pages = max(1, math.ceil(total / per_page))
+        page = min(page, num_pages)
+
+        # bm25는 작을수록 관련도가 높음, 동점은 금리 높은 순 → id
+        sql, params, _ = _select(query, f"p.id, {'hits.score' if ranked else '0'} AS score", *where, with_score=True)
+        cursor.execute(
+            f"{sql} ORDER BY score, p.best_rate IS NULL, p.best_rate DESC, p.id LIMIT %s OFFSET %s",
+            params + [per_page, (page - 1) * per_page],
+        )
+        ranked_ids = cursor.fetchall()
+
+    products = FinancialProduct.objects.only('id', 'category', 'best_rate', 'risk_level', 'display').in_bulk(
+        [product_id for product_id, _ in ranked_ids]
+    )
+    results = []
+    for product_id, score in ranked_ids:
+        product = products[product_id]
+        results.append(dict(
+            product.display,
+            id=product.id,
+            category=product.category,
+            best_rate=product.best_rate,
+            risk_level=product.risk_level,
+            score=round(-score, 4) if ranked else None,
+        ))
+
+    result = {
+        'query': query or '',
+        'page': page,
+        'per_page': per_page,
+        'num_pages': num_pages,
+        'total': total,
+        'results': results,
+        'facets': facets,
+    }
+    cache.set(result_key, result, SEARCH_CACHE_TIMEOUT)
+    return dict(result, took_ms=round((time.perf_counter() - start_time) * 1000, 2), cached=False)
@@ -0,0 +1,210 @@
+import json
+import os
+
+from django.db import transaction
+
+from .catalog_snapshot import CATALOG_FILES, DATA_DIR
+from .fss_delta import option_key
+from .models import FinancialProduct, ProductOption
+from .product_search import index_products
+from .utils import ProductDataLoader
+
+
+# 상품 종류 → 원본 JSON 파일
+STORE_FILES = {
+    'deposit': 'bank_deposits.json',
+    'saving': 'bank_savings.json',
+    'fund': 'funds.json',
+    'stock': 'stocks.json',
+    'mmf': 'money_market_funds.json',
+}
+
+# 추천 카탈로그 카테고리(funds, stocks 등) → 상품 종류 (같은 원본 파일)
+STORE_CATEGORY_BY_CATALOG = {
+    catalog_category: category
+    for category, filename in STORE_FILES.items()
+    for catalog_category, catalog_filename in CATALOG_FILES.items() if catalog_filename == filename
+}
+
+PRODUCT_TYPE_NAMES = dict(FinancialProduct.CATEGORY_CHOICES)
+
+# 옵션 행 bulk_create 한 번에 넣을 개수
+BULK_BATCH_SIZE = 500
+
+
+def _to_float(value):
+    try:
+        return float(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _to_int(value):
+    try:
+        return int(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _product_code(row):
+    return str(row.get('fin_prdt_cd') or row.get('stock_code') or '')
+
+
+def _match_key(row):
+    return (str(row.get('fin_co_no') or ''), _product_code(row))
+
+
+def display_products(category, response):
+    """
+    목록 템플릿에서 쓰는 상품 dict (기존 product_list와 같은 형태)
+    예적금은 원본 행 + product_type, 펀드/주식/MMF는 ProductDataLoader 변환 결과
+    """
+    if category == 'fund':
+        return ProductDataLoader.process_fund_data(response)
+    if category == 'stock':
+        return ProductDataLoader.process_stock_data(response)
+    if category == 'mmf':
+        return ProductDataLoader.process_mmf_data(response)
+    return [
+        dict(base, product_type=category, product_type_name=PRODUCT_TYPE_NAMES[category])
+        for base in (response.get('result') or {}).get('baseList') or []
+    ]
+
+
+def _option_fields(row):
+    rate = _to_float(row.get('intr_rate', row.get('return_rate')))
+    return {
+        'option_key': option_key(row) or 'default',
+        'save_term': _to_int(row.get('save_trm')),
+        'rate_type': row.get('intr_rate_type_nm') or row.get('return_type') or row.get('analysis_type') or '',
+        'reserve_type': row.get('rsrv_type_nm') or '',
+        'rate': rate,
+        'max_rate': _to_float(row.get('intr_rate2')) if row.get('intr_rate2') is not None else rate,
+        'raw': row,
+    }
+
+
+def build_rows(category, response):
+    """
+    FSS 응답 → [(상품 필드 dict, 옵션 필드 dict 리스트)]
+    최고 금리(best_rate)와 그 기간, 최고 기본금리를 옵션에서 미리 계산
+    """
+    result = (response or {}).get('result') or {}
+    options_by_product = {}
+    for row in result.get('optionList') or []:
+        options_by_product.setdefault(_match_key(row), []).append(_option_fields(row))
+
+    rank = FinancialProduct.CATEGORY_RANKS[category]
+    rows = []
+    for base, display in zip(result.get('baseList') or [], display_products(category, response)):
+        options = options_by_product.get(_match_key(base), [])
+        rated = [option for option in options if option['max_rate'] is not None]
+        best = max(rated, key=lambda option: option['max_rate']) if rated else None
+        base_rates = [option['rate'] for option in options if option['rate'] is not None]
+
+        if category == 'stock':
+            best_rate = _to_float(base.get('change_rate'))
+        else:
+            best_rate = best['max_rate'] if best else None
+
+        rows.append(({
+            'category': category,
+            'category_rank': rank,
+            'product_code': _product_code(base),
+            'company_code': str(base.get('fin_co_no') or ''),
+            'company_name': base.get('kor_co_nm') or '',
+            'name': base.get('fin_prdt_nm') or base.get('stock_nm') or '',
+            'join_way': base.get('join_way') or '',
+            'risk_level': _to_int(base.get('risk_level')),
+            'best_rate': best_rate,
+            'best_base_rate': max(base_rates) if base_rates else None,
+            'best_rate_term': best['save_term'] if best else None,
+            'disclosure_month': base.get('dcls_month') or '',
+            'raw': base,
+            'display': display,
+        }, options))
+    return rows
+
+
+PRODUCT_UPDATE_FIELDS = [
+    'category_rank', 'company_name', 'name', 'join_way', 'risk_level', 'best_rate', 'best_base_rate',
+    'best_rate_term', 'disclosure_month', 'raw', 'display', 'updated_at',
+]
+
+
+def ingest_category(category, response):
+    """
+    한 종류의 상품을 일괄 저장 (한 트랜잭션)
+    - 상품은 (종류, 금융회사 코드, 상품 코드) 기준 upsert, 이번 응답에 없는 상품은 삭제
+    - 옵션은 해당 종류 전체를 지우고 bulk_create
+    - 상품 검색(FTS5) 색인은 해당 종류만 다시 색인
+    반환: {'products': 저장 수, 'options': 저장 수, 'removed': 삭제 수}
+    """
+    rows = build_rows(category, response)
+    with transaction.atomic():
+        FinancialProduct.objects.bulk_create(
+            [FinancialProduct(**fields) for fields, _ in rows],
+            batch_size=BULK_BATCH_SIZE,
+            update_conflicts=True,
+            unique_fields=['category', 'company_code', 'product_code'],
+            update_fields=PRODUCT_UPDATE_FIELDS,
+        )
+        ids = {
+            (company_code, product_code): pk
+            for pk, company_code, product_code in FinancialProduct.objects.filter(category=category)
+            .values_list('id', 'company_code', 'product_code')
+        }
+        kept_ids = [ids[(fields['company_code'], fields['product_code'])] for fields, _ in rows]
+        removed, _ = FinancialProduct.objects.filter(category=category).exclude(id__in=kept_ids).delete()
+
+        ProductOption.objects.filter(product__category=category).delete()
+        options = []
+        for product_id, (_, product_options) in zip(kept_ids, rows):
+            # 같은 옵션 키가 중복되면 마지막 행 사용
+            for fields in {option['option_key']: option for option in product_options}.values():
+                options.append(ProductOption(product_id=product_id, **fields))
+        ProductOption.objects.bulk_create(options, batch_size=BULK_BATCH_SIZE)
+
+        # 검색 색인도 같은 트랜잭션에서 교체
+        index_products(category)
+
+    return {'products': len(rows), 'options': len(options), 'removed': removed}
+
+
+def ingest_from_files(data_dir=DATA_DIR, categories=None):
+    """상품 JSON 파일들을 DB에 적재, 반환: {종류: 결과}"""
+    results = {}
+    for category in categories or STORE_FILES:
+        path = os.path.join(data_dir, STORE_FILES[category])
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                response = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"상품 파일 로드 실패: {path} ({e})")
+            continue
+        results[category] = ingest_category(category, response)
+    return results
+
+
+def ingest_synced(manifest, data_dir=DATA_DIR):
+    """
+    DeltaSync 동기화 결과(manifest)에서 파일이 바뀐 종류만 다시 적재
+    DB에 상품이 적재되면 목록 탭은 DB만 읽으므로 수집 후에는 반드시 적재해야 목록이 최신 상태로 유지됨
+    반환: {종류: 결과} (바뀐 종류가 없으면 빈 dict)
+    """
+    categories = [
+        STORE_CATEGORY_BY_CATALOG[catalog_category]
+        for catalog_category in manifest.get('changed_catalog_categories', [])
+        if catalog_category in STORE_CATEGORY_BY_CATALOG
+    ]
+    if not categories:
+        return {}
+    return ingest_from_files(data_dir, categories)
+
+
+def store_has_products(category=None):
+    """DB에 적재된 상품이 있는지 (category가 주어지면 해당 종류만)"""
+    queryset = FinancialProduct.objects.all()
+    if category:
+        queryset = queryset.filter(category=category)
+    return queryset.exists()
@@ -0,0 +1,92 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+
+# 추천 API 점수 계산 스레드 수와 대기 허용 작업 수 (settings로 덮어쓸 수 있음)
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+DEFAULT_MAX_PENDING = 16
+DEFAULT_TIMEOUT_SECONDS = 5.0
+
+
+class ExecutorBusy(RuntimeError):
+    """실행 중 + 대기 작업 수가 한도에 도달해 새 작업을 받을 수 없음"""
+
+
+class RecommendationExecutor:
+    """
+    비동기 뷰용 고정 크기 스레드 풀
+    점수 계산(numpy)은 GIL을 대부분 놓으므로 스레드 풀에서 실행하고 이벤트 루프는 바로 다음 요청을 받음
+    실행 + 대기 작업 수를 제한해 느린 요청이 몰려도 메모리/지연이 끝없이 늘지 않도록 함 (초과 시 ExecutorBusy)
+    """
+
+    def __init__(self, max_workers=DEFAULT_WORKERS, max_pending=DEFAULT_MAX_PENDING):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor = None
+        self._executor_lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_workers + max_pending)
+        self.submitted = 0
+        self.rejected = 0
+        self.timeouts = 0
+
+    def _get_executor(self):
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='recommend')
+        return self._executor
+
+    async def run(self, func, *args, timeout=DEFAULT_TIMEOUT_SECONDS):
+        """
+        func(*args)를 스레드 풀에서 실행하고 결과 반환
+        timeout(초)을 넘기면 TimeoutError - 이미 실행 중인 작업은 끝까지 실행되며 슬롯은 그때 반납
+        """
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise ExecutorBusy(f"추천 작업 대기열이 가득 찼습니다 (최대 {self.max_workers + self.max_pending}개)")
+
+        try:
+            future = self._get_executor().submit(func, *args)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        self.submitted += 1
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise TimeoutError(f"추천 처리 시간 초과 ({timeout}초)")
+
+    def stats(self):
+        return {
+            'max_workers': self.max_workers,
+            'max_pending': self.max_pending,
+            'submitted': self.submitted,
+            'rejected': self.rejected,
+            'timeouts': self.timeouts,
+        }
+
+    def shutdown(self):
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+
+def _build_executor():
+    try:
+        from django.conf import settings
+        return RecommendationExecutor(
+            max_workers=getattr(settings, 'RECOMMEND_API_WORKERS', DEFAULT_WORKERS),
+            max_pending=getattr(settings, 'RECOMMEND_API_MAX_PENDING', DEFAULT_MAX_PENDING),
+        )
+    except Exception:
+        return RecommendationExecutor()
+
+
+# 전역 인스턴스 (프로세스당 하나의 스레드 풀)
+recommendation_executor = _build_executor()
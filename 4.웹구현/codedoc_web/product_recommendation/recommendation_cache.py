@@ -0,0 +1,112 @@
+import copy
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+class RecommendationCache:
+    """
+    추천 결과 2단계 캐시
+    1단계: 프로세스 내 LRU (최근 사용 순서로 제거, TTL 적용)
+    2단계: Django 캐시 프레임워크의 'recommendations' 캐시 (gunicorn 워커 간 공유, TTL 적용,
+           기본 설정은 LRUFileBasedCache로 최근 사용 순서 제거)
+    키는 파싱된 사용자 정보 + top_n + 카탈로그 버전으로 구성되어 상품 데이터가 바뀌면 자동으로 무효화
+    """
+
+    def __init__(self, alias='recommendations', timeout=600, max_local_entries=256):
+        self.alias = alias
+        self.timeout = timeout
+        self.max_local_entries = max_local_entries
+
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+        self.saved_ms = 0.0
+
+    @staticmethod
+    def make_key(parsed_tuple, top_n, catalog_version):
+        """캐시 키 생성 (백엔드 키 길이/문자 제약을 피하기 위해 해시 사용)"""
+        raw = repr((parsed_tuple, top_n, catalog_version))
+        return 'recommend:' + hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def _shared_cache(self):
+        """공유 캐시 백엔드 (Django 설정이 없거나 별칭이 없으면 None)"""
+        try:
+            from django.conf import settings
+            if not settings.configured or self.alias not in settings.CACHES:
+                return None
+            from django.core.cache import caches
+            return caches[self.alias]
+        except Exception:
+            return None
+
+    def get(self, key):
+        """캐시 조회 - 없으면 None"""
+        now = time.time()
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is not None:
+                expires_at, compute_ms, value = entry
+                if expires_at > now:
+                    self._local.move_to_end(key)
+                    self.local_hits += 1
+                    self.saved_ms += compute_ms
+                    return copy.deepcopy(value)
+                del self._local[key]
+
+        shared_cache = self._shared_cache()
+        if shared_cache is not None:
+            entry = shared_cache.get(key)
+            if entry is not None:
+                compute_ms, value = entry
+                self._set_local(key, compute_ms, value)
+                with self._lock:
+                    self.shared_hits += 1
+                    self.saved_ms += compute_ms
+                return copy.deepcopy(value)
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, key, value, compute_ms=0.0):
+        """캐시 저장 (compute_ms: 결과 계산에 걸린 시간, 적중 시 절약 시간 집계용)"""
+        value = copy.deepcopy(value)
+        self._set_local(key, compute_ms, value)
+
+        shared_cache = self._shared_cache()
+        if shared_cache is not None:
+            try:
+                shared_cache.set(key, (compute_ms, value), self.timeout)
+            except Exception as e:
+                print(f"공유 추천 캐시 저장 실패: {e}")
+
+    def _set_local(self, key, compute_ms, value):
+        with self._lock:
+            self._local[key] = (time.time() + self.timeout, compute_ms, value)
+            self._local.move_to_end(key)
+            while len(self._local) > self.max_local_entries:
+                self._local.popitem(last=False)
+
+    def clear(self):
+        """프로세스 내 캐시 비우기 (공유 캐시는 카탈로그 버전이 바뀌면 키가 달라져 자연 만료)"""
+        with self._lock:
+            self._local.clear()
+
+    def stats(self):
+        """적중/미스 통계"""
+        with self._lock:
+            hits = self.local_hits + self.shared_hits
+            total = hits + self.misses
+            return {
+                'local_hits': self.local_hits,
+                'shared_hits': self.shared_hits,
+                'misses': self.misses,
+                'hit_rate': round(hits / total, 4) if total else 0.0,
+                'saved_ms': round(self.saved_ms, 1),
+                'local_entries': len(self._local),
+            }
@@ -0,0 +1,170 @@
+import itertools
+import json
+import os
+import threading
+
+
+# 로그인 사용자 추천을 결정하는 프로필 필드와 가능한 값 (None = 미입력)
+# 금융위험태도는 analyze_user_preference의 구간(< -1, -1, 0~1, > 1)으로 나눔
+TABLE_FIELD_VALUES = {
+    '연령대분류': [None, 1, 2, 3, 4, 5, 6],
+    '가구주성별': [None, 1, 2],
+    '결혼상태': [None, 1, 2],
+    '직업분류1': [None, 1, 2, 3, 4],
+    '저축여부': [None, 1, 2, 3],
+    '금융위험태도': [-2, -1, 0, 2],
+}
+
+# 모델 예측을 사용할 때만 추천에 영향을 주는 필드
+MODEL_FIELD_VALUES = {
+    '교육수준분류': [None, 1, 2, 3, 4],
+}
+
+# 2: 모델 특성을 학습 데이터 중앙값으로 변경, 3: 보유 확률을 선호 카테고리와 카테고리 할당량에 반영
+# (이전 테이블의 모델 반영 결과는 사용하지 않음)
+TABLE_FORMAT_VERSION = 3
+
+DEFAULT_TABLE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'recommendation_table.json')
+
+
+def risk_bucket(risk_attitude):
+    """금융위험태도 점수를 추천에 영향을 주는 구간 대표값으로 변환"""
+    risk_attitude = risk_attitude or 0
+    if risk_attitude < -1:
+        return -2
+    elif risk_attitude < 0:
+        return -1
+    elif risk_attitude <= 1:
+        return 0
+    return 2
+
+
+def profile_key(profile, key_fields):
+    """프로필의 테이블 조회 키 (예: '2|1|2|1|3|0')"""
+    values = []
+    for field in key_fields:
+        value = getattr(profile, field, None)
+        if field == '금융위험태도':
+            value = risk_bucket(value)
+        values.append('' if value is None else str(value))
+    return '|'.join(values)
+
+
+class TableProfile:
+    """테이블 생성용 가상 프로필 (UserProfile과 같은 필드명)"""
+
+    def __init__(self, **fields):
+        for field in list(TABLE_FIELD_VALUES) + list(MODEL_FIELD_VALUES):
+            setattr(self, field, fields.get(field))
+
+
+def enumerate_profiles(include_model_fields=False):
+    """추천에 영향을 주는 이산 프로필 공간 전체 열거"""
+    field_values = dict(TABLE_FIELD_VALUES)
+    if include_model_fields:
+        field_values.update(MODEL_FIELD_VALUES)
+
+    fields = list(field_values)
+    for values in itertools.product(*field_values.values()):
+        yield TableProfile(**dict(zip(fields, values)))
+
+
+def build_table(recommender, compute_user_recommendations, batch_size=500):
+    """
+    프로필 공간 전체의 추천 결과 테이블 생성
+    같은 결과는 한 번만 저장하고 키 → 결과 인덱스로 연결해 파일 크기를 줄임
+    """
+    include_model_fields = recommender.holding_predictor.available
+    key_fields = list(TABLE_FIELD_VALUES) + (list(MODEL_FIELD_VALUES) if include_model_fields else [])
+
+    entries = {}
+    results = []
+    result_index = {}
+
+    profiles = list(enumerate_profiles(include_model_fields))
+    for start in range(0, len(profiles), batch_size):
+        batch = profiles[start:start + batch_size]
+        for profile, (recommended_products, category_recommendations) in zip(
+            batch, compute_user_recommendations(recommender, batch)
+        ):
+            payload = {'recommended_products': recommended_products, **category_recommendations}
+            serialized = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(',', ':'))
+            if serialized not in result_index:
+                result_index[serialized] = len(results)
+                results.append(payload)
+            entries[profile_key(profile, key_fields)] = result_index[serialized]
+
+    return {
+        'format_version': TABLE_FORMAT_VERSION,
+        'catalog_version': recommender.catalog_version,
+        'key_fields': key_fields,
+        'entries': entries,
+        'results': results,
+    }
+
+
+def write_table(table, path=DEFAULT_TABLE_PATH):
+    """테이블을 압축된 JSON으로 저장 (임시 파일에 쓴 뒤 교체)"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(table, f, ensure_ascii=False, separators=(',', ':'))
+    os.replace(temp_path, path)
+
+
+class RecommendationTable:
+    """
+    사전 계산된 추천 테이블 조회
+    파일이 바뀌면(mtime) 다시 읽고, 카탈로그 버전이 다르면 사용하지 않음
+    """
+
+    def __init__(self, path=DEFAULT_TABLE_PATH):
+        self.path = path
+        self._table = None
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return None
+
+        with self._lock:
+            if self._table is None or self._mtime != mtime:
+                try:
+                    with open(self.path, 'r', encoding='utf-8') as f:
+                        table = json.load(f)
+                except (OSError, ValueError) as e:
+                    print(f"추천 테이블 로드 실패: {e}")
+                    return None
+                if table.get('format_version') != TABLE_FORMAT_VERSION:
+                    return None
+                self._table = table
+                self._mtime = mtime
+            return self._table
+
+    def is_current(self, catalog_version):
+        table = self._load()
+        return table is not None and table.get('catalog_version') == catalog_version
+
+    def lookup(self, profile, catalog_version):
+        """
+        프로필의 사전 계산 결과 조회
+        반환: ('전체' 추천 상품 리스트, 카테고리별 추천 dict) 또는 None(테이블 없음/오래됨/키 없음)
+        """
+        table = self._load()
+        if table is None or table.get('catalog_version') != catalog_version:
+            return None
+
+        index = table['entries'].get(profile_key(profile, table['key_fields']))
+        if index is None:
+            return None
+
+        # 뷰에서 결과를 수정해도 테이블이 바뀌지 않도록 복사본 반환
+        payload = json.loads(json.dumps(table['results'][index]))
+        recommended_products = payload.pop('recommended_products')
+        return recommended_products, payload
+
+
+# 전역 인스턴스
+recommendation_table = RecommendationTable()
@@ -0,0 +1,138 @@
+import threading
+import time
+
+
+# 백그라운드 카탈로그 파일 변경 확인 간격 (초)
+CATALOG_CHECK_INTERVAL = 30
+
+
+class RecommenderRegistry:
+    """
+    프로세스 단위 추천 시스템 레지스트리
+    HighPerformanceFinancialRecommender를 프로세스당 한 번만 생성(모델/카탈로그 로드)하고
+    모든 뷰가 같은 인스턴스(및 내부 추천 캐시)를 공유하도록 관리
+    카탈로그 파일 변경 확인/재로드는 요청 스레드가 아닌 백그라운드 감시 스레드
+    (start_catalog_watcher) 또는 명시적 호출(refresh_catalog, reload)에서만 수행
+    """
+
+    def __init__(self, catalog_check_interval=CATALOG_CHECK_INTERVAL):
+        self._recommender = None
+        self._lock = threading.Lock()
+        self.loaded_at = None
+        self.load_count = 0
+        self.catalog_check_interval = catalog_check_interval
+        self.catalog_checked_at = None
+        self._watcher = None
+        self._watcher_stop = threading.Event()
+
+    def _build(self):
+        """추천 시스템 인스턴스 생성 (모델, 상품 데이터, 특성 사전 계산 포함)"""
+        from .matching import HighPerformanceFinancialRecommender
+
+        start_time = time.time()
+        recommender = HighPerformanceFinancialRecommender()
+        print(f"추천 시스템 로드 완료: {(time.time() - start_time) * 1000:.1f}ms")
+        return recommender
+
+    def get(self):
+        """
+        워밍된 추천 시스템 반환 (현재 인스턴스만 읽고 파일 확인은 하지 않음)
+        아직 로드되지 않았다면 최초 호출 스레드가 로드하고 나머지 스레드는 완료까지 대기
+        """
+        recommender = self._recommender
+        if recommender is not None:
+            return recommender
+
+        with self._lock:
+            if self._recommender is None:
+                self._recommender = self._build()
+                self.loaded_at = time.time()
+                self.load_count += 1
+            return self._recommender
+
+    def warm_up(self):
+        """서버 시작 시 미리 로드 (실패해도 첫 요청에서 다시 시도)"""
+        try:
+            self.get()
+        except Exception as e:
+            print(f"추천 시스템 워밍업 실패: {e}")
+
+    def reload(self):
+        """
+        추천 시스템 명시적 재로드 (상품 데이터/모델 갱신 후 호출)
+        새 인스턴스를 완전히 만든 뒤 교체하므로 처리 중인 요청은 기존 인스턴스를 계속 사용
+        """
+        new_recommender = self._build()
+        with self._lock:
+            self._recommender = new_recommender
+            self.loaded_at = time.time()
+            self.load_count += 1
+        return new_recommender
+
+    def refresh_catalog(self):
+        """
+        상품 데이터 파일 변경 확인 후 바뀐 카테고리만 재로드 (FinancialProductAPI.save_to_json 이후 등)
+        반환: 다시 읽은 카테고리 리스트
+        """
+        self.catalog_checked_at = time.time()
+        recommender = self._recommender
+        if recommender is None:
+            return []
+        try:
+            return recommender.refresh_catalog()
+        except Exception as e:
+            print(f"카탈로그 재로드 실패: {e}")
+            return []
+
+    def start_catalog_watcher(self):
+        """
+        catalog_check_interval마다 refresh_catalog를 실행하는 데몬 스레드 시작 (이미 실행 중이면 그대로 사용)
+        바뀐 파일의 해시 확인/재파싱은 이 스레드에서 처리되고 요청은 교체 전까지 기존 카탈로그를 사용
+        """
+        with self._lock:
+            if self._watcher is None or not self._watcher.is_alive():
+                self._watcher_stop.clear()
+                self._watcher = threading.Thread(target=self._watch_catalog, name='catalog-watcher', daemon=True)
+                self._watcher.start()
+            return self._watcher
+
+    def stop_catalog_watcher(self):
+        """감시 스레드 중지 (진행 중인 확인이 끝날 때까지 대기)"""
+        self._watcher_stop.set()
+        watcher = self._watcher
+        if watcher is not None:
+            watcher.join()
+        self._watcher = None
+
+    def _watch_catalog(self):
+        while not self._watcher_stop.wait(self.catalog_check_interval):
+            self.refresh_catalog()
+
+    @property
+    def catalog_version(self):
+        """현재 카탈로그 버전 (로드 전이면 None)"""
+        recommender = self._recommender
+        return recommender.catalog_version if recommender is not None else None
+
+    @property
+    def is_loaded(self):
+        return self._recommender is not None
+
+
+# 전역 인스턴스
+recommender_registry = RecommenderRegistry()
+
+
+def get_recommender():
+    """뷰에서 사용할 공유 추천 시스템 인스턴스"""
+    return recommender_registry.get()
+
+
+def reload_recommender():
+    """공유 추천 시스템 재로드"""
+    return recommender_registry.reload()
+
+
+def refresh_catalog():
+    """공유 추천 시스템의 카탈로그 중 바뀐 카테고리만 재로드"""
+    return recommender_registry.refresh_catalog()
@@ -0,0 +1,162 @@
+import numpy as np
+
+
+# 상품 특성 코드 (matching.py의 term_type / target_type 값과 대응)
+TERM_CODES = {'long_term': 0, 'medium_term': 1, 'short_term': 2}
+TARGET_CODES = {'general': 0, 'youth': 1, 'premium': 2, 'simple': 3, 'family': 4}
+CATEGORY_CODES = {'funds': 0, 'stocks': 1, 'mmf': 2, 'deposit': 3, 'saving': 4}
+
+MAJOR_BANKS = ['국민은행', '신한은행', '하나은행', '우리은행']
+
+# 적금 목적일 때 연령대 x 기간 유형별 점수 (행: 30세 이하 / 40세 이하 / 그 외, 열: 장기 / 중기 / 단기)
+AGE_TERM_SCORES = np.array([
+    [25, 15, 5],
+    [15, 20, 10],
+    [5, 12, 20],
+], dtype=np.int64)
+
+BASE_SCORE = 40
+MAX_SCORE = 100
+
+# 모델이 예측한 카테고리 보유 확률 1.0당 가산점
+MODEL_BONUS_WEIGHT = 10
+
+# 현재 카탈로그의 100배 규모에서도 지켜야 하는 후보 검색(점수화 + 상위 k 선택) 지연 시간 예산
+RETRIEVAL_LATENCY_BUDGET_MS = 20
+
+
+class ProductScoringEngine:
+    """
+    벡터화된 상품 점수 계산 엔진
+    상품별 입력값(기간 유형, 타겟 유형, 금리, 대출 여부, 가입 채널, 주요 은행 여부)을
+    컬럼형 카탈로그(ProductCatalog)에서 가져와 전체 카탈로그의 점수를 한 번에 계산
+    holding_probabilities가 없으면 상품별 규칙 점수(tests._scalar_score)와 동일한 결과를 반환
+    """
+
+    def __init__(self, catalog):
+        self.size = len(catalog)
+
+        # 상품별 카테고리 코드 (모델 보유 확률 가산점용)
+        self.category_code = catalog.category_code.astype(np.int64)
+        self.term_code = catalog.term_code.astype(np.int64)
+        self.target_code = catalog.target_code.astype(np.int64)
+        self.rate = catalog.rate
+        self.is_loan = catalog.is_loan
+
+        # 가입 채널과 주요 은행 여부는 고유값 테이블에서 한 번만 계산한 뒤 코드로 펼침
+        self.smartphone_join = np.array(['스마트폰' in way for way in catalog.join_ways], dtype=bool)[catalog.join_way_code]
+        self.branch_join = np.array(['영업점' in way for way in catalog.join_ways], dtype=bool)[catalog.join_way_code]
+        self.major_bank = np.array(
+            [any(bank in name for bank in MAJOR_BANKS) for name in catalog.banks], dtype=bool
+        )[catalog.bank_code]
+
+        # 정렬 타이브레이크용: 은행명 문자열 순서를 정수 순위로 변환
+        bank_order = {bank: rank for rank, bank in enumerate(sorted(catalog.banks))}
+        self.bank_rank = np.array([bank_order[bank] for bank in catalog.banks], dtype=np.int64)[catalog.bank_code]
+
+        # 금리 정렬 키: 기존 정렬 규칙(-rate if not is_loan else rate)을 그대로 유지
+        self.rate_sort_key = np.where(self.is_loan, self.rate, -self.rate)
+
+        # 금리 점수와 주요 은행 보너스는 사용자와 무관하므로 미리 계산
+        loan_rate_score = np.select(
+            [self.rate <= 3.0, self.rate <= 4.0, self.rate <= 5.0], [20, 15, 10], default=5
+        )
+        deposit_rate_score = np.select(
+            [self.rate >= 6.0, self.rate >= 5.0, self.rate >= 4.0, self.rate >= 3.0], [20, 15, 10, 8], default=5
+        )
+        self.static_score = (
+            BASE_SCORE
+            + np.where(self.is_loan, loan_rate_score, deposit_rate_score)
+            + np.where(self.major_bank, 5, 0)
+        ).astype(np.int64)
+
+    def score(self, age, income, purpose, married=False, indices=None):
+        """
+        상품 점수 일괄 계산
+        indices가 주어지면 해당 상품들만, 없으면 전체 카탈로그를 계산
+        """
+        return self.score_many([(age, income, purpose, married)], indices=indices)[0]
+
+    def score_many(self, profiles, indices=None):
+        """
+        여러 사용자 프로필의 상품 점수를 한 번에 계산
+        profiles: (age, income, purpose, married[, holding_probabilities]) 튜플 리스트
+            holding_probabilities는 {카테고리: 보유 확률} dict (모델 예측, 없으면 None)
+        반환: (프로필 수, 상품 수) 점수 행렬
+        """
+        if indices is None:
+            indices = np.arange(self.size)
+        indices = np.asarray(indices, dtype=np.int64)
+
+        ages = np.array([profile[0] for profile in profiles], dtype=np.float64)[:, None]
+        incomes = np.array([profile[1] for profile in profiles], dtype=np.float64)[:, None]
+        is_saving = np.array([profile[2] == 'saving' for profile in profiles], dtype=bool)[:, None]
+        married = np.array([bool(profile[3]) for profile in profiles], dtype=bool)[:, None]
+
+        term_code = self.term_code[indices][None, :]
+        target_code = self.target_code[indices][None, :]
+
+        # 1. 나이별 맞춤 점수 (적금 목적일 때만)
+        age_row = np.select([ages <= 30, ages <= 40], [0, 1], default=2)
+        age_score = np.where(is_saving, AGE_TERM_SCORES[age_row, term_code], 0)
+
+        # 2. 소득별 맞춤 점수
+        income_score = np.select(
+            [incomes >= 500, incomes >= 300, incomes > 0],
+            [
+                np.where(target_code == TARGET_CODES['premium'], 20, 10),
+                15,
+                np.where(target_code == TARGET_CODES['simple'], 15, 8),
+            ],
+            default=12,
+        )
+
+        # 3. 특화 보너스 (금리 점수와 주요 은행 보너스는 static_score에 포함)
+        # 청년 상품과 가족 상품은 서로 배타적인 타겟이므로 두 조건을 독립적으로 적용해도 동일
+        bonus_score = np.where((ages <= 35) & (target_code == TARGET_CODES['youth']), 10, 0)
+        bonus_score = bonus_score + np.where(married & (target_code == TARGET_CODES['family']), 8, 0)
+        join_bonus = np.where(ages <= 40, self.smartphone_join[indices][None, :], self.branch_join[indices][None, :])
+        bonus_score = bonus_score + np.where(join_bonus, 3, 0)
+
+        # 4. 모델 예측 보유 확률 가산점 (해당 상품 카테고리의 확률 x 가중치)
+        # 카테고리 간 순서만 바꾸므로 추천기는 여러 카테고리를 섞는 목적일 때만 확률을 전달
+        # 마지막 열은 카테고리 코드가 없는 상품(-1)용으로 항상 0
+        model_bonus = np.zeros((len(profiles), len(CATEGORY_CODES) + 1), dtype=np.int64)
+        for row, profile in enumerate(profiles):
+            holding_probabilities = profile[4] if len(profile) > 4 else None
+            for category, probability in (holding_probabilities or {}).items():
+                if category in CATEGORY_CODES:
+                    model_bonus[row, CATEGORY_CODES[category]] = int(round(probability * MODEL_BONUS_WEIGHT))
+        bonus_score = bonus_score + model_bonus[:, self.category_code[indices]]
+
+        total_score = self.static_score[indices][None, :] + age_score + income_score + bonus_score
+        return np.minimum(total_score, MAX_SCORE).astype(np.int64)
+
+    def order(self, indices, scores):
+        """
+        (점수, 금리 키, 은행명) 내림차순 정렬 순서 반환
+        동점은 입력 순서를 유지 (파이썬 sorted(reverse=True)의 안정 정렬과 동일)
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        return np.lexsort((-self.bank_rank[indices], -self.rate_sort_key[indices], -scores))
+
+    def top_k(self, indices, scores, k):
+        """
+        부분 선택(partition)으로 상위 k개 상품만 골라 정렬
+        k번째 점수 이상인 후보(경계 동점 포함)만 남긴 뒤 order()와 같은 규칙으로 정렬하므로
+        전체 정렬 후 앞에서 k개를 자른 결과와 동일
+        """
+        indices = np.asarray(indices, dtype=np.int64)
+        scores = np.asarray(scores, dtype=np.int64)
+        size = len(indices)
+
+        if k <= 0 or size == 0:
+            return indices[:0], scores[:0]
+
+        if k < size:
+            kth_score = np.partition(scores, size - k)[size - k]
+            keep = np.flatnonzero(scores >= kth_score)
+            indices, scores = indices[keep], scores[keep]
+
+        order = self.order(indices, scores)[:k]
+        return indices[order], scores[order]
@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from accounts.models import UserProfile
+
+from .user_recommendation_cache import user_recommendation_cache
+
+
+@receiver(post_save, sender=UserProfile)
+def refresh_recommendations_on_profile_save(sender, instance, raw=False, **kwargs):
+    """
+    프로필이 저장되면(회원가입, 프로필 수정, 챗봇의 금융위험태도 갱신 등) 커밋 후 백그라운드에서
+    새 updated_at 키로 상품 목록 추천을 미리 계산 → 다음 상품 목록 조회는 캐시 적중
+    """
+    if raw or not getattr(settings, 'USER_RECOMMENDATION_BACKGROUND_REFRESH', True):
+        return
+
+    def refresh():
+        from .views import refresh_user_recommendations
+        user_recommendation_cache.refresh_async(instance, refresh_user_recommendations)
+
+    transaction.on_commit(refresh)
@@ -18,12 +18,7 @@ document.addEventListener('DOMContentLoaded', function() {
             const currentUrl = new URL(window.location.href);
             
             // 모든 페이지네이션 파라미터 제거
-            currentUrl.searchParams.delete('page');
-            currentUrl.searchParams.delete('deposits_page');
-            currentUrl.searchParams.delete('savings_page');
-            currentUrl.searchParams.delete('funds_page');
-            currentUrl.searchParams.delete('stocks_page');
-            currentUrl.searchParams.delete('mmf_page');
+            PAGE_PARAMS.forEach(param => currentUrl.searchParams.delete(param));
             
             // 카테고리 파라미터 설정
             if (filter !== 'all') {
@@ -32,37 +27,83 @@ document.addEventListener('DOMContentLoaded', function() {
                 currentUrl.searchParams.delete('category');
             }
             
-            // URL 업데이트하고 페이지 새로고침
-            window.location.href = currentUrl.toString();
+            // 아직 불러오지 않은 탭만 서버에서 해당 탭 HTML 조각을 받아오고, 페이지 새로고침 없이 URL만 갱신
+            const section = document.querySelector(`.products-section[data-category="${filter}"]`);
+            ensureTabLoaded(section, currentUrl)
+                .then(() => {
+                    filterProducts(filter);
+                    window.history.pushState({ category: filter }, '', currentUrl.toString());
+                })
+                .catch(() => {
+                    window.location.href = currentUrl.toString();
+                });
         });
     });
 
-    // 페이지네이션 링크 클릭 이벤트 처리 (수정된 부분)
-    function initPaginationHandlers() {
-        const paginationLinks = document.querySelectorAll('.pagination a');
+    const PAGE_PARAMS = ['page', 'deposits_page', 'savings_page', 'funds_page', 'stocks_page', 'mmf_page'];
+
+    // 탭 HTML 조각 요청 (정렬/필터 파라미터는 현재 URL 것을 그대로 전달)
+    function loadTab(section, url) {
+        return fetch(section.dataset.tabUrl + url.search, {
+            headers: { 'X-Requested-With': 'XMLHttpRequest' }
+        })
+            .then(response => {
+                if (!response.ok) {
+                    throw new Error(`탭 로드 실패: ${response.status}`);
+                }
+                return response.text();
+            })
+            .then(html => {
+                section.innerHTML = html;
+                section.dataset.loaded = 'true';
+                initSection(section);
+            });
+    }
+
+    function ensureTabLoaded(section, url) {
+        if (!section || section.dataset.loaded === 'true') {
+            return Promise.resolve();
+        }
+        return loadTab(section, url);
+    }
+
+    // 새로 불러온 섹션의 카드/페이지네이션 이벤트 연결
+    function initSection(section) {
+        initAIRecommendations(section);
+        initCardLinks(section);
+        initCardHoverEffects(section);
+        initPaginationHandlers(section);
+    }
+
+    // 페이지네이션 링크 클릭 시 해당 탭 조각만 다시 받아와 교체
+    function initPaginationHandlers(root = document) {
+        const paginationLinks = root.querySelectorAll('.pagination a');
         
         paginationLinks.forEach(link => {
             link.addEventListener('click', function(e) {
-                // 현재 활성화된 카테고리 확인
-                const activeFilter = document.querySelector('.filter-btn.active');
-                const currentCategory = activeFilter ? activeFilter.getAttribute('data-filter') : 'all';
+                const section = this.closest('.products-section');
+                if (!section || !section.dataset.tabUrl) {
+                    return;
+                }
+                e.preventDefault();
+                
+                // 현재 카테고리가 아닌 다른 페이지네이션 파라미터들 제거
+                const url = new URL(this.href);
+                const currentPageParam = getCurrentPageParam(section.getAttribute('data-category'));
+                PAGE_PARAMS.forEach(param => {
+                    if (param !== currentPageParam) {
+                        url.searchParams.delete(param);
+                    }
+                });
                 
-                // 전체 탭이 아닌 경우에만 URL 파라미터에서 다른 페이지 번호들 제거
-                if (currentCategory !== 'all') {
-                    const url = new URL(this.href);
-                    
-                    // 현재 카테고리가 아닌 다른 페이지네이션 파라미터들 제거
-                    const otherPageParams = ['page', 'deposits_page', 'savings_page', 'funds_page', 'stocks_page', 'mmf_page'];
-                    const currentPageParam = getCurrentPageParam(currentCategory);
-                    
-                    otherPageParams.forEach(param => {
-                        if (param !== currentPageParam) {
-                            url.searchParams.delete(param);
-                        }
+                loadTab(section, url)
+                    .then(() => {
+                        window.history.pushState({ category: section.getAttribute('data-category') }, '', url.toString());
+                        section.scrollIntoView({ behavior: 'smooth', block: 'start' });
+                    })
+                    .catch(() => {
+                        window.location.href = url.toString();
                     });
-                    
-                    this.href = url.toString();
-                }
             });
         });
     }
@@ -104,11 +145,6 @@ document.addEventListener('DOMContentLoaded', function() {
         
         // 카테고리별 AI 추천 상품 처리
         handleCategoryRecommendations(filter);
-        
-        // 페이지네이션 핸들러 재초기화
-        setTimeout(() => {
-            initPaginationHandlers();
-        }, 100);
     }
 
     // 페이지 로드 시 URL 파라미터 확인하여 카테고리 설정
@@ -151,8 +187,8 @@ document.addEventListener('DOMContentLoaded', function() {
     }
 
     // AI 추천 카드 특별 효과
-    function initAIRecommendations() {
-        const aiCards = document.querySelectorAll('.ai-recommended');
+    function initAIRecommendations(root = document) {
+        const aiCards = root.querySelectorAll('.ai-recommended');
         
         // aiCards.forEach((card, index) => {
         //     // AI 추천 카드에 딜레이 애니메이션 추가
@@ -168,18 +204,39 @@ document.addEventListener('DOMContentLoaded', function() {
         //     }, index * 150); // 연속적인 애니메이션
         // });
         
-        // AI 추천 카드 클릭 이벤트 (추후 상세 페이지 연동)
-        aiCards.forEach(card => {
+    }
+
+    // 상품 카드 클릭 시 상세 페이지로 이동 (상품 코드가 없는 기본 추천 카드는 제외)
+    function initCardLinks(root = document) {
+        const container = document.querySelector('[data-detail-url]');
+        if (!container) {
+            return;
+        }
+        const detailUrl = container.dataset.detailUrl;
+        
+        root.querySelectorAll('.product-cards[data-product-id]').forEach(card => {
+            const productType = card.dataset.productType;
+            const productId = card.dataset.productId;
+            // 같은 상품 코드가 여러 금융회사에 있을 수 있으므로 금융회사 코드도 함께 전달
+            const companyCode = card.dataset.companyCode;
+            if (!productType || !productId) {
+                return;
+            }
             card.addEventListener('click', function() {
-                // 추후 상세 페이지로 이동 또는 모달 표시
-                console.log('AI 추천 상품 클릭:', this.querySelector('.product-name').textContent);
+                let url = detailUrl
+                    .replace('__type__', encodeURIComponent(productType))
+                    .replace('__id__', encodeURIComponent(productId));
+                if (companyCode) {
+                    url += '?company=' + encodeURIComponent(companyCode);
+                }
+                window.location.href = url;
             });
         });
     }
     
     // 카드 호버 효과 초기화
-    function initCardHoverEffects() {
-        const productCards = document.querySelectorAll('.product-cards');
+    function initCardHoverEffects(root = document) {
+        const productCards = root.querySelectorAll('.product-cards');
         
         productCards.forEach(card => {
             card.addEventListener('mouseenter', function() {
@@ -245,10 +302,16 @@ document.addEventListener('DOMContentLoaded', function() {
     // 초기화 함수들 실행
     initSearch();
     initAIRecommendations();
+    initCardLinks();
     initCardHoverEffects();
     initPaginationHandlers();
     initFromUrlParams(); // URL 파라미터 기반 초기 상태 설정
 
+    // 뒤로/앞으로 가기: 탭/페이지 상태가 URL에만 있으므로 해당 URL로 다시 로드
+    window.addEventListener('popstate', function() {
+        window.location.reload();
+    });
+
     console.log('상품 목록 페이지 초기화 완료');
     console.log('AI 추천 상품 수:', document.querySelectorAll('.ai-recommended').length);
 });
\ No newline at end of file
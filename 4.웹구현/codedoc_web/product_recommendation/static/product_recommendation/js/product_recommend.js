@@ -15,6 +15,42 @@ function goToAIRecommend() {
     }
 }
 
+// CSRF 토큰 (Django csrftoken 쿠키)
+function getCsrfToken() {
+    const match = document.cookie.match(/(?:^|;\s*)csrftoken=([^;]+)/);
+    return match ? decodeURIComponent(match[1]) : '';
+}
+
+// 추천 JSON API 호출 (페이지 이동 없이 추천 결과만 가져옴)
+// input: 자연어 문자열 또는 프로필 객체, 배열이면 일괄 추천
+// options: { topN: 5, fields: ['name', 'bank', 'rate'] }
+function fetchRecommendations(input, options) {
+    options = options || {};
+    const payload = Array.isArray(input) ? { inputs: input } : { input: input };
+    if (options.topN) {
+        payload.top_n = options.topN;
+    }
+    if (options.fields) {
+        payload.fields = options.fields;
+    }
+
+    return fetch('/products/api/recommend/', {
+        method: 'POST',
+        headers: {
+            'Content-Type': 'application/json',
+            'X-CSRFToken': getCsrfToken()
+        },
+        body: JSON.stringify(payload)
+    }).then(function(response) {
+        return response.json().then(function(data) {
+            if (!response.ok) {
+                throw new Error(data.error || ('추천 요청 실패 (' + response.status + ')'));
+            }
+            return Array.isArray(input) ? data.results : data.result;
+        });
+    });
+}
+
 document.addEventListener('DOMContentLoaded', function() {
     console.log('페이지 로드 완료');
 
@@ -1,3 +1,1583 @@
-from django.test import TestCase
+import http.server
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import weakref
 
-# Create your tests here.
+import numpy as np
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.contrib.auth.models import AnonymousUser
+from django.test import RequestFactory, TestCase, override_settings
+
+from .catalog import ProductCatalog
+from .catalog_snapshot import load_snapshot, write_snapshot
+from .category_recommendations import get_category_recommendations_for_user
+from .fss_cache import FSSCatalogCache
+from .fss_collector import DEFAULT_JOBS, FSSAPIError, FSSCollector, RateLimiter
+from .fss_delta import DeltaSync, load_manifest
+from .input_parser import find_keywords, parse_user_input, parse_user_inputs
+from .metrics import LatencyHistogram, StageMetrics, recommender_metrics
+from .models import FinancialProduct, ProductOption
+from .model_loader import ModelArtifact, get_model_artifact
+from .model_inference import (
+    DEFAULT_FEATURE_ORDER, GROUP_MEDIAN_TABLES, TARGET_ORDER, HoldingProbabilityPredictor, profile_features,
+    training_group_medians,
+)
+from .product_detail_index import ProductDetailIndex, product_detail_index
+from .product_search import index_products, search_products
+from .product_store import STORE_FILES, ingest_category, ingest_from_files, ingest_synced
+from .recommendation_cache import RecommendationCache
+from .recommendation_table import RecommendationTable, TableProfile, build_table, profile_key, write_table
+from .recommend_executor import ExecutorBusy, RecommendationExecutor
+from .registry import RecommenderRegistry
+from .scoring import CATEGORY_CODES, MODEL_BONUS_WEIGHT, RETRIEVAL_LATENCY_BUDGET_MS
+from .utils import ProductDataLoader, ProductFileCache
+
+
+# 공유 추천 캐시를 쓰거나 비우는 테스트는 개발용 파일 캐시(BASE_DIR/.cache/recommendations) 대신 프로세스 내 캐시 사용
+LOCAL_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests-default'},
+    'recommendations': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'tests-recommendations'},
+}
+
+
+class RecommenderRegistryTests(TestCase):
+    def test_get_returns_shared_instance(self):
+        registry = RecommenderRegistry()
+        first = registry.get()
+        self.assertIs(registry.get(), first)
+        self.assertEqual(registry.load_count, 1)
+
+    def test_reload_swaps_instance(self):
+        registry = RecommenderRegistry()
+        first = registry.get()
+        reloaded = registry.reload()
+        self.assertIsNot(reloaded, first)
+        self.assertIs(registry.get(), reloaded)
+        self.assertEqual(registry.load_count, 2)
+
+    def test_get_never_checks_catalog_files(self):
+        registry = RecommenderRegistry(catalog_check_interval=0)
+        recommender = registry.get()
+        calls = []
+        recommender.refresh_catalog = lambda: calls.append(1) or []
+        registry.get()
+        registry.get()
+        self.assertEqual(calls, [])
+        self.assertIsNone(registry.catalog_checked_at)
+
+    def test_catalog_watcher_refreshes_in_background(self):
+        registry = RecommenderRegistry(catalog_check_interval=0.01)
+        recommender = registry.get()
+        checked = threading.Event()
+        callers = []
+
+        def refresh_catalog():
+            callers.append(threading.current_thread().name)
+            checked.set()
+            return []
+
+        recommender.refresh_catalog = refresh_catalog
+        watcher = registry.start_catalog_watcher()
+        try:
+            self.assertIs(registry.start_catalog_watcher(), watcher)
+            self.assertTrue(checked.wait(5))
+        finally:
+            registry.stop_catalog_watcher()
+        self.assertFalse(watcher.is_alive())
+        self.assertEqual(set(callers), {'catalog-watcher'})
+        self.assertIsNotNone(registry.catalog_checked_at)
+
+
+class InputParserTests(TestCase):
+    def test_extracts_profile_fields(self):
+        self.assertEqual(
+            dict(parse_user_input('30세 남성 기혼 월급 350만원 꾸준한 적금상품 추천해주세요')),
+            {'age': 30, 'gender': 'male', 'married': True, 'monthly_income': 350, 'purpose': 'saving'},
+        )
+        self.assertEqual(
+            dict(parse_user_input('40대 여자 결혼자금 연봉 6000만 주식투자')),
+            {'age': 45, 'gender': 'female', 'married': False, 'monthly_income': 500, 'purpose': 'stocks'},
+        )
+        self.assertEqual(dict(parse_user_input('세전 400 MMF 단기투자')), {'monthly_income': 400, 'purpose': 'mmf'})
+
+    def test_overlapping_keywords_are_all_found(self):
+        self.assertTrue({'주식', '투자', '주식투자'} <= find_keywords('주식투자'))
+        self.assertTrue({'부부', '신혼부부'} <= find_keywords('신혼부부'))
+        self.assertTrue({'월', '월급'} <= find_keywords('월급'))
+
+    def test_batch_matches_single_calls(self):
+        inputs = ['25살 예치', '솔로 재테크', '25살 예치', '']
+        self.assertEqual(parse_user_inputs(inputs), [parse_user_input(text) for text in inputs])
+
+    def test_cache_does_not_pin_recommender(self):
+        from .matching import HighPerformanceFinancialRecommender
+
+        recommender = HighPerformanceFinancialRecommender.__new__(HighPerformanceFinancialRecommender)
+        recommender.parse_input('30세 적금')
+        ref = weakref.ref(recommender)
+        del recommender
+        self.assertIsNone(ref())
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class CatalogSnapshotTests(TestCase):
+    def setUp(self):
+        from .catalog_snapshot import CATALOG_FILES, DATA_DIR
+        from .matching import HighPerformanceFinancialRecommender
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_dir = os.path.join(self.temp_dir.name, 'data')
+        os.makedirs(self.data_dir)
+        for filename in CATALOG_FILES.values():
+            shutil.copy(os.path.join(DATA_DIR, filename), self.data_dir)
+        self.path = os.path.join(self.temp_dir.name, 'catalog_snapshot')
+        self.from_json = HighPerformanceFinancialRecommender(snapshot_path=None, data_dir=self.data_dir)
+        write_snapshot(self.from_json.catalog, self.from_json.source_hashes, self.path, self.from_json.source_stats)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_snapshot_restores_identical_catalog(self):
+        from .matching import HighPerformanceFinancialRecommender
+
+        from_snapshot = HighPerformanceFinancialRecommender(snapshot_path=self.path, data_dir=self.data_dir)
+        self.assertEqual(from_snapshot.catalog_source, 'snapshot')
+        self.assertEqual(from_snapshot.products, self.from_json.products)
+        self.assertEqual(from_snapshot.catalog_version, self.from_json.catalog_version)
+        self.assertEqual(
+            from_snapshot.recommend('30세 월급 350만원 적금', top_n=5)['products'],
+            self.from_json.recommend('30세 월급 350만원 적금', top_n=5)['products'],
+        )
+
+    def test_columns_are_memory_mapped(self):
+        from .catalog_snapshot import source_stats
+
+        catalog, hashes = load_snapshot(source_stats(self.data_dir), self.data_dir, self.path)
+        self.assertIsInstance(catalog.rate, np.memmap)
+        self.assertIsInstance(catalog.name, np.memmap)
+        self.assertEqual(hashes, self.from_json.source_hashes)
+        self.assertEqual(type(catalog.product(0)['name']), str)
+
+    def test_touched_file_is_rehashed_and_changed_file_falls_back_to_json(self):
+        from .catalog_snapshot import source_stats
+
+        # 내용이 같으면 파일 상태가 달라도 해시 비교 후 사용
+        path = os.path.join(self.data_dir, 'bank_savings.json')
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 10**9))
+        self.assertIsNotNone(load_snapshot(source_stats(self.data_dir), self.data_dir, self.path))
+
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write('\n')
+        self.assertIsNone(load_snapshot(source_stats(self.data_dir), self.data_dir, self.path))
+        self.assertIsNone(load_snapshot(
+            source_stats(self.data_dir), self.data_dir, os.path.join(self.temp_dir.name, 'missing')
+        ))
+
+
+class ProductCatalogTests(TestCase):
+    def test_columnar_catalog_round_trips_products(self):
+        from .matching import HighPerformanceFinancialRecommender
+
+        recommender = HighPerformanceFinancialRecommender(snapshot_path=None)
+        products, _ = recommender._load_products()
+        recommender._precompute_product_features(products)
+
+        catalog = ProductCatalog(products)
+        self.assertEqual(catalog.products_by_category(), products)
+        self.assertEqual(len(catalog.banks), len({p['bank'] for items in products.values() for p in items}))
+        self.assertEqual(catalog.category_size('saving'), len(products['saving']))
+
+
+class IncrementalCatalogReloadTests(TestCase):
+    def setUp(self):
+        from .catalog_snapshot import DATA_DIR
+        from .matching import HighPerformanceFinancialRecommender
+
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.data_dir = os.path.join(self.temp_dir.name, 'data')
+        shutil.copytree(DATA_DIR, self.data_dir)
+        self.recommender = HighPerformanceFinancialRecommender(snapshot_path=None, data_dir=self.data_dir)
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def _rewrite(self, filename, update):
+        path = os.path.join(self.data_dir, filename)
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        update(data)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    def test_unchanged_files_are_not_reparsed(self):
+        state = self.recommender._state
+        self.assertEqual(self.recommender.refresh_catalog(), [])
+        self.assertIs(self.recommender._state, state)
+
+        # 내용은 같고 파일만 다시 저장된 경우: 해시가 같으므로 카탈로그/버전 유지
+        path = os.path.join(self.data_dir, 'funds.json')
+        with open(path, 'rb') as f:
+            raw = f.read()
+        with open(path, 'wb') as f:
+            f.write(raw)
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 10**9))
+        self.assertEqual(self.recommender.refresh_catalog(), [])
+        self.assertIs(self.recommender.catalog, state.catalog)
+        self.assertEqual(self.recommender.catalog_version, state.version)
+
+    def test_changed_category_is_swapped_in(self):
+        before = self.recommender._state
+        saving_before = self.recommender.products['saving']
+
+        def drop_first_deposit(data):
+            data['result']['baseList'] = data['result']['baseList'][1:]
+        self._rewrite('bank_deposits.json', drop_first_deposit)
+
+        self.assertEqual(self.recommender.refresh_catalog(), ['deposit'])
+        self.assertIsNot(self.recommender._state, before)
+        self.assertNotEqual(self.recommender.catalog_version, before.version)
+        self.assertEqual(self.recommender.catalog.category_size('deposit'), before.catalog.category_size('deposit') - 1)
+        self.assertEqual(self.recommender.products['saving'], saving_before)
+        # 교체 전 상태 객체는 그대로 (처리 중인 요청이 계속 사용)
+        self.assertEqual(before.catalog.category_size('deposit'), len(before.catalog.products_by_category()['deposit']))
+
+    def test_broken_file_keeps_previous_category(self):
+        before = self.recommender._state
+        with open(os.path.join(self.data_dir, 'bank_savings.json'), 'w', encoding='utf-8') as f:
+            f.write('{"result": ')
+        self.assertEqual(self.recommender.refresh_catalog(), [])
+        self.assertIs(self.recommender.catalog, before.catalog)
+
+
+def _scalar_score(product, age, income, purpose, married=False):
+    """상품 하나의 기준 점수 - ProductScoringEngine 검증용 (모델 보유 확률 가산점 제외)"""
+    score = 40  # 기본 점수
+
+    # 1. 나이별 맞춤 점수
+    age_score = 0
+    if purpose == 'saving':
+        if age <= 30:
+            if product['term_type'] == 'long_term':
+                age_score = 25
+            elif product['term_type'] == 'medium_term':
+                age_score = 15
+            else:
+                age_score = 5
+        elif age <= 40:
+            if product['term_type'] == 'medium_term':
+                age_score = 20
+            elif product['term_type'] == 'long_term':
+                age_score = 15
+            else:
+                age_score = 10
+        else:
+            if product['term_type'] == 'short_term':
+                age_score = 20
+            elif product['term_type'] == 'medium_term':
+                age_score = 12
+            else:
+                age_score = 5
+
+    # 2. 소득별 맞춤 점수
+    income_score = 0
+    if income >= 500:
+        if product['target_type'] == 'premium':
+            income_score = 20
+        else:
+            income_score = 10
+    elif income >= 300:
+        income_score = 15
+    elif income > 0:
+        if product['target_type'] == 'simple':
+            income_score = 15
+        else:
+            income_score = 8
+    else:
+        income_score = 12
+
+    # 3. 금리 점수
+    rate = product['rate']
+    if product['is_loan']:
+        if rate <= 3.0:
+            rate_score = 20
+        elif rate <= 4.0:
+            rate_score = 15
+        elif rate <= 5.0:
+            rate_score = 10
+        else:
+            rate_score = 5
+    else:
+        if rate >= 6.0:
+            rate_score = 20
+        elif rate >= 5.0:
+            rate_score = 15
+        elif rate >= 4.0:
+            rate_score = 10
+        elif rate >= 3.0:
+            rate_score = 8
+        else:
+            rate_score = 5
+
+    # 4. 특화 보너스
+    bonus_score = 0
+
+    if age <= 35 and product['target_type'] == 'youth':
+        bonus_score += 10
+    elif married and product['target_type'] == 'family':
+        bonus_score += 8
+
+    if age <= 40 and '스마트폰' in product['join_way']:
+        bonus_score += 3
+    elif age > 40 and '영업점' in product['join_way']:
+        bonus_score += 3
+
+    major_banks = ['국민은행', '신한은행', '하나은행', '우리은행']
+    if any(bank in product['bank'] for bank in major_banks):
+        bonus_score += 5
+
+    total_score = score + age_score + income_score + rate_score + bonus_score
+    return min(total_score, 100)
+
+
+class ProductScoringEngineTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        from .registry import get_recommender
+        cls.recommender = get_recommender()
+
+    def test_vectorized_scores_match_scalar_scoring(self):
+        recommender = self.recommender
+        catalog = [recommender.catalog.product(index) for index in range(len(recommender.catalog))]
+        for purpose in ('saving', 'deposit', 'funds', 'general'):
+            for age in (20, 30, 31, 35, 36, 40, 41, 70):
+                for income in (0, 150, 299, 300, 499, 500, 800):
+                    for married in (False, True):
+                        scores = recommender.scoring_engine.score(age, income, purpose, married)
+                        expected = [
+                            _scalar_score(product, age, income, purpose, married)
+                            for product in catalog
+                        ]
+                        self.assertEqual(scores.tolist(), expected)
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class TopKRetrievalTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        from .registry import get_recommender
+        cls.recommender = get_recommender()
+
+    def test_top_k_matches_full_sort(self):
+        engine = self.recommender.scoring_engine
+        indices = np.arange(engine.size)
+        rng = np.random.default_rng(0)
+        for k in (1, 3, 5, 10, engine.size, engine.size + 5):
+            # 점수 범위를 좁혀 경계 동점이 많이 생기도록 구성
+            scores = rng.integers(60, 64, size=engine.size)
+            full_order = engine.order(indices, scores)[:k]
+            top_indices, top_scores = engine.top_k(indices, scores, k)
+            self.assertEqual(top_indices.tolist(), indices[full_order].tolist())
+            self.assertEqual(top_scores.tolist(), scores[full_order].tolist())
+
+    def test_single_category_purpose_scores_whole_category(self):
+        result = self.recommender.recommend('30세 적금 추천해주세요', top_n=5)
+        self.assertEqual(result['total_candidates'], len(self.recommender.products['saving']))
+        self.assertEqual(len(result['products']), 5)
+
+    def test_recommend_many_matches_individual_calls(self):
+        inputs = [
+            '30세 남성 기혼 월급 350만원 안전한 예금상품 추천해주세요',
+            '30세 남성 기혼 월급 350만원 꾸준한 적금상품 추천해주세요',
+            '30세 남성 기혼 월급 350만원 펀드 투자 추천해주세요',
+            '30세 남성 기혼 월급 350만원 꾸준한 적금상품 추천해주세요',
+            {'age': 45, 'monthly_income': 600, 'married': True, 'purpose': 'mmf'},
+        ]
+        batch = self.recommender.recommend_many(inputs, top_n=3)
+        self.assertEqual(len(batch), len(inputs))
+        for user_input, result in zip(inputs, batch):
+            single = self.recommender.recommend(user_input, top_n=3)
+            self.assertEqual(result['products'], single['products'])
+            self.assertEqual(result['user_info'], single['user_info'])
+        self.assertIsNot(batch[1]['products'], batch[3]['products'])
+
+    def test_retrieval_within_latency_budget_on_large_catalog(self):
+        from .matching import HighPerformanceFinancialRecommender
+
+        large = HighPerformanceFinancialRecommender.__new__(HighPerformanceFinancialRecommender)
+        large._build_catalog({
+            category: [dict(product) for _ in range(100) for product in products]
+            for category, products in self.recommender.products.items()
+        })
+
+        profile = {'age': 30, 'monthly_income': 350, 'purpose': 'general', 'married': True}
+        durations = []
+        for _ in range(20):
+            start_time = time.perf_counter()
+            catalog_scores = large._customize_products_advanced([profile])[0]
+            large._retrieve_top_products(profile, catalog_scores, 5)
+            durations.append((time.perf_counter() - start_time) * 1000)
+        self.assertLess(sorted(durations)[len(durations) // 2], RETRIEVAL_LATENCY_BUDGET_MS)
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class AttributeIndexTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        from .benchmark import write_synthetic_catalog
+        from .matching import HighPerformanceFinancialRecommender
+
+        with tempfile.TemporaryDirectory() as data_dir:
+            write_synthetic_catalog(data_dir, 3000)
+            cls.recommender = HighPerformanceFinancialRecommender(snapshot_path=None, data_dir=data_dir)
+        cls.products = [cls.recommender.catalog.product(i) for i in range(len(cls.recommender.catalog))]
+        cls.categories = cls.recommender.catalog.category_code.tolist()
+
+    def test_bitset_intersection_matches_brute_force(self):
+        index = self.recommender._state.attribute_index
+        filters = {'target_type': 'youth', 'category': 'saving', 'join_channel': ['스마트폰', '영업점']}
+        expected = [
+            i for i, product in enumerate(self.products)
+            if product['target_type'] == 'youth' and self.categories[i] == CATEGORY_CODES['saving']
+            and ('스마트폰' in product['join_way'] or '영업점' in product['join_way'])
+        ]
+        self.assertEqual(index.select(filters).tolist(), expected)
+        self.assertEqual(index.select({'bank': '없는은행'}).tolist(), [])
+        with self.assertRaises(ValueError):
+            index.select({'color': 'red'})
+
+    def test_select_unpacks_only_nonzero_words(self):
+        from unittest import mock
+
+        from . import attribute_index as attribute_index_module
+
+        index = self.recommender._state.attribute_index
+        filters = {'category': 'deposit', 'target_type': 'youth'}
+        words = index.bitset(filters)
+        self.assertEqual(words.dtype, np.uint64)
+        self.assertEqual(len(words), index.word_count)
+
+        unpacked_sizes = []
+        unpackbits = np.unpackbits
+
+        def recording_unpackbits(array, *args, **kwargs):
+            unpacked_sizes.append(np.asarray(array).size)
+            return unpackbits(array, *args, **kwargs)
+
+        with mock.patch.object(attribute_index_module.np, 'unpackbits', recording_unpackbits):
+            selected = index.select(filters)
+
+        # 카테고리 조건으로 예금 구간의 워드만 남으므로 카탈로그 전체(size / 8 바이트)보다 훨씬 적게 풂
+        self.assertEqual(unpacked_sizes, [np.count_nonzero(words) * 8])
+        self.assertLess(unpacked_sizes[0], index.size // 8 // 2)
+        self.assertTrue(len(selected))
+        self.assertEqual(selected.tolist(), [
+            i for i, product in enumerate(self.products)
+            if self.categories[i] == CATEGORY_CODES['deposit'] and product['target_type'] == 'youth'
+        ])
+
+    def test_select_without_filters_and_within_indices(self):
+        index = self.recommender._state.attribute_index
+        self.assertNotEqual(index.size % 64, 0)
+        self.assertEqual(index.select({}).tolist(), list(range(index.size)))
+
+        saving = index.select({'category': 'saving'})
+        deposit = index.select({'category': 'deposit'})
+        indices = np.array([int(deposit[-1]), int(saving[3]), int(deposit[0]), int(saving[0])])
+        self.assertEqual(index.select({'category': 'saving'}, indices).tolist(), [int(saving[3]), int(saving[0])])
+        self.assertEqual(index.select({'bank': '없는은행'}, indices).tolist(), [])
+
+    def test_filtered_recommendation_matches_filtered_full_ranking(self):
+        recommender = self.recommender
+        profile = {'age': 28, 'monthly_income': 300, 'purpose': 'saving',
+                   'filters': {'target_type': ['youth', 'simple'], 'term_type': 'long_term'}}
+        result = recommender.recommend(profile, top_n=5, trace=False)
+
+        plain = dict(profile)
+        del plain['filters']
+        scores = recommender._customize_products_advanced([plain])[0]
+        candidates = np.array([
+            i for i in recommender.catalog.category_indices('saving')
+            if self.products[i]['target_type'] in ('youth', 'simple') and self.products[i]['term_type'] == 'long_term'
+        ])
+        order = recommender.scoring_engine.order(candidates, scores[candidates])[:5]
+        self.assertEqual([p['product_id'] for p in result['products']],
+                         [self.products[i]['product_id'] for i in candidates[order]])
+        self.assertEqual(result['total_candidates'], len(candidates))
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class RecommendationCacheTests(TestCase):
+    def setUp(self):
+        caches['recommendations'].clear()
+
+    def test_shared_cache_hit_across_instances(self):
+        key = RecommendationCache.make_key((('purpose', 'saving'),), 5, 'v1')
+        first = RecommendationCache()
+        first.set(key, {'products': [{'name': 'A'}]}, compute_ms=3.0)
+
+        second = RecommendationCache()
+        self.assertEqual(second.get(key), {'products': [{'name': 'A'}]})
+        self.assertEqual(second.stats()['shared_hits'], 1)
+        self.assertEqual(second.get(key)['products'][0]['name'], 'A')
+        self.assertEqual(second.stats()['local_hits'], 1)
+
+    def test_local_lru_evicts_least_recently_used(self):
+        cache = RecommendationCache(alias='missing', max_local_entries=2)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_shared_file_cache_evicts_least_recently_used(self):
+        from .lru_file_cache import LRUFileBasedCache
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            cache = LRUFileBasedCache(cache_dir, {'OPTIONS': {'MAX_ENTRIES': 3, 'CULL_FREQUENCY': 3}})
+            for key in ('a', 'b', 'c'):
+                cache.set(key, key.upper())
+            self.assertEqual(cache.get('a'), 'A')
+
+            # 가득 찬 상태에서 저장하면 가장 오래 사용하지 않은 b만 제거
+            cache.set('d', 'D')
+            self.assertIsNone(cache.get('b'))
+            self.assertEqual([cache.get(key) for key in ('a', 'c', 'd')], ['A', 'C', 'D'])
+
+            cache.get('a')
+            cache.set('e', 'E')
+            self.assertIsNone(cache.get('c'))
+            self.assertEqual([cache.get(key) for key in ('a', 'd', 'e')], ['A', 'D', 'E'])
+
+    def test_cached_result_is_not_shared_by_reference(self):
+        cache = RecommendationCache()
+        cache.set('k', {'products': [{'name': 'A'}]})
+        cache.get('k')['products'][0]['name'] = 'changed'
+        self.assertEqual(cache.get('k')['products'][0]['name'], 'A')
+
+    def test_key_changes_with_catalog_version(self):
+        parsed = (('age', 30),)
+        self.assertNotEqual(
+            RecommendationCache.make_key(parsed, 5, 'v1'),
+            RecommendationCache.make_key(parsed, 5, 'v2'),
+        )
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class UserRecommendationTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='tester', password='pw-12345')
+        profile = self.user.profile
+        profile.연령대분류 = 2
+        profile.가구주성별 = 1
+        profile.결혼상태 = 2
+        profile.직업분류1 = 1
+        profile.저축여부 = 3
+        profile.save()
+        self.user.refresh_from_db()
+
+    def test_batch_matches_separate_calls(self):
+        from .views import get_ai_recommendations_for_user, get_user_recommendations
+
+        recommended_products, category_recommendations = get_user_recommendations(self.user)
+        self.assertEqual(recommended_products, get_ai_recommendations_for_user(self.user))
+        self.assertEqual(category_recommendations, get_category_recommendations_for_user(self.user))
+        self.assertEqual(
+            sorted(category_recommendations),
+            ['recommended_deposit', 'recommended_fund', 'recommended_mmf', 'recommended_saving', 'recommended_stock'],
+        )
+
+    def test_profile_save_precomputes_cached_recommendations(self):
+        from .registry import get_recommender
+        from .user_recommendation_cache import user_recommendation_cache
+        from .views import get_user_recommendations
+
+        catalog_version = get_recommender().catalog_version
+        profile = self.user.profile
+        self.assertIsNone(user_recommendation_cache.get(profile, catalog_version))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            profile.금융위험태도 = 3
+            profile.save()
+        user_recommendation_cache.shutdown(wait=True)
+
+        self.user.refresh_from_db()
+        cached = user_recommendation_cache.get(self.user.profile, catalog_version)
+        self.assertIsNotNone(cached)
+        hits = user_recommendation_cache.stats()['local_hits']
+        self.assertEqual(get_user_recommendations(self.user), cached)
+        self.assertEqual(user_recommendation_cache.stats()['local_hits'], hits + 1)
+
+    def test_key_changes_with_profile_version(self):
+        from .user_recommendation_cache import UserRecommendationCache
+
+        profile = self.user.profile
+        key = UserRecommendationCache.make_key(profile.user_id, profile.updated_at, 'v1')
+        profile.save()
+        self.assertNotEqual(key, UserRecommendationCache.make_key(profile.user_id, profile.updated_at, 'v1'))
+        self.assertNotEqual(key, UserRecommendationCache.make_key(profile.user_id, profile.updated_at, 'v2'))
+
+
+class RecommendationTableTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        from .registry import get_recommender
+        from .views import compute_user_recommendations
+
+        cls.recommender = get_recommender()
+        cls.compute = staticmethod(compute_user_recommendations)
+        cls.table = build_table(cls.recommender, compute_user_recommendations)
+        cls.temp_dir = tempfile.TemporaryDirectory()
+        cls.path = os.path.join(cls.temp_dir.name, 'table.json')
+        write_table(cls.table, cls.path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.temp_dir.cleanup()
+        super().tearDownClass()
+
+    def test_table_covers_profile_space(self):
+        self.assertEqual(len(self.table['entries']), 7 * 3 * 3 * 5 * 4 * 4)
+        self.assertLess(len(self.table['results']), len(self.table['entries']))
+
+    def test_lookup_matches_live_computation(self):
+        table = RecommendationTable(self.path)
+        for profile in (
+            TableProfile(연령대분류=2, 가구주성별=1, 결혼상태=2, 직업분류1=1, 저축여부=3, 금융위험태도=0.5),
+            TableProfile(연령대분류=5, 직업분류1=3, 금융위험태도=-3),
+            TableProfile(),
+        ):
+            self.assertEqual(
+                table.lookup(profile, self.recommender.catalog_version),
+                self.compute(self.recommender, [profile])[0],
+            )
+
+    def test_risk_attitude_buckets_share_entry(self):
+        key_fields = self.table['key_fields']
+        self.assertEqual(
+            profile_key(TableProfile(금융위험태도=0.2), key_fields),
+            profile_key(TableProfile(금융위험태도=1.0), key_fields),
+        )
+        self.assertNotEqual(
+            profile_key(TableProfile(금융위험태도=-0.5), key_fields),
+            profile_key(TableProfile(금융위험태도=-1.5), key_fields),
+        )
+
+    def test_stale_catalog_version_falls_back(self):
+        table = RecommendationTable(self.path)
+        self.assertIsNone(table.lookup(TableProfile(), 'outdated'))
+        self.assertIsNone(RecommendationTable(os.path.join(self.temp_dir.name, 'missing.json')).lookup(
+            TableProfile(), self.recommender.catalog_version
+        ))
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class StageMetricsTests(TestCase):
+    def test_histogram_buckets_and_quantiles(self):
+        histogram = LatencyHistogram(buckets=(1, 5, 10))
+        for value in (0.5, 0.8, 3, 7, 20):
+            histogram.observe(value)
+        self.assertEqual(histogram.counts, [2, 1, 1, 1])
+        self.assertEqual(histogram.quantile(0.5), 5)
+        self.assertEqual(histogram.quantile(0.99), float('inf'))
+
+    def test_prometheus_rendering_is_cumulative(self):
+        metrics = StageMetrics()
+        metrics.observe_many({'parse': 0.07, 'total': 3.0})
+        metrics.observe_many({'parse': 0.2, 'total': 30.0})
+        text = metrics.render_prometheus()
+        self.assertIn('recommender_stage_duration_ms_bucket{stage="parse",le="0.1"} 1', text)
+        self.assertIn('recommender_stage_duration_ms_bucket{stage="parse",le="0.25"} 2', text)
+        self.assertIn('recommender_stage_duration_ms_count{stage="total"} 2', text)
+
+    def test_recommend_records_stages_and_trace(self):
+        from .registry import get_recommender
+
+        recommender_metrics.reset()
+        recommender = get_recommender()
+        result = recommender.recommend_many(['29세 여성 미혼 적금 추천', '29세 여성 미혼 적금 추천'], top_n=3, trace=True)[0]
+        self.assertEqual(
+            list(result['trace']),
+            [stage for stage in ('parse', 'cache_lookup', 'scoring', 'candidate_selection', 'sort', 'materialize',
+                                 'reason', 'cache_store', 'total') if stage in result['trace']],
+        )
+        self.assertIn('total', result['trace'])
+        self.assertNotIn('trace', recommender.recommend('29세 여성 미혼 적금 추천', top_n=3, trace=False))
+        self.assertEqual(recommender_metrics.snapshot()['total']['count'], 2)
+
+    @override_settings(DEBUG=False, INTERNAL_IPS=[])
+    def test_metrics_endpoint_requires_internal_access(self):
+        from .views import recommender_metrics_view
+
+        request = RequestFactory().get('/products/metrics/', REMOTE_ADDR='10.0.0.5')
+        request.user = AnonymousUser()
+        self.assertEqual(recommender_metrics_view(request).status_code, 403)
+
+        request = RequestFactory().get('/products/metrics/', {'format': 'json'}, REMOTE_ADDR='10.0.0.5')
+        request.user = User(is_staff=True)
+        ProductDataLoader.get_funds()
+        response = recommender_metrics_view(request)
+        self.assertEqual(response.status_code, 200)
+        body = json.loads(response.content)
+        self.assertIn('stages', body)
+        self.assertIn('funds.json', [entry['file'] for entry in body['file_cache']['entries']])
+        self.assertGreaterEqual(body['file_cache']['hits'] + body['file_cache']['loads'], 1)
+
+        request = RequestFactory().get('/products/metrics/', REMOTE_ADDR='10.0.0.5')
+        request.user = User(is_staff=True)
+        content = recommender_metrics_view(request).content.decode('utf-8')
+        self.assertIn('product_file_cache_hits_total', content)
+        self.assertIn('product_file_cache_products{file="funds.json"}', content)
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class RecommendAPITests(TestCase):
+    def call(self, request):
+        from .views import recommend_api
+
+        return async_to_sync(recommend_api)(request)
+
+    def post(self, payload):
+        return self.call(RequestFactory().post(
+            '/products/api/recommend/', data=json.dumps(payload), content_type='application/json'
+        ))
+
+    def test_single_and_batch_match_recommend(self):
+        from .registry import get_recommender
+
+        recommender = get_recommender()
+        profile = {'age': 31, 'monthly_income': 420, 'purpose': 'saving', 'filters': {'join_channel': '스마트폰'}}
+        expected = recommender.recommend(profile, top_n=3, trace=False)
+
+        response = self.post({'input': profile, 'top_n': 3, 'fields': ['name', 'bank']})
+        self.assertEqual(response.status_code, 200)
+        body = json.loads(response.content)
+        self.assertEqual(body['catalog_version'], recommender.catalog_version)
+        with override_settings(DEBUG=True):
+            self.assertNotIn('trace', json.loads(self.post({'input': profile}).content)['result'])
+        self.assertEqual(body['result']['products'], [
+            {'name': product['name'], 'bank': product['bank']} for product in expected['products']
+        ])
+
+        married = dict(profile, married=True, gender='female', holding_probabilities={'saving': 0.4})
+        self.assertEqual(self.post({'input': married}).status_code, 200)
+
+        response = self.post({'inputs': [profile, '29세 여성 미혼 적금 추천'], 'top_n': 3})
+        results = json.loads(response.content)['results']
+        self.assertEqual(len(results), 2)
+        self.assertEqual([p['product_id'] for p in results[0]['products']],
+                         [p['product_id'] for p in expected['products']])
+
+        response = self.call(RequestFactory().get(
+            '/products/api/recommend/', {'q': '29세 여성 미혼 적금 추천', 'fields': 'name,rate'}
+        ))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(json.loads(response.content)['result']['products'][0]), {'name', 'rate'})
+
+    def test_invalid_requests_return_400(self):
+        for payload in (
+            {'input': {'age': '서른'}},
+            {'input': {'purpose': 'saving', 'filters': {'color': 'red'}}},
+            {'input': {'height': 180}},
+            {'input': {'married': 'false'}},
+            {'input': {'gender': 'other'}},
+            {'input': {'purpose': 'unknown'}},
+            {'input': {'holding_probabilities': {'loan': 0.5}}},
+            {'input': '29세 적금', 'top_n': 100},
+            {'inputs': []},
+            {'input': None},
+        ):
+            with self.subTest(payload=payload):
+                self.assertEqual(self.post(payload).status_code, 400)
+        response = self.call(RequestFactory().post(
+            '/products/api/recommend/', data='{', content_type='application/json'
+        ))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.call(RequestFactory().delete('/products/api/recommend/')).status_code, 405)
+
+    def test_executor_bounds_and_timeout(self):
+        executor = RecommendationExecutor(max_workers=1, max_pending=0)
+        release = threading.Event()
+
+        async def scenario():
+            import asyncio
+
+            with self.assertRaises(TimeoutError):
+                await executor.run(release.wait, 5, timeout=0.05)
+            # 시간 초과된 작업이 아직 실행 중이므로 슬롯이 없음
+            with self.assertRaises(ExecutorBusy):
+                await executor.run(sum, [1, 2], timeout=1)
+            release.set()
+            for _ in range(100):
+                try:
+                    return await executor.run(sum, [1, 2], timeout=1)
+                except ExecutorBusy:
+                    await asyncio.sleep(0.01)
+
+        self.assertEqual(async_to_sync(scenario)(), 3)
+        self.assertEqual(executor.stats()['timeouts'], 1)
+        self.assertGreaterEqual(executor.stats()['rejected'], 1)
+        executor.shutdown()
+
+
+class _FakeFSSHandler(http.server.BaseHTTPRequestHandler):
+    """로컬 FSS API 대역 - server.products를 baseList로 반환, server.fail이면 500"""
+
+    def do_GET(self):
+        self.server.requests.append(self.path)
+        if self.server.fail:
+            self.send_response(500)
+            self.end_headers()
+            return
+        body = json.dumps({'result': {'baseList': self.server.products}}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class FSSCatalogCacheTests(TestCase):
+    def setUp(self):
+        self.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _FakeFSSHandler)
+        self.server.requests = []
+        self.server.fail = False
+        self.server.products = [{'fin_prdt_nm': '첫 예금', 'kor_co_nm': '국민은행'}]
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f'http://127.0.0.1:{self.server.server_address[1]}/finlifeapi'
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.cache_dir)
+
+    def make_cache(self, ttl=3600):
+        return FSSCatalogCache(cache_dir=self.cache_dir, ttl=ttl, base_url=self.base_url, timeout=2)
+
+    def test_fetches_once_and_persists_across_restarts(self):
+        cache = self.make_cache()
+        products = cache.get('deposit', 'key')
+        self.assertEqual(products, self.server.products)
+        self.assertTrue(self.server.requests[0].startswith('/finlifeapi/depositProductsSearch.json?auth=key'))
+
+        products[0]['product_type'] = 'deposit'
+        self.assertNotIn('product_type', cache.get('deposit', 'key')[0])
+        self.assertEqual(self.make_cache().get('deposit', 'key'), self.server.products)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_stale_entry_is_served_while_refreshing(self):
+        cache = self.make_cache(ttl=0)
+        cache.get('saving', 'key')
+        old_products = self.server.products
+        self.server.products = [{'fin_prdt_nm': '새 적금', 'kor_co_nm': '신한은행'}]
+
+        self.assertEqual(cache.get('saving', 'key'), old_products)
+        cache.wait_for_refresh(5)
+        self.assertEqual(cache.stats['stale_hits'], 1)
+        self.assertEqual(self.make_cache().get('saving', 'key'), self.server.products)
+
+    def test_failed_refresh_keeps_last_good_response(self):
+        cache = self.make_cache(ttl=0)
+        products = cache.get('deposit', 'key')
+        self.server.fail = True
+        self.assertEqual(cache.get('deposit', 'key'), products)
+        cache.wait_for_refresh(5)
+        self.assertEqual(cache.stats['fetch_errors'], 1)
+        self.assertEqual(cache.get('deposit', 'key'), products)
+        self.assertIsNone(self.make_cache().get('saving', 'key'))
+
+
+class _PagedFSSHandler(http.server.BaseHTTPRequestHandler):
+    """페이지가 여러 개인 FSS API 대역 - 권역별로 server.max_page_no 페이지, 페이지당 상품 2개"""
+
+    def do_GET(self):
+        from urllib.parse import parse_qs, urlparse
+
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        endpoint, group, page = url.path.rsplit('/', 1)[-1], query['topFinGrpNo'][0], int(query['pageNo'][0])
+        with self.server.lock:
+            self.server.requests.append((endpoint, group, page))
+            failing = self.server.fail_once.pop((endpoint, page), None)
+        time.sleep(self.server.delay)
+        if failing:
+            self.send_response(503)
+            self.end_headers()
+            return
+
+        if query['auth'][0] != 'key':
+            result = {'err_cd': '010', 'err_msg': '미등록 인증키'}
+        else:
+            result = {
+                'err_cd': '000', 'max_page_no': self.server.max_page_no, 'now_page_no': page,
+                'baseList': [{'fin_prdt_cd': f'{endpoint}-{group}-{page}-{i}'} for i in range(2)],
+                'optionList': [{'fin_prdt_cd': f'{endpoint}-{group}-{page}-0'}],
+            }
+        body = json.dumps({'result': result}).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class FSSCollectorTests(TestCase):
+    def setUp(self):
+        self.server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), _PagedFSSHandler)
+        self.server.lock = threading.Lock()
+        self.server.requests = []
+        self.server.fail_once = {}
+        self.server.delay = 0
+        self.server.max_page_no = 3
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f'http://127.0.0.1:{self.server.server_address[1]}/finlifeapi'
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def make_collector(self, api_key='key', **kwargs):
+        kwargs.setdefault('rate', None)
+        kwargs.setdefault('backoff', 0.01)
+        return FSSCollector(api_key, base_url=self.base_url, **kwargs)
+
+    def test_collects_every_page_in_order_and_retries(self):
+        self.server.fail_once[('depositProductsSearch.json', 2)] = True
+        collected = self.make_collector().collect(DEFAULT_JOBS)
+
+        self.assertEqual(collected['errors'], {})
+        deposits = collected['data']['savings_bank_deposits']['result']
+        self.assertEqual(
+            [product['fin_prdt_cd'] for product in deposits['baseList']],
+            [f'depositProductsSearch.json-030300-{page}-{i}' for page in (1, 2, 3) for i in range(2)],
+        )
+        self.assertEqual(len(deposits['optionList']), 3)
+        self.assertEqual(len(self.server.requests), len(DEFAULT_JOBS) * 3 + 1)
+
+        endpoints = collected['timings']['endpoints']
+        self.assertEqual({timing['pages'] for timing in endpoints.values()}, {3})
+        self.assertEqual(sum(timing['retries'] for timing in endpoints.values()), 1)
+
+    def test_pages_are_fetched_concurrently(self):
+        self.server.delay = 0.1
+        collected = self.make_collector(max_workers=8).collect(DEFAULT_JOBS)
+        timings = collected['timings']
+        # 순차 요청이면 12 × 0.1초 이상, 동시 요청이면 가장 느린 작업(1페이지 → 나머지 페이지) 수준
+        self.assertLess(timings['elapsed_ms'], 800)
+        self.assertGreater(timings['sequential_ms'], timings['elapsed_ms'])
+
+    def test_api_error_is_reported_per_job(self):
+        collected = self.make_collector(api_key='wrong').collect(DEFAULT_JOBS[:1])
+        self.assertEqual(collected['data'], {})
+        self.assertIn(FSSAPIError.__name__, collected['errors']['bank_deposits'])
+
+    def test_rate_limiter_spaces_requests(self):
+        limiter = RateLimiter(50)
+        start_time = time.monotonic()
+        for _ in range(6):
+            limiter.acquire()
+        self.assertGreaterEqual(time.monotonic() - start_time, 0.09)
+
+
+class DeltaSyncTests(TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.sync = DeltaSync(self.data_dir)
+        with open(os.path.join(os.path.dirname(__file__), 'data', 'bank_deposits.json'), encoding='utf-8') as f:
+            self.deposits = json.load(f)
+
+    def tearDown(self):
+        shutil.rmtree(self.data_dir)
+
+    def test_first_sync_inserts_everything(self):
+        manifest = self.sync.sync({'bank_deposits': self.deposits})
+        self.assertEqual(manifest['sequence'], 1)
+        self.assertEqual(manifest['changed']['bank_deposits']['inserted'], len(self.deposits['result']['baseList']))
+        self.assertEqual(manifest['changed_catalog_categories'], ['deposit'])
+        with open(os.path.join(self.data_dir, 'bank_deposits.json'), encoding='utf-8') as f:
+            self.assertEqual(json.load(f), self.deposits)
+
+    def test_unchanged_pull_leaves_files_and_log_untouched(self):
+        self.sync.sync({'bank_deposits': self.deposits})
+        path = os.path.join(self.data_dir, 'bank_deposits.json')
+        mtime = os.stat(path).st_mtime_ns
+
+        # 공시 제출월만 바뀐 경우는 변경으로 보지 않음
+        next_month = json.loads(json.dumps(self.deposits))
+        for row in next_month['result']['baseList'] + next_month['result']['optionList']:
+            row['dcls_month'] = '209912'
+        manifest = self.sync.sync({'bank_deposits': next_month})
+        self.assertEqual(manifest['changed'], {})
+        self.assertEqual(manifest['unchanged'], ['bank_deposits'])
+        self.assertEqual(os.stat(path).st_mtime_ns, mtime)
+        self.assertEqual(len(self.sync.read_changes()), 1)
+
+    def test_delta_records_inserted_updated_and_removed_products(self):
+        self.sync.sync({'bank_deposits': self.deposits})
+        pulled = json.loads(json.dumps(self.deposits))
+        result = pulled['result']
+        removed = result['baseList'].pop()
+        renamed, repriced = result['baseList'][0], result['baseList'][1]
+        renamed['fin_prdt_nm'] += ' 개정'
+        option = next(row for row in result['optionList'] if row['fin_prdt_cd'] == repriced['fin_prdt_cd'])
+        option['intr_rate2'] += 0.1
+        result['baseList'].append(dict(renamed, fin_prdt_cd='NEW0001'))
+
+        manifest = self.sync.sync({'bank_deposits': pulled})
+        self.assertEqual(
+            {key: manifest['changed']['bank_deposits'][key] for key in ('inserted', 'updated', 'removed')},
+            {'inserted': 1, 'updated': 2, 'removed': 1},
+        )
+        self.assertEqual(load_manifest(self.sync.manifest_path)['sequence'], 2)
+
+        entry = self.sync.read_changes(since_sequence=1)[0]
+        self.assertEqual(entry['removed'], [f"{removed['fin_co_no']}:{removed['fin_prdt_cd']}"])
+        self.assertEqual(entry['inserted'][0]['base']['fin_prdt_cd'], 'NEW0001')
+        updates = {update['key'].split(':')[1]: update for update in entry['updated']}
+        self.assertEqual(updates[renamed['fin_prdt_cd']]['fields'], ['fin_prdt_nm'])
+        self.assertEqual(updates[repriced['fin_prdt_cd']]['fields'], [])
+        self.assertEqual(len(updates[repriced['fin_prdt_cd']]['options']), 1)
+
+
+class ProductStoreTests(TestCase):
+    @staticmethod
+    def load(category):
+        with open(os.path.join(os.path.dirname(__file__), 'data', STORE_FILES[category]), encoding='utf-8') as f:
+            return json.load(f)
+
+    def test_ingest_counts_and_precomputed_best_rate(self):
+        results = ingest_from_files()
+        deposits = self.load('deposit')['result']
+        self.assertEqual(results['deposit']['products'], len(deposits['baseList']))
+        self.assertEqual(ProductOption.objects.filter(product__category='deposit').count(), len(deposits['optionList']))
+
+        base = deposits['baseList'][0]
+        options = [row for row in deposits['optionList'] if row['fin_prdt_cd'] == base['fin_prdt_cd']]
+        product = FinancialProduct.objects.get(category='deposit', product_code=base['fin_prdt_cd'])
+        self.assertEqual(product.best_rate, max(row['intr_rate2'] for row in options))
+        self.assertEqual(product.options.count(), len(options))
+        self.assertEqual(FinancialProduct.objects.get(category='fund', product_code='FD10001').risk_level, 4)
+
+        # 다시 적재해도 같은 행을 갱신, 응답에서 빠진 상품은 삭제
+        ids = set(FinancialProduct.objects.values_list('id', flat=True))
+        ingest_from_files()
+        self.assertEqual(set(FinancialProduct.objects.values_list('id', flat=True)), ids)
+        fewer = self.load('deposit')
+        fewer['result']['baseList'] = fewer['result']['baseList'][1:]
+        self.assertEqual(ingest_category('deposit', fewer)['removed'], 1 + len(options))
+        self.assertFalse(FinancialProduct.objects.filter(product_code=base['fin_prdt_cd'], category='deposit').exists())
+
+    def test_synced_pull_reingests_only_changed_categories(self):
+        ingest_from_files()
+        data_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, data_dir)
+        deposits = self.load('deposit')
+        base = deposits['result']['baseList'][0]
+        base['fin_prdt_nm'] += ' 개정'
+
+        manifest = DeltaSync(data_dir).sync({'bank_deposits': deposits})
+        self.assertEqual(set(ingest_synced(manifest, data_dir)), {'deposit'})
+        product = FinancialProduct.objects.get(category='deposit', product_code=base['fin_prdt_cd'])
+        self.assertEqual(product.name, base['fin_prdt_nm'])
+
+        self.assertEqual(ingest_synced(DeltaSync(data_dir).sync({'bank_deposits': deposits}), data_dir), {})
+
+    def test_listing_filters_sort_and_paginate_in_queries(self):
+        from .utils import ProductDataLoader, ProductPaginator
+
+        ingest_from_files()
+        rates = list(FinancialProduct.objects.listing(category='saving', sort='rate').values_list('best_rate', flat=True))
+        self.assertEqual(rates, sorted(rates, reverse=True))
+        self.assertTrue(all(
+            risk is None or risk <= 2
+            for risk in FinancialProduct.objects.listing(max_risk=2).values_list('risk_level', flat=True)
+        ))
+        self.assertEqual(
+            set(FinancialProduct.objects.listing(company='삼성자산운용').values_list('company_name', flat=True)),
+            {'삼성자산운용'},
+        )
+
+        with self.assertNumQueries(2):
+            page, total = ProductPaginator.paginate_queryset(FinancialProduct.objects.listing(category='fund'), 1)
+        self.assertEqual(total, len(ProductDataLoader.get_funds()))
+        self.assertEqual(page.object_list, ProductDataLoader.get_funds()[:9])
+
+    def test_tab_context_pages_one_tab_from_store(self):
+        from .views import build_tab_context
+
+        ingest_from_files()
+        request = RequestFactory().get('/products/list/fund/', {'sort': 'rate', 'page': 2})
+        request.user = AnonymousUser()
+        context = build_tab_context(request, 'fund')
+        self.assertEqual(set(context), {'funds', 'funds_total', 'funds_page_range'})
+        self.assertEqual(context['funds'].number, 2)
+
+        request = RequestFactory().get('/products/list/', {'sort': 'rate'})
+        request.user = AnonymousUser()
+        context = build_tab_context(request, 'saving')
+        top_saving = FinancialProduct.objects.listing(category='saving', sort='rate').first()
+        self.assertEqual(context['savings'].object_list[0], top_saving.display)
+        self.assertEqual(context['savings'].object_list[0]['product_type'], 'saving')
+
+
+class ProductFileCacheTests(TestCase):
+    def setUp(self):
+        self.data_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.data_dir)
+        self.cache = ProductFileCache(self.data_dir)
+
+    def write_funds(self, *names):
+        response = {'result': {
+            'baseList': [{'fin_prdt_cd': f'F{i}', 'fin_prdt_nm': name} for i, name in enumerate(names)],
+            'optionList': [],
+        }}
+        with open(os.path.join(self.data_dir, 'funds.json'), 'w', encoding='utf-8') as f:
+            json.dump(response, f, ensure_ascii=False)
+
+    def get_funds(self):
+        return self.cache.get('funds.json', ProductDataLoader.process_fund_data)
+
+    def test_reuses_processed_products_until_file_changes(self):
+        self.write_funds('펀드A')
+        first = self.get_funds()
+        self.assertEqual([product['fin_prdt_nm'] for product in first], ['펀드A'])
+        self.assertEqual(self.get_funds(), first)
+        self.assertEqual((self.cache.stats['loads'], self.cache.stats['hits']), (1, 1))
+
+        self.write_funds('펀드A', '펀드B')
+        self.assertEqual(len(self.get_funds()), 2)
+        self.assertEqual((self.cache.stats['loads'], self.cache.stats['invalidations']), (2, 1))
+        self.assertEqual(self.cache.entries()[0]['products'], 2)
+
+    def test_callers_cannot_modify_cached_products(self):
+        self.write_funds('펀드A')
+        products = self.get_funds()
+        products[0]['fin_prdt_nm'] = '변경'
+        products.append({'fin_prdt_nm': '추가'})
+        self.assertEqual([product['fin_prdt_nm'] for product in self.get_funds()], ['펀드A'])
+
+    def test_missing_file_returns_empty_list(self):
+        self.assertEqual(self.get_funds(), [])
+        self.assertEqual(self.cache.stats['missing'], 1)
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class ProductSearchTests(TestCase):
+    def setUp(self):
+        caches['recommendations'].clear()
+
+    @classmethod
+    def setUpTestData(cls):
+        ingest_from_files()
+
+    def test_ranks_name_matches_first(self):
+        result = search_products('주거래적금')
+        self.assertEqual(result['results'][0]['fin_prdt_nm'], '우리SUPER주거래적금')
+        self.assertEqual(result['results'][0]['category'], 'saving')
+        self.assertGreater(result['results'][0]['score'], 0)
+
+    def test_searches_conditions_features_and_short_terms(self):
+        names = [product['fin_prdt_nm'] for product in search_products('우대이율', per_page=50)['results']]
+        self.assertIn('펫 적금', names)
+        names = [product['fin_prdt_nm'] for product in search_products('채권형', categories=['fund'])['results']]
+        self.assertIn('KTB채권형펀드', names)
+        # trigram MATCH가 안 되는 두 글자 검색어는 LIKE로 검색
+        result = search_products('적금', categories=['deposit', 'saving'])
+        self.assertGreaterEqual(result['total'], FinancialProduct.objects.filter(name__contains='적금').count())
+        self.assertIn('적금', result['results'][0]['fin_prdt_nm'] + result['results'][0].get('spcl_cnd', ''))
+
+    def test_filters_facets_and_pagination(self):
+        result = search_products(categories=['fund', 'mmf'], max_risk=3, join_way='온라인', per_page=4, page=2)
+        expected = [
+            product for product in FinancialProduct.objects.filter(category__in=['fund', 'mmf'], risk_level__lte=3)
+            if '온라인' in product.join_way.split(',')
+        ]
+        self.assertEqual(result['total'], len(expected))
+        self.assertEqual(result['page'], 2)
+        self.assertLessEqual(len(result['results']), 4)
+        rates = [product['best_rate'] for product in search_products(categories=['saving'])['results']]
+        self.assertEqual(rates, sorted(rates, reverse=True))
+
+        facets = result['facets']
+        self.assertEqual(facets['category']['fund'] + facets['category']['mmf'], sum(facets['category'].values()))
+        self.assertGreaterEqual(facets['join_way']['온라인'], result['total'])
+        self.assertEqual(
+            sum(facets['risk_level'].values()), search_products(categories=['fund', 'mmf'], join_way='온라인')['total']
+        )
+
+    def test_index_follows_ingest(self):
+        with open(os.path.join(os.path.dirname(__file__), 'data', STORE_FILES['saving']), encoding='utf-8') as f:
+            response = json.load(f)
+        response['result']['baseList'] = [
+            base for base in response['result']['baseList'] if base['fin_prdt_nm'] != '우리SUPER주거래적금'
+        ]
+        ingest_category('saving', response)
+        self.assertEqual(search_products('주거래적금')['total'], 0)
+        self.assertEqual(index_products(), FinancialProduct.objects.count())
+
+    def test_results_and_facets_are_cached_per_store_version(self):
+        first = search_products(categories=['fund', 'mmf'], max_risk=3, per_page=2)
+        self.assertFalse(first['cached'])
+        # 버전 조회 한 번으로 응답
+        with self.assertNumQueries(1):
+            again = search_products(categories=['mmf', 'fund'], max_risk=3, per_page=2)
+        self.assertTrue(again['cached'])
+        self.assertEqual((again['results'], again['facets']), (first['results'], first['facets']))
+        # 다음 페이지는 패싯 집계 없이 (버전, 페이지, 상품 조회)
+        with self.assertNumQueries(3):
+            self.assertEqual(search_products(categories=['fund', 'mmf'], max_risk=3, per_page=2, page=2)['page'], 2)
+
+        with open(os.path.join(os.path.dirname(__file__), 'data', STORE_FILES['fund']), encoding='utf-8') as f:
+            response = json.load(f)
+        removed = next(base for base in response['result']['baseList'] if int(base['risk_level']) <= 3)
+        response['result']['baseList'].remove(removed)
+        ingest_category('fund', response)
+        after = search_products(categories=['fund', 'mmf'], max_risk=3, per_page=2)
+        self.assertFalse(after['cached'])
+        self.assertEqual(after['facets']['category']['fund'], first['facets']['category']['fund'] - 1)
+
+    def test_api(self):
+        from .views import product_search_api
+
+        request = RequestFactory().get('/products/api/search/', {'q': '펀드', 'category': 'fund,mmf', 'per_page': 3})
+        body = json.loads(product_search_api(request).content)
+        self.assertLessEqual(len(body['results']), 3)
+        self.assertTrue(all(product['category'] in ('fund', 'mmf') for product in body['results']))
+        self.assertIn('facets', body)
+
+        request = RequestFactory().get('/products/api/search/', {'q': '펀드', 'min_rate': 'high'})
+        self.assertEqual(product_search_api(request).status_code, 400)
+
+
+@override_settings(CACHES=LOCAL_CACHES)
+class ProductListTabTests(TestCase):
+    def get_tab(self, tab, **params):
+        from .views import product_list_tab
+
+        request = RequestFactory().get(f'/products/list/{tab}/', params)
+        request.user = AnonymousUser()
+        return product_list_tab(request, tab)
+
+    def test_json_tab_page_from_files(self):
+        from .utils import ProductDataLoader
+
+        body = json.loads(self.get_tab('stock', format='json').content)
+        stocks = ProductDataLoader.get_stocks()
+        self.assertEqual(body['total'], len(stocks))
+        self.assertEqual(body['products'], stocks[:9])
+        self.assertEqual(body['has_next'], len(stocks) > 9)
+
+        body = json.loads(self.get_tab('all', format='json', page=2).content)
+        self.assertEqual(body['page'], 2)
+
+    def test_html_fragment_renders_only_the_tab(self):
+        ingest_from_files()
+        content = self.get_tab('mmf', page=1).content.decode('utf-8')
+        self.assertNotIn('<html', content)
+        self.assertIn(FinancialProduct.objects.listing(category='mmf').first().name, content)
+        self.assertNotIn(FinancialProduct.objects.listing(category='stock').first().name, content)
+
+    def test_unknown_tab_is_404(self):
+        from django.http import Http404
+
+        with self.assertRaises(Http404):
+            self.get_tab('loan')
+
+
+class ProductDetailIndexTests(TestCase):
+    def test_indexes_all_products_with_sorted_options_and_similar(self):
+        expected = 0
+        for filename in STORE_FILES.values():
+            with open(os.path.join(os.path.dirname(__file__), 'data', filename), encoding='utf-8') as f:
+                expected += len(json.load(f)['result']['baseList'])
+        self.assertEqual(len(product_detail_index), expected)
+
+        product = product_detail_index.get('deposit', 'WR0001B')
+        terms = [option['save_term'] for option in product['options']]
+        self.assertEqual(terms, sorted(terms))
+        self.assertEqual(len(product['option_columns']), len(product['options'][0]['cells']))
+        self.assertEqual(len(product['similar']), 4)
+        self.assertTrue(all(similar['product_type'] == 'deposit' for similar in product['similar']))
+        self.assertNotIn('WR0001B', [similar['product_code'] for similar in product['similar']])
+        self.assertIsNone(product_detail_index.get('saving', 'WR0001B'))
+
+    def test_render_is_cached_until_source_changes(self):
+        data_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, data_dir)
+        source = os.path.join(os.path.dirname(__file__), 'data', STORE_FILES['fund'])
+        with open(source, encoding='utf-8') as f:
+            response = json.load(f)
+        path = os.path.join(data_dir, STORE_FILES['fund'])
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(response, f, ensure_ascii=False)
+
+        index = ProductDetailIndex(data_dir)
+        code = response['result']['baseList'][0]['fin_prdt_cd']
+        calls = []
+        render = lambda product: calls.append(product['name']) or product['name']
+        summary, fragment = index.render('fund', code, render)
+        self.assertEqual(index.render('fund', code, render), (summary, fragment))
+        self.assertEqual(summary['name'], fragment)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual((index.stats['render_misses'], index.stats['render_hits']), (1, 1))
+        version = index.version
+
+        response['result']['baseList'][0]['fin_prdt_nm'] = '변경된 펀드'
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(response, f, ensure_ascii=False)
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 10**9))
+        self.assertEqual(index.render('fund', code, render), (dict(summary, name='변경된 펀드'), '변경된 펀드'))
+        self.assertNotEqual(index.version, version)
+        self.assertEqual(index.stats['builds'], 2)
+
+    def test_recommendation_cards_use_indexed_type_and_company(self):
+        from .category_recommendations import convert_category_products
+        from .views import convert_ai_recommendations
+
+        # 이름에 '펀드'가 들어간 MMF
+        result = {'products': [{'name': 'NH현금관리펀드', 'bank': 'NH투자증권', 'product_id': 'MMF10003'}]}
+        card = convert_category_products('mmf', result)[0]
+        self.assertEqual((card['product_type'], card['fin_co_no']), ('mmf', '0030003'))
+        card = convert_ai_recommendations(result, 'mmf')[0]
+        self.assertEqual((card['product_type'], card['fin_co_no']), ('mmf', '0030003'))
+
+    def test_locate_prefers_matching_company(self):
+        data_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, data_dir)
+        response = {'result': {'baseList': [
+            {'fin_co_no': '001', 'fin_prdt_cd': 'P1', 'kor_co_nm': '가은행', 'fin_prdt_nm': '예금A'},
+            {'fin_co_no': '002', 'fin_prdt_cd': 'P1', 'kor_co_nm': '나은행', 'fin_prdt_nm': '예금B'},
+        ], 'optionList': []}}
+        with open(os.path.join(data_dir, STORE_FILES['deposit']), 'w', encoding='utf-8') as f:
+            json.dump(response, f, ensure_ascii=False)
+
+        index = ProductDetailIndex(data_dir)
+        self.assertEqual(index.locate('P1', '나은행')['company_code'], '002')
+        self.assertEqual(index.locate('P1')['company_code'], '001')
+        self.assertEqual(index.get('deposit', 'P1', '002')['name'], '예금B')
+        self.assertIsNone(index.locate('P1', product_types=['saving']))
+
+    def test_json_view_and_404(self):
+        from django.http import Http404
+        from .views import product_detail
+
+        request = RequestFactory().get('/products/detail/deposit/WR0001B/', {'format': 'json'})
+        body = json.loads(product_detail(request, 'deposit', 'WR0001B').content)
+        self.assertEqual(body['product_code'], 'WR0001B')
+        self.assertEqual(body['catalog_version'], product_detail_index.version)
+        for product_type, product_id in (('loan', 'WR0001B'), ('deposit', 'NOPE')):
+            with self.assertRaises(Http404):
+                product_detail(RequestFactory().get('/', {'format': 'json'}), product_type, product_id)
+
+    def test_page_name_comes_from_rendered_entry(self):
+        from unittest import mock
+
+        from . import views
+
+        def summary(*args, **kwargs):
+            raise AssertionError('상세 페이지는 색인을 두 번 조회하지 않아야 함')
+
+        # 템플릿의 {% url %}은 챗봇 앱 URL까지 불러오므로 렌더링 함수는 대역으로 바꿈
+        request = RequestFactory().get('/products/detail/deposit/WR0001B/')
+        with mock.patch.object(product_detail_index, 'summary', summary), \
+                mock.patch.object(views, 'render_to_string', lambda template, context: context['product']['name']), \
+                mock.patch.object(views, 'render', lambda request, template, context: context):
+            context = views.product_detail(request, 'deposit', 'WR0001B')
+        name = product_detail_index.get('deposit', 'WR0001B')['name']
+        self.assertEqual((context['product_name'], context['detail_html']), (name, name))
+
+
+class RecommenderBenchmarkTests(TestCase):
+    def test_synthetic_catalog_fills_every_category(self):
+        from .benchmark import write_synthetic_catalog
+        from .matching import HighPerformanceFinancialRecommender
+
+        with tempfile.TemporaryDirectory() as data_dir:
+            write_synthetic_catalog(data_dir, 200)
+            recommender = HighPerformanceFinancialRecommender(snapshot_path=None, data_dir=data_dir)
+        for category in CATEGORY_CODES:
+            self.assertGreater(recommender.catalog.category_size(category), 0)
+
+    def test_report_shape(self):
+        from .benchmark import run_benchmark
+
+        with tempfile.TemporaryDirectory() as work_dir:
+            report = run_benchmark([100], 10, work_dir, threads=2)
+        result = report['results'][0]
+        self.assertEqual(
+            sorted(result['scenarios']),
+            ['cold_2_threads', 'cold_single', 'warm_2_threads', 'warm_single'],
+        )
+        for summary in result['scenarios'].values():
+            self.assertEqual(summary['requests'], 10)
+            self.assertLessEqual(summary['p50_ms'], summary['p99_ms'])
+        self.assertGreater(result['peak_rss_mb'], 0)
+        json.dumps(report)
+
+    def test_parse_benchmark_shares_free_form_queries(self):
+        from .benchmark import FREE_FORM_QUERIES
+        from .management.commands import benchmark_parse_input
+
+        self.assertIs(benchmark_parse_input.FREE_FORM_QUERIES, FREE_FORM_QUERIES)
+
+
+class _FakeMultiLabelModel:
+    """predict_proba 호출 횟수/배치 크기를 기록하는 멀티라벨 모델 대역"""
+
+    feature_names_in_ = np.array(DEFAULT_FEATURE_ORDER)
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def predict_proba(self, batch):
+        self.batch_sizes.append(len(batch))
+        ages = np.asarray(batch['연령대분류'], dtype=np.float64)
+        return [np.column_stack([1 - ages / 10, ages / 10]) for _ in TARGET_ORDER]
+
+
+class ModelArtifactTests(TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, 'model.joblib')
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_loads_once_on_first_use_with_memory_mapping(self):
+        import joblib
+
+        joblib.dump({'weights': np.arange(100000, dtype=np.float64)}, self.path)
+        artifact = ModelArtifact(self.path)
+        self.assertFalse(artifact.is_loaded)
+
+        model = artifact.get()
+        self.assertIsInstance(model['weights'], np.memmap)
+        self.assertIs(artifact.get(), model)
+        self.assertIsNotNone(artifact.stats()['load_ms'])
+
+    def test_shared_per_path(self):
+        self.assertIs(get_model_artifact(self.path), get_model_artifact(self.path))
+
+    def test_missing_file_disables_predictions_without_loading_eagerly(self):
+        artifact = ModelArtifact(self.path)
+        predictor = HoldingProbabilityPredictor(artifact)
+        self.assertFalse(artifact.is_loaded)
+        self.assertEqual(predictor.predict_many([{}]), [None])
+        self.assertTrue(artifact.is_loaded)
+        self.assertEqual(artifact.stats()['error'], 'FileNotFoundError')
+
+
+class HoldingProbabilityPredictorTests(TestCase):
+    def test_predict_many_batches_and_memoizes(self):
+        model = _FakeMultiLabelModel()
+        predictor = HoldingProbabilityPredictor(model)
+        profiles = [{'연령대분류': 1}, {'연령대분류': 3}, {'연령대분류': 1}]
+
+        first = predictor.predict_many(profiles)
+        self.assertEqual(model.batch_sizes, [2])
+        self.assertEqual(first[0]['saving'], 0.1)
+        self.assertEqual(first[1]['stocks'], 0.3)
+
+        predictor.predict_many(profiles)
+        self.assertEqual(model.batch_sizes, [2])
+
+    def test_profile_features_use_training_data_medians(self):
+        from django.conf import settings
+
+        csv_path = settings.BASE_DIR.parent.parent / '2.예측AI' / '5.DL' / 'cleaned_scf_data.csv'
+        if not csv_path.exists():
+            self.skipTest('학습 데이터(cleaned_scf_data.csv) 없음')
+
+        medians = training_group_medians(csv_path)
+        for feature, (group_feature, table) in GROUP_MEDIAN_TABLES.items():
+            self.assertEqual(sorted(table), sorted(medians[feature]))
+            for group, median in medians[feature].items():
+                self.assertAlmostEqual(table[group], median, places=1)
+                features = profile_features({group_feature: group})
+                self.assertEqual(features[feature], table[group])
+
+        # SCF 직업 코드 2(자영업자)는 1(임금근로자)보다 급여소득 중앙값이 낮음
+        self.assertLess(medians['급여소득'][2], medians['급여소득'][1])
+
+    def test_unavailable_without_model(self):
+        predictor = HoldingProbabilityPredictor(None)
+        self.assertFalse(predictor.available)
+        self.assertEqual(predictor.predict_many([{}, {}]), [None, None])
+
+    def test_holding_probabilities_raise_category_scores(self):
+        from .registry import get_recommender
+
+        engine = get_recommender().scoring_engine
+        base = engine.score_many([(30, 300, 'general', False)])[0]
+        boosted = engine.score_many([(30, 300, 'general', False, {'funds': 1.0})])[0]
+        funds = engine.category_code == CATEGORY_CODES['funds']
+        self.assertTrue(np.all(boosted[funds] == np.minimum(base[funds] + MODEL_BONUS_WEIGHT, 100)))
+        self.assertTrue(np.all(boosted[~funds] == base[~funds]))
+
+    def test_holding_probabilities_reorder_mixed_recommendations(self):
+        from .registry import get_recommender
+
+        recommender = get_recommender()
+        catalog = recommender.catalog
+        profile = {'age': 30, 'monthly_income': 300, 'purpose': 'general'}
+
+        def recommend(holding_probabilities):
+            result = recommender.recommend(dict(profile, holding_probabilities=holding_probabilities), trace=False)
+            return [product['product_id'] for product in result['products']]
+
+        funds_first = recommend({'funds': 1.0, 'saving': 0.0, 'deposit': 0.0, 'mmf': 0.0})
+        saving_first = recommend({'funds': 0.0, 'saving': 1.0, 'deposit': 0.0, 'mmf': 0.0})
+        self.assertNotEqual(funds_first, saving_first)
+
+        fund_ids = {catalog.product(index)['product_id'] for index in catalog.category_indices('funds')}
+        saving_ids = {catalog.product(index)['product_id'] for index in catalog.category_indices('saving')}
+        self.assertTrue(set(funds_first) <= fund_ids)
+        self.assertTrue(set(saving_first) <= saving_ids)
+
+    def test_single_category_purpose_ignores_model_bonus(self):
+        from .registry import get_recommender
+
+        recommender = get_recommender()
+        profile = {'age': 30, 'monthly_income': 300, 'purpose': 'saving'}
+        plain = recommender.recommend(profile, trace=False)['products']
+        boosted = recommender.recommend(dict(profile, holding_probabilities={'saving': 1.0}), trace=False)['products']
+        self.assertEqual(
+            [(product['product_id'], product['score']) for product in plain],
+            [(product['product_id'], product['score']) for product in boosted],
+        )
+
+    def test_quotas_follow_holding_probabilities(self):
+        from .matching import PURPOSE_CATEGORY_QUOTAS, purpose_category_quotas
+
+        self.assertEqual(purpose_category_quotas('general', None), PURPOSE_CATEGORY_QUOTAS['general'])
+        self.assertEqual(purpose_category_quotas('saving', {'saving': 1.0}), PURPOSE_CATEGORY_QUOTAS['saving'])
+        quotas = dict(purpose_category_quotas('investment', {'funds': 0.1, 'stocks': 0.9, 'mmf': 0.0}))
+        self.assertEqual(quotas, {'funds': 2, 'stocks': 7, 'mmf': 1})
+        self.assertEqual(sum(quotas.values()), sum(quota for _, quota in PURPOSE_CATEGORY_QUOTAS['investment']))
+
+    def test_holding_probabilities_decide_preferred_category(self):
+        from types import SimpleNamespace
+
+        from .views import analyze_user_preference
+
+        # 규칙 점수: fund 8, mmf 7 (35세 이하, 안정 선호, 일부 저축)
+        profile = SimpleNamespace(금융위험태도=0, 저축여부=2, 연령대분류=2)
+        self.assertEqual(analyze_user_preference(profile), 'fund')
+        self.assertEqual(analyze_user_preference(profile, {'funds': 0.1, 'mmf': 0.9}), 'mmf')
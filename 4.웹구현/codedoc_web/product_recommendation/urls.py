@@ -5,7 +5,11 @@ app_name = 'product_recommendation'
 
 urlpatterns = [
     path('list/', views.product_list, name='product_list'),           # 상품소개
+    path('list/<str:tab>/', views.product_list_tab, name='product_list_tab'),  # 상품소개 탭 한 페이지 (지연 로드)
     path('recommend/', views.product_recommend, name='product_recommend'),  # 내게맞는상품찾기
     path('recommend/ai/', views.product_recommend_ai, name='product_recommend_ai'),  # AI 추천 페이지
     path('detail/<str:product_type>/<str:product_id>/', views.product_detail, name='product_detail'),  # 상품상세
+    path('api/recommend/', views.recommend_api, name='recommend_api'),  # 추천 JSON API
+    path('api/search/', views.product_search_api, name='product_search_api'),  # 상품 검색 JSON API
+    path('metrics/', views.recommender_metrics_view, name='recommender_metrics'),  # 추천 단계별 지연 시간
 ]
\ No newline at end of file
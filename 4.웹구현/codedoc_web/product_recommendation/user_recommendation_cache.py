@@ -0,0 +1,94 @@
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .recommendation_cache import RecommendationCache
+
+
+class UserRecommendationCache:
+    """
+    사용자별 상품 목록 추천('전체' + 카테고리별) 캐시
+    - 키: 사용자 id + 프로필 updated_at + 카탈로그 버전
+      → 프로필이 저장되거나(챗봇이 금융위험태도를 갱신하는 경우 등) 상품 데이터가 바뀌면 자동으로 새 키
+    - 저장소는 RecommendationCache (프로세스 내 LRU + 'recommendations' 공유 캐시)라 워커 간에도 재사용
+    - refresh_async: 프로필 저장 직후 백그라운드 스레드에서 새 키의 결과를 미리 계산
+      같은 사용자의 갱신이 대기 중이면 마지막 프로필로 한 번만 계산
+    """
+
+    def __init__(self, alias='recommendations', timeout=24 * 60 * 60, max_local_entries=1024, max_workers=1):
+        self.store = RecommendationCache(alias=alias, timeout=timeout, max_local_entries=max_local_entries)
+        self.max_workers = max_workers
+        self._executor = None
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    @staticmethod
+    def make_key(user_id, updated_at, catalog_version):
+        raw = repr((user_id, updated_at.isoformat() if updated_at else None, catalog_version))
+        return 'user-recommend:' + hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+    def get(self, profile, catalog_version):
+        """캐시된 (전체 추천, 카테고리별 추천) - 없으면 None"""
+        cached = self.store.get(self.make_key(profile.user_id, profile.updated_at, catalog_version))
+        return tuple(cached) if cached is not None else None
+
+    def set(self, profile, catalog_version, value, compute_ms=0.0):
+        self.store.set(self.make_key(profile.user_id, profile.updated_at, catalog_version), value, compute_ms)
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix='user-recommendations'
+                )
+            return self._executor
+
+    def refresh_async(self, profile, compute):
+        """
+        compute(profile)를 백그라운드에서 실행 (compute가 결과를 set으로 저장)
+        반환: 새 작업을 제출했으면 Future, 같은 사용자 작업이 이미 대기 중이면 None
+        """
+        with self._lock:
+            already_pending = profile.user_id in self._pending
+            self._pending[profile.user_id] = profile
+        if already_pending:
+            return None
+        return self._get_executor().submit(self._refresh, profile.user_id, compute)
+
+    def _refresh(self, user_id, compute):
+        with self._lock:
+            profile = self._pending.pop(user_id, None)
+        if profile is None:
+            return
+        try:
+            compute(profile)
+            with self._lock:
+                self.refreshes += 1
+        except Exception as e:
+            with self._lock:
+                self.refresh_errors += 1
+            print(f"사용자 {user_id} 추천 백그라운드 갱신 실패: {e}")
+
+    def stats(self):
+        with self._lock:
+            refresh_stats = {
+                'refreshes': self.refreshes,
+                'refresh_errors': self.refresh_errors,
+                'pending_refreshes': len(self._pending),
+            }
+        return dict(self.store.stats(), **refresh_stats)
+
+    def clear(self):
+        self.store.clear()
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+# 전역 사용자 추천 캐시 인스턴스
+user_recommendation_cache = UserRecommendationCache()
@@ -1,8 +1,93 @@
 # product_recommendation/utils.py
 import json
 import os
+import threading
 from django.conf import settings
 
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+
+class ProductFileCache:
+    """
+    파일별 변환 결과 캐시
+    - (파일 경로, mtime_ns, 크기)가 같으면 json.load/변환 없이 저장된 결과 사용
+    - 수집기가 파일을 다시 쓰면 mtime/크기가 바뀌어 다음 조회 때 자동으로 다시 로드
+    - 저장된 상품 dict는 튜플로 보관하고, 조회 시 dict 복사본 리스트를 반환 (값이 모두 스칼라라 얕은 복사로 충분)
+      → 뷰에서 리스트/상품 dict를 수정해도 캐시는 바뀌지 않음
+    """
+
+    def __init__(self, data_dir=DATA_DIR):
+        self.data_dir = data_dir
+        self._entries = {}
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'loads': 0, 'invalidations': 0, 'missing': 0}
+
+    def _signature(self, path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def get(self, filename, processor):
+        """
+        filename을 processor(원본 JSON)로 변환한 상품 리스트 (복사본)
+        파일이 없거나 JSON 오류면 빈 리스트 (다음 조회 때 다시 시도)
+        """
+        path = os.path.join(self.data_dir, filename)
+        key = (path, processor)
+        with self._lock:
+            signature = self._signature(path)
+            entry = self._entries.get(key)
+            if signature is None:
+                self.stats['missing'] += 1
+                self._entries.pop(key, None)
+                print(f"파일을 찾을 수 없습니다: {filename} (경로: {path})")
+                return []
+
+            if entry is not None and entry['signature'] == signature:
+                self.stats['hits'] += 1
+            else:
+                if entry is not None:
+                    self.stats['invalidations'] += 1
+                data = ProductDataLoader.load_json_file(filename, data_dir=self.data_dir)
+                if not data:
+                    self._entries.pop(key, None)
+                    return []
+                entry = {'signature': signature, 'products': tuple(processor(data))}
+                self._entries[key] = entry
+                self.stats['loads'] += 1
+            products = entry['products']
+
+        return [dict(product) for product in products]
+
+    def stats_snapshot(self):
+        """조회/로드 통계 복사본 (메트릭 엔드포인트용)"""
+        with self._lock:
+            return dict(self.stats)
+
+    def entries(self):
+        """캐시된 파일별 상태 (파일명, mtime_ns, 크기, 상품 수)"""
+        with self._lock:
+            return [
+                {
+                    'file': os.path.basename(path),
+                    'mtime_ns': entry['signature'][0],
+                    'size': entry['signature'][1],
+                    'products': len(entry['products']),
+                }
+                for (path, _), entry in self._entries.items()
+            ]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+# 전역 파일 캐시 인스턴스
+product_file_cache = ProductFileCache()
+
 class ProductDataLoader:
     """
     파일 기반 상품 데이터 로더
@@ -10,12 +95,11 @@ class ProductDataLoader:
     """
     
     @staticmethod
-    def load_json_file(filename):
+    def load_json_file(filename, data_dir=DATA_DIR):
         """JSON 파일을 로드하는 헬퍼 함수"""
         try:
             # product_recommendation 앱의 data 폴더에서 파일 로드
-            current_dir = os.path.dirname(os.path.abspath(__file__))
-            file_path = os.path.join(current_dir, 'data', filename)
+            file_path = os.path.join(data_dir, filename)
             print(f"파일 로드 시도: {file_path}")
             with open(file_path, 'r', encoding='utf-8') as file:
                 return json.load(file)
@@ -43,6 +127,7 @@ class ProductDataLoader:
             # 기본 정보
             processed_product = {
                 'fin_prdt_cd': product.get('fin_prdt_cd'),
+                'fin_co_no': product.get('fin_co_no'),
                 'fin_prdt_nm': product.get('fin_prdt_nm'),
                 'kor_co_nm': product.get('kor_co_nm'),
                 'join_way': product.get('join_way'),
@@ -141,6 +226,7 @@ class ProductDataLoader:
             # 기본 정보
             processed_product = {
                 'fin_prdt_cd': product.get('fin_prdt_cd'),
+                'fin_co_no': product.get('fin_co_no'),
                 'fin_prdt_nm': product.get('fin_prdt_nm'),
                 'kor_co_nm': product.get('kor_co_nm'),
                 'join_way': product.get('join_way'),
@@ -180,45 +266,22 @@ class ProductDataLoader:
     @classmethod
     def get_all_file_based_products(cls):
         """모든 파일 기반 상품 데이터를 로드하고 통합"""
-        all_products = []
-        
-        # 펀드 데이터 로드
-        fund_data = cls.load_json_file('funds.json')
-        if fund_data:
-            funds = cls.process_fund_data(fund_data)
-            all_products.extend(funds)
-        
-        # 주식 데이터 로드
-        stock_data = cls.load_json_file('stocks.json')
-        if stock_data:
-            stocks = cls.process_stock_data(stock_data)
-            all_products.extend(stocks)
-        
-        # 머니마켓펀드 데이터 로드
-        mmf_data = cls.load_json_file('money_market_funds.json')
-        if mmf_data:
-            mmf_products = cls.process_mmf_data(mmf_data)
-            all_products.extend(mmf_products)
-        
-        return all_products
+        return cls.get_funds() + cls.get_stocks() + cls.get_mmf_products()
 
     @classmethod
     def get_funds(cls):
-        """펀드 데이터만 반환"""
-        fund_data = cls.load_json_file('funds.json')
-        return cls.process_fund_data(fund_data) if fund_data else []
+        """펀드 데이터만 반환 (파일이 바뀌지 않았으면 캐시된 변환 결과의 복사본)"""
+        return product_file_cache.get('funds.json', cls.process_fund_data)
 
     @classmethod
     def get_stocks(cls):
         """주식 데이터만 반환"""
-        stock_data = cls.load_json_file('stocks.json')
-        return cls.process_stock_data(stock_data) if stock_data else []
+        return product_file_cache.get('stocks.json', cls.process_stock_data)
 
     @classmethod
     def get_mmf_products(cls):
         """머니마켓펀드 데이터만 반환"""
-        mmf_data = cls.load_json_file('money_market_funds.json')
-        return cls.process_mmf_data(mmf_data) if mmf_data else []
+        return product_file_cache.get('money_market_funds.json', cls.process_mmf_data)
 
 
 # 페이지네이션을 위한 헬퍼 클래스
@@ -239,4 +302,22 @@ class ProductPaginator:
         except EmptyPage:
             paginated_products = paginator.page(paginator.num_pages)
 
-        return paginated_products, paginator.count  # 항상 Page 객체 + 총 개수 반환
\ No newline at end of file
+        return paginated_products, paginator.count  # 항상 Page 객체 + 총 개수 반환
+
+    @staticmethod
+    def paginate_queryset(queryset, page_number, per_page=9):
+        """
+        DB 상품 쿼리셋 페이지네이션 (COUNT + LIMIT/OFFSET 쿼리로 해당 페이지 행만 읽음)
+        페이지 항목은 목록 템플릿에서 쓰는 상품 dict(display)로 변환
+        """
+        paginator = Paginator(queryset.only('display'), per_page)
+
+        try:
+            paginated_products = paginator.page(page_number)
+        except PageNotAnInteger:
+            paginated_products = paginator.page(1)
+        except EmptyPage:
+            paginated_products = paginator.page(paginator.num_pages)
+
+        paginated_products.object_list = [product.display for product in paginated_products.object_list]
+        return paginated_products, paginator.count
@@ -2,16 +2,36 @@
 from django.shortcuts import render
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 from django.conf import settings
-from .utils import ProductDataLoader, ProductPaginator
-from .category_recommendations import get_category_recommendations_for_user, get_default_products_by_category
+from .utils import ProductDataLoader, ProductPaginator, product_file_cache
+from .category_recommendations import (
+    CATEGORY_INPUTS, build_base_user_input, build_category_inputs, convert_category_products,
+    with_holding_probabilities,
+)
 import requests
 import os
+import time
 import json
 from django.shortcuts import render
-from django.http import JsonResponse
+from django.http import Http404, HttpResponse, HttpResponseForbidden, JsonResponse
+from django.template.loader import render_to_string
 from django.core.paginator import Paginator
 from .financial_item_list import FinancialProductAPI
+from .fss_cache import fss_catalog_cache
+from .models import FinancialProduct
+from .product_detail_index import product_detail_index
+from .product_search import search_available, search_products
+from .product_store import STORE_FILES, store_has_products
+from .registry import get_recommender, recommender_registry
+from .metrics import recommender_metrics
+from .model_loader import model_artifact_stats
+from .recommendation_table import recommendation_table
+from .recommend_executor import ExecutorBusy, recommendation_executor
+from .user_recommendation_cache import user_recommendation_cache
+from .input_parser import GENDER_KEYWORDS
+from .matching import PROFILE_KEYS, PURPOSE_CATEGORY_QUOTAS
+from .scoring import CATEGORY_CODES
 from django.contrib.auth.decorators import login_required
+from django.views.decorators.http import require_http_methods
 import json
 import joblib
 import pandas as pd
@@ -64,152 +84,151 @@ def update_financial_risk_attitude(user, chat_message):
     return 0  # 패턴 미감지
 
 
+# 상품 목록 탭: 탭 → (상품 종류, 페이지 파라미터, 페이지 컨텍스트 키, 총 개수 키, 페이지 범위 키, 추천 컨텍스트 키)
+LISTING_TABS = {
+    'all': (None, 'page', 'all_products', 'all_total', 'all_products_page_range', 'recommended_products'),
+    'deposit': ('deposit', 'deposits_page', 'deposits', 'deposits_total', 'deposits_page_range', 'recommended_deposit'),
+    'saving': ('saving', 'savings_page', 'savings', 'savings_total', 'savings_page_range', 'recommended_saving'),
+    'fund': ('fund', 'funds_page', 'funds', 'funds_total', 'funds_page_range', 'recommended_fund'),
+    'stock': ('stock', 'stocks_page', 'stocks', 'stocks_total', 'stocks_page_range', 'recommended_stock'),
+    'mmf': ('mmf', 'mmf_page', 'mmf_products', 'mmf_total', 'mmf_page_range', 'recommended_mmf'),
+}
+
+
 def product_list(request):
     """
     상품 목록 페이지
-    기존 API 데이터(예금/적금) + 새로운 파일 기반 데이터(펀드/주식/MMF) 통합
-    + 카테고리별 사용자 맞춤 AI 추천 기능
+    보이는 탭(?category=, 기본 '전체')의 현재 페이지만 만들고,
+    나머지 탭은 product_list.js가 선택될 때 product_list_tab에서 받아옴
     """
-    context = {}
+    tab = request.GET.get('category', 'all')
+    if tab not in LISTING_TABS:
+        tab = 'all'
     
     try:
-        # 1. 로그인한 사용자에게 AI 추천 상품 제공
-        if request.user.is_authenticated and hasattr(request.user, 'profile'):
-            try:
-                # 전체 카테고리 추천
-                recommended_products = get_ai_recommendations_for_user(request.user)
-                if recommended_products:
-                    context['recommended_products'] = recommended_products
-                    print(f"사용자 {request.user.username}에게 AI 추천 상품 {len(recommended_products)}개 제공")
-                
-                # 카테고리별 추천 상품 생성
-                category_recommendations = get_category_recommendations_for_user(request.user)
-                context.update(category_recommendations)
-                
-            except Exception as e:
-                print(f"AI 추천 시스템 오류: {e}")
-                # 오류가 발생해도 전체 페이지는 정상 로드
-        
-        # 2. 기존 API 데이터 (예금, 적금) - 실제 API 호출
-        deposits = get_deposit_products()
-        savings = get_saving_products()
-        
-        # 3. 새로운 파일 기반 데이터 로드
-        print("파일 기반 데이터 로딩 시작...")
-        funds = ProductDataLoader.get_funds()
-        stocks = ProductDataLoader.get_stocks()
-        mmf_products = ProductDataLoader.get_mmf_products()
-        
-        print(f"로드된 데이터: 예금 {len(deposits)}개, 적금 {len(savings)}개, 펀드 {len(funds)}개, 주식 {len(stocks)}개, MMF {len(mmf_products)}개")
-        
-        # 4. 전체 상품 통합 (API + 파일 기반)
-        all_products_list = []
-        
-        # API 데이터를 통합 형식으로 변환
-        for deposit in deposits:
-            deposit['product_type'] = 'deposit'
-            deposit['product_type_name'] = '예금'
-            all_products_list.append(deposit)
-        
-        for saving in savings:
-            saving['product_type'] = 'saving' 
-            saving['product_type_name'] = '적금'
-            all_products_list.append(saving)
-        
-        # 파일 기반 데이터 추가 (이미 변환됨)
-        all_products_list.extend(funds)
-        all_products_list.extend(stocks)
-        all_products_list.extend(mmf_products)
-        
-        print(f"전체 통합 상품 수: {len(all_products_list)}개")
-        
-        # 5. 페이지네이션 처리 - 이 부분을 추가해야 합니다
-        page = request.GET.get('page', 1)
-        deposits_page = request.GET.get('deposits_page', 1)
-        savings_page = request.GET.get('savings_page', 1)
-        funds_page = request.GET.get('funds_page', 1)
-        stocks_page = request.GET.get('stocks_page', 1)
-        mmf_page = request.GET.get('mmf_page', 1)
-        
-        # 페이지네이션 범위 계산 함수
-        def calculate_page_range(page_obj):
-            current_page = page_obj.number
-            total_pages = page_obj.paginator.num_pages
-            page_group = ((current_page - 1) // 5) * 5
-            start_page = max(1, page_group + 1)
-            end_page = min(total_pages, page_group + 5)
-            return range(start_page, end_page + 1)
-        
-        # 전체 상품 페이지네이션
-        all_products_paginated, all_total = ProductPaginator.paginate_products(
-            all_products_list, page, per_page=9
-        )
-        
-        # 개별 카테고리 페이지네이션
-        deposits_paginated, deposits_total = ProductPaginator.paginate_products(
-            deposits, deposits_page, per_page=9
-        )
-        
-        savings_paginated, savings_total = ProductPaginator.paginate_products(
-            savings, savings_page, per_page=9
-        )
-        
-        funds_paginated, funds_total = ProductPaginator.paginate_products(
-            funds, funds_page, per_page=9
-        )
-        
-        stocks_paginated, stocks_total = ProductPaginator.paginate_products(
-            stocks, stocks_page, per_page=9
-        )
-        
-        mmf_paginated, mmf_total = ProductPaginator.paginate_products(
-            mmf_products, mmf_page, per_page=9
-        )
-        
-        # 6. 컨텍스트 구성
-        context.update({
-            # 전체 상품
-            'all_products': all_products_paginated,
-            'all_total': all_total,
-            'all_products_page_range': calculate_page_range(all_products_paginated),
-            
-            # 기존 API 상품 (예금, 적금)
-            'deposits': deposits_paginated,
-            'deposits_total': deposits_total,
-            'deposits_page_range': calculate_page_range(deposits_paginated),
-            
-            'savings': savings_paginated,
-            'savings_total': savings_total,
-            'savings_page_range': calculate_page_range(savings_paginated),
-            
-            # 새로운 파일 기반 상품 (펀드, 주식, MMF)
-            'funds': funds_paginated,
-            'funds_total': funds_total,
-            'funds_page_range': calculate_page_range(funds_paginated),
-            
-            'stocks': stocks_paginated,
-            'stocks_total': stocks_total,
-            'stocks_page_range': calculate_page_range(stocks_paginated),
-            
-            'mmf_products': mmf_paginated,
-            'mmf_total': mmf_total,
-            'mmf_page_range': calculate_page_range(mmf_paginated),
-        })
-        
-        print(f"컨텍스트 구성 완료: 전체 {all_total}개 상품")
-        
+        context = build_tab_context(request, tab)
     except Exception as e:
-        context['error'] = f'상품 정보를 불러오는 중 오류가 발생했습니다: {str(e)}'
+        context = {'error': f'상품 정보를 불러오는 중 오류가 발생했습니다: {str(e)}'}
         print(f"Product list error: {e}")
         import traceback
         traceback.print_exc()
     
+    context['active_tab'] = tab
     return render(request, 'product_recommendation/product_list.html', context)
 
 
+def product_list_tab(request, tab):
+    """
+    상품 목록 탭 한 페이지 (지연 로드용)
+    기본은 탭 HTML 조각, ?format=json이면 상품/추천/페이지 정보 JSON
+    페이지 번호는 ?page= (또는 탭별 페이지 파라미터)
+    """
+    if tab not in LISTING_TABS:
+        raise Http404('알 수 없는 상품 탭입니다')
+    
+    context = build_tab_context(request, tab)
+    _, _, page_key, total_key, _, recommendation_key = LISTING_TABS[tab]
+    
+    if request.GET.get('format') == 'json':
+        page_obj = context[page_key]
+        return JsonResponse({
+            'tab': tab,
+            'page': page_obj.number,
+            'num_pages': page_obj.paginator.num_pages,
+            'total': context[total_key],
+            'has_previous': page_obj.has_previous(),
+            'has_next': page_obj.has_next(),
+            'products': list(page_obj.object_list),
+            'recommended': context.get(recommendation_key) or [],
+        }, json_dumps_params={'ensure_ascii': False})
+    
+    return render(request, f'product_recommendation/partials/product_tab_{tab}.html', context)
+
+
+def listing_page_range(page_obj):
+    """현재 페이지가 속한 5개 단위 페이지 번호 범위"""
+    current_page = page_obj.number
+    total_pages = page_obj.paginator.num_pages
+    page_group = ((current_page - 1) // 5) * 5
+    start_page = max(1, page_group + 1)
+    end_page = min(total_pages, page_group + 5)
+    return range(start_page, end_page + 1)
+
+
+def listing_filters(request):
+    """
+    상품 DB 목록 선택 필터: ?sort=rate|rate_asc|name|company|risk, ?company=금융회사명, ?min_rate=, ?max_risk=
+    """
+    def to_number(name, cast):
+        try:
+            return cast(request.GET[name]) if request.GET.get(name) else None
+        except ValueError:
+            return None
+    
+    return {
+        'company': request.GET.get('company') or None,
+        'min_rate': to_number('min_rate', float),
+        'max_risk': to_number('max_risk', int),
+        'sort': request.GET.get('sort', 'default'),
+    }
+
+
+def file_tab_products(tab):
+    """상품 DB가 비어 있을 때 탭 상품 리스트 (FSS 응답 캐시 + 파일 기반 데이터)"""
+    loaders = {
+        'deposit': lambda: [
+            dict(product, product_type='deposit', product_type_name='예금') for product in get_deposit_products()
+        ],
+        'saving': lambda: [
+            dict(product, product_type='saving', product_type_name='적금') for product in get_saving_products()
+        ],
+        'fund': ProductDataLoader.get_funds,
+        'stock': ProductDataLoader.get_stocks,
+        'mmf': ProductDataLoader.get_mmf_products,
+    }
+    if tab == 'all':
+        return [product for category in ('deposit', 'saving', 'fund', 'stock', 'mmf') for product in loaders[category]()]
+    return loaders[tab]()
+
+
+def build_tab_context(request, tab):
+    """
+    탭 하나의 현재 페이지 컨텍스트 (기존 product_list 컨텍스트와 같은 키)
+    상품 DB가 적재되어 있으면 색인 쿼리로 해당 페이지만 조회, 아니면 캐시된 API/파일 데이터를 페이지네이션
+    로그인 사용자는 해당 탭의 AI 추천 상품도 포함
+    """
+    category, page_param, page_key, total_key, range_key, recommendation_key = LISTING_TABS[tab]
+    page_number = request.GET.get(page_param) or request.GET.get('page') or 1
+    
+    if store_has_products():
+        queryset = FinancialProduct.objects.listing(category=category, **listing_filters(request))
+        page_obj, total = ProductPaginator.paginate_queryset(queryset, page_number, per_page=9)
+    else:
+        page_obj, total = ProductPaginator.paginate_products(file_tab_products(tab), page_number, per_page=9)
+    
+    context = {
+        page_key: page_obj,
+        total_key: total,
+        range_key: listing_page_range(page_obj),
+    }
+    
+    if request.user.is_authenticated and hasattr(request.user, 'profile'):
+        try:
+            # 전체/카테고리별 추천은 한 번의 배치 추천(또는 사전 계산 테이블 조회)으로 만들어짐
+            recommended_products, category_recommendations = get_user_recommendations(request.user)
+            recommendations = dict(category_recommendations, recommended_products=recommended_products)
+            if recommendations.get(recommendation_key):
+                context[recommendation_key] = recommendations[recommendation_key]
+        except Exception as e:
+            print(f"AI 추천 시스템 오류: {e}")
+    
+    return context
+
+
 def get_deposit_products():
     """
-    예금 상품 API 호출 (환경변수에서 FSS_API_KEY 가져오기)
+    예금 상품 목록 (환경변수에서 FSS_API_KEY 가져오기)
+    FSS API 응답은 fss_catalog_cache에 보관 (stale-while-revalidate, 디스크 유지)
     """
     try:
         # 환경변수에서 API 키 가져오기
@@ -219,24 +238,13 @@ def get_deposit_products():
             print("FSS_API_KEY가 설정되지 않았습니다. 테스트 데이터를 반환합니다.")
             return get_test_deposit_data()
         
-        print("예금 상품 API 호출 중...")
-        url = "http://finlife.fss.or.kr/finlifeapi/depositProductsSearch.json"
-        params = {
-            'auth': api_key,
-            'topFinGrpNo': '020000',
-            'pageNo': 1
-        }
-        
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
+        # 캐시된 마지막 정상 응답을 바로 사용하고, TTL이 지났으면 백그라운드에서 갱신
+        products = fss_catalog_cache.get('deposit', api_key)
+        if products:
+            return products
         
-        data = response.json()
-        if data.get('result') and data['result'].get('baseList'):
-            print(f"예금 상품 API 성공: {len(data['result']['baseList'])}개 상품")
-            return data['result']['baseList']
-        else:
-            print("예금 상품 API 응답에 데이터가 없습니다.")
-            return get_test_deposit_data()
+        print("예금 상품 API 응답에 데이터가 없습니다.")
+        return get_test_deposit_data()
         
     except Exception as e:
         print(f"예금 상품 API 오류: {e}")
@@ -245,7 +253,8 @@ def get_deposit_products():
 
 def get_saving_products():
     """
-    적금 상품 API 호출 (환경변수에서 FSS_API_KEY 가져오기)
+    적금 상품 목록 (환경변수에서 FSS_API_KEY 가져오기)
+    FSS API 응답은 fss_catalog_cache에 보관 (stale-while-revalidate, 디스크 유지)
     """
     try:
         # 환경변수에서 API 키 가져오기
@@ -255,24 +264,13 @@ def get_saving_products():
             print("FSS_API_KEY가 설정되지 않았습니다. 테스트 데이터를 반환합니다.")
             return get_test_saving_data()
         
-        print("적금 상품 API 호출 중...")
-        url = "http://finlife.fss.or.kr/finlifeapi/savingProductsSearch.json"
-        params = {
-            'auth': api_key,
-            'topFinGrpNo': '020000',
-            'pageNo': 1
-        }
-        
-        response = requests.get(url, params=params, timeout=10)
-        response.raise_for_status()
+        # 캐시된 마지막 정상 응답을 바로 사용하고, TTL이 지났으면 백그라운드에서 갱신
+        products = fss_catalog_cache.get('saving', api_key)
+        if products:
+            return products
         
-        data = response.json()
-        if data.get('result') and data['result'].get('baseList'):
-            print(f"적금 상품 API 성공: {len(data['result']['baseList'])}개 상품")
-            return data['result']['baseList']
-        else:
-            print("적금 상품 API 응답에 데이터가 없습니다.")
-            return get_test_saving_data()
+        print("적금 상품 API 응답에 데이터가 없습니다.")
+        return get_test_saving_data()
         
     except Exception as e:
         print(f"적금 상품 API 오류: {e}")
@@ -327,12 +325,41 @@ def get_test_saving_data():
     ]
 
 
-def product_detail(request, product_id):
+def product_detail(request, product_type, product_id):
     """
-    상품 상세 페이지 (추후 구현)
+    상품 상세 페이지 (product_detail_index에서 종류 + 상품 코드로 O(1) 조회)
+    같은 상품 코드가 여러 금융회사에 있으면 ?company=금융회사 코드로 구분
+    ?format=json이면 상세 항목(옵션 행, 비슷한 상품 포함) JSON
+    상세 HTML 조각은 카탈로그 버전이 바뀔 때까지 색인에 캐시 (로그인 상태 등 페이지 공통 부분은 매번 렌더링)
     """
+    if product_type not in STORE_FILES:
+        raise Http404('알 수 없는 상품 종류입니다')
+    company_code = request.GET.get('company') or None
+    
+    if request.GET.get('format') == 'json':
+        product = product_detail_index.get(product_type, product_id, company_code)
+        if product is None:
+            raise Http404('상품을 찾을 수 없습니다')
+        return JsonResponse(
+            dict(product, catalog_version=product_detail_index.version), json_dumps_params={'ensure_ascii': False}
+        )
+    
+    # 이름과 HTML 조각은 같은 색인 항목에서 가져옴 (두 번 조회하면 그 사이 데이터 파일이 바뀔 수 있음)
+    rendered = product_detail_index.render(
+        product_type,
+        product_id,
+        lambda product: render_to_string('product_recommendation/partials/product_detail_body.html', {'product': product}),
+        company_code,
+    )
+    if rendered is None:
+        raise Http404('상품을 찾을 수 없습니다')
+    summary, detail_html = rendered
+    
     context = {
+        'product_type': product_type,
         'product_id': product_id,
+        'product_name': summary['name'],
+        'detail_html': detail_html,
     }
     return render(request, 'product_recommendation/product_detail.html', context)
 
@@ -358,11 +385,8 @@ def product_recommend_ai(request):
                 print(f"AI 추천 시작: {user_input}")
                 start_time = time.time()
                 
-                # HighPerformanceFinancialRecommender 임포트 및 실행
-                from .matching import HighPerformanceFinancialRecommender
-                
-                # 추천 시스템 초기화 및 실행
-                recommender = HighPerformanceFinancialRecommender()
+                # 프로세스 공유 추천 시스템 사용 (서버 시작 시 로드됨)
+                recommender = get_recommender()
                 result = recommender.recommend(user_input, top_n=6)  # 6개 추천
                 
                 end_time = time.time()
@@ -424,6 +448,307 @@ def product_recommend_ai(request):
     return render(request, 'product_recommendation/product_recommend_ai.html', context)
 
 
+# 추천 API 입력 제한
+RECOMMEND_API_MAX_TOP_N = 20
+RECOMMEND_API_MAX_BATCH = 50
+NUMERIC_PROFILE_KEYS = ('age', 'monthly_income')
+# 구조화된 프로필의 선택 값 (자연어 파서/점수 엔진이 쓰는 값과 동일)
+PROFILE_CHOICES = {
+    'gender': tuple(gender for gender, _ in GENDER_KEYWORDS),
+    'purpose': tuple(PURPOSE_CATEGORY_QUOTAS),
+}
+
+
+def parse_recommend_api_input(user_input):
+    """
+    추천 API 입력 하나 검증 - 자연어 문자열 또는 구조화된 프로필 dict
+    잘못된 형식이면 ValueError (메시지는 400 응답 본문으로 사용)
+    """
+    if isinstance(user_input, str):
+        if not user_input.strip():
+            raise ValueError('빈 입력입니다')
+        return user_input
+    if not isinstance(user_input, dict):
+        raise ValueError('입력은 문자열 또는 프로필 객체여야 합니다')
+    
+    unknown_keys = set(user_input) - set(PROFILE_KEYS)
+    if unknown_keys:
+        raise ValueError(f"알 수 없는 프로필 항목: {', '.join(sorted(unknown_keys))}")
+    for key in NUMERIC_PROFILE_KEYS:
+        value = user_input.get(key)
+        if value is not None and (isinstance(value, bool) or not isinstance(value, (int, float))):
+            raise ValueError(f"{key}는 숫자여야 합니다")
+    for key, choices in PROFILE_CHOICES.items():
+        if user_input.get(key) is not None and user_input[key] not in choices:
+            raise ValueError(f"{key}는 {', '.join(choices)} 중 하나여야 합니다")
+    # 'false' 같은 문자열은 bool()로 참이 되므로 JSON true/false만 허용
+    if user_input.get('married') is not None and not isinstance(user_input['married'], bool):
+        raise ValueError('married는 true 또는 false여야 합니다')
+    
+    filters = user_input.get('filters')
+    if filters is not None:
+        if not isinstance(filters, dict):
+            raise ValueError('filters는 {속성: 값 또는 값 리스트} 객체여야 합니다')
+        for attribute, values in filters.items():
+            if isinstance(values, str):
+                continue
+            if not isinstance(values, list) or not all(isinstance(value, str) for value in values):
+                raise ValueError(f"filters.{attribute} 값은 문자열 또는 문자열 리스트여야 합니다")
+    
+    holding_probabilities = user_input.get('holding_probabilities')
+    if holding_probabilities is not None:
+        if not (
+            isinstance(holding_probabilities, dict)
+            and all(
+                isinstance(value, (int, float)) and not isinstance(value, bool)
+                for value in holding_probabilities.values()
+            )
+        ):
+            raise ValueError('holding_probabilities는 {상품군: 확률} 객체여야 합니다')
+        unknown_categories = set(holding_probabilities) - set(CATEGORY_CODES)
+        if unknown_categories:
+            raise ValueError(f"알 수 없는 상품군: {', '.join(sorted(unknown_categories))}")
+    return user_input
+
+
+def project_recommendation(result, fields):
+    """추천 결과의 상품 항목을 fields에 있는 키만 남긴 새 dict로 변환 (캐시된 결과는 수정하지 않음)"""
+    projected = {key: value for key, value in result.items() if key != 'products'}
+    if fields is None:
+        projected['products'] = [dict(product) for product in result.get('products', [])]
+    else:
+        projected['products'] = [
+            {field: product[field] for field in fields if field in product}
+            for product in result.get('products', [])
+        ]
+    return projected
+
+
+def _run_recommend_api(user_inputs, top_n):
+    """스레드 풀에서 실행 - 추천 시스템 로드/점수 계산 포함 (단계별 시간 trace는 응답에 넣지 않음)"""
+    recommender = get_recommender()
+    return recommender.recommend_many(user_inputs, top_n=top_n, trace=False), recommender.catalog_version
+
+
+def _recommend_api_error(message, status):
+    return JsonResponse({'error': message}, status=status, json_dumps_params={'ensure_ascii': False})
+
+
+@require_http_methods(['GET', 'POST'])
+async def recommend_api(request):
+    """
+    추천 JSON API (비동기 뷰)
+    GET  ?q=자연어 입력&top_n=5&fields=name,bank,rate
+    POST {"input": 문자열 또는 프로필} 또는 {"inputs": [...]} (일괄 추천), "top_n", "fields" (리스트 또는 쉼표 구분 문자열)
+    프로필: age, monthly_income, gender, married, purpose, holding_probabilities, filters
+    점수 계산은 고정 크기 스레드 풀에서 실행 (시간 초과 504, 대기열 초과 503, 잘못된 입력 400)
+    fields를 주면 각 상품에서 해당 키만 반환
+    """
+    if request.method == 'POST':
+        try:
+            payload = json.loads(request.body or b'{}')
+        except (ValueError, UnicodeDecodeError):
+            return _recommend_api_error('JSON 본문을 해석할 수 없습니다', 400)
+        if not isinstance(payload, dict):
+            return _recommend_api_error('JSON 본문은 객체여야 합니다', 400)
+    else:
+        payload = {'input': request.GET.get('q'), 'top_n': request.GET.get('top_n'), 'fields': request.GET.get('fields')}
+    
+    batch = 'inputs' in payload
+    user_inputs = payload['inputs'] if batch else [payload.get('input')]
+    if not isinstance(user_inputs, list) or not user_inputs:
+        return _recommend_api_error('inputs는 비어 있지 않은 리스트여야 합니다', 400)
+    if len(user_inputs) > RECOMMEND_API_MAX_BATCH:
+        return _recommend_api_error(f'한 번에 최대 {RECOMMEND_API_MAX_BATCH}개까지 요청할 수 있습니다', 400)
+    
+    try:
+        user_inputs = [parse_recommend_api_input(user_input) for user_input in user_inputs]
+        top_n = int(payload.get('top_n') or 5)
+        if not 1 <= top_n <= RECOMMEND_API_MAX_TOP_N:
+            raise ValueError(f'top_n은 1~{RECOMMEND_API_MAX_TOP_N} 사이여야 합니다')
+    except (TypeError, ValueError) as e:
+        return _recommend_api_error(str(e) or '잘못된 요청입니다', 400)
+    
+    fields = payload.get('fields')
+    if isinstance(fields, str):
+        fields = [field.strip() for field in fields.split(',') if field.strip()]
+    if fields is not None and not (isinstance(fields, list) and all(isinstance(field, str) for field in fields)):
+        return _recommend_api_error('fields는 문자열 리스트 또는 쉼표 구분 문자열이어야 합니다', 400)
+    
+    timeout = getattr(settings, 'RECOMMEND_API_TIMEOUT', 5.0)
+    try:
+        results, catalog_version = await recommendation_executor.run(
+            _run_recommend_api, user_inputs, top_n, timeout=timeout
+        )
+    except ValueError as e:
+        # 알 수 없는 필터 속성 등
+        return _recommend_api_error(str(e), 400)
+    except ExecutorBusy as e:
+        return _recommend_api_error(str(e), 503)
+    except TimeoutError as e:
+        return _recommend_api_error(str(e), 504)
+    
+    results = [project_recommendation(result, fields or None) for result in results]
+    body = {'results': results} if batch else {'result': results[0]}
+    body['catalog_version'] = catalog_version
+    return JsonResponse(body, json_dumps_params={'ensure_ascii': False})
+
+
+@require_http_methods(['GET'])
+def product_search_api(request):
+    """
+    상품 검색 JSON API (상품 DB + FTS5 검색 색인)
+    GET ?q=검색어&category=deposit&category=fund&max_risk=3&join_way=스마트폰&min_rate=3.5&page=1&per_page=10
+    결과는 관련도(bm25) 순, 검색어가 없으면 금리 높은 순 / facets: 종류·위험등급·가입 방법별 상품 수
+    """
+    if not search_available():
+        return _recommend_api_error('상품 검색 색인이 없습니다 (migrate 후 ingest_products 실행)', 503)
+    
+    try:
+        max_risk = int(request.GET['max_risk']) if request.GET.get('max_risk') else None
+        min_rate = float(request.GET['min_rate']) if request.GET.get('min_rate') else None
+        page = int(request.GET.get('page') or 1)
+        per_page = int(request.GET.get('per_page') or 10)
+    except ValueError:
+        return _recommend_api_error('max_risk, page, per_page는 정수, min_rate는 숫자여야 합니다', 400)
+    
+    categories = [
+        category for value in request.GET.getlist('category') for category in value.split(',') if category
+    ]
+    result = search_products(
+        request.GET.get('q', '').strip(),
+        categories=categories,
+        max_risk=max_risk,
+        join_way=request.GET.get('join_way') or None,
+        min_rate=min_rate,
+        page=page,
+        per_page=per_page,
+    )
+    return JsonResponse(result, json_dumps_params={'ensure_ascii': False})
+
+
+def recommender_metrics_view(request):
+    """
+    추천 시스템 단계별 지연 시간 히스토그램 스크레이프 엔드포인트
+    기본은 Prometheus 텍스트 형식, ?format=json이면 단계별 요약(p50/p95/p99) JSON
+    DEBUG, 스태프 사용자, INTERNAL_IPS에서만 접근 가능
+    """
+    internal_ips = getattr(settings, 'INTERNAL_IPS', ['127.0.0.1'])
+    if not (settings.DEBUG or request.user.is_staff or request.META.get('REMOTE_ADDR') in internal_ips):
+        return HttpResponseForbidden()
+    
+    cache_stats = None
+    if recommender_registry.is_loaded:
+        cache_stats = get_recommender().cache_stats()
+    user_cache_stats = user_recommendation_cache.stats()
+    file_cache_stats = product_file_cache.stats_snapshot()
+    file_cache_entries = product_file_cache.entries()
+    
+    if request.GET.get('format') == 'json':
+        return JsonResponse({
+            'stages': recommender_metrics.snapshot(),
+            'cache': cache_stats,
+            'user_cache': user_cache_stats,
+            'file_cache': dict(file_cache_stats, entries=file_cache_entries),
+            'catalog_version': recommender_registry.catalog_version,
+            'models': model_artifact_stats(),
+        })
+    
+    body = recommender_metrics.render_prometheus()
+    if cache_stats is not None:
+        body += (
+            "# TYPE recommender_cache_hits_total counter\n"
+            f"recommender_cache_hits_total{{level=\"local\"}} {cache_stats['local_hits']}\n"
+            f"recommender_cache_hits_total{{level=\"shared\"}} {cache_stats['shared_hits']}\n"
+            "# TYPE recommender_cache_misses_total counter\n"
+            f"recommender_cache_misses_total {cache_stats['misses']}\n"
+        )
+    body += (
+        "# TYPE user_recommendation_cache_hits_total counter\n"
+        f"user_recommendation_cache_hits_total {user_cache_stats['local_hits'] + user_cache_stats['shared_hits']}\n"
+        "# TYPE user_recommendation_cache_misses_total counter\n"
+        f"user_recommendation_cache_misses_total {user_cache_stats['misses']}\n"
+        "# TYPE user_recommendation_refreshes_total counter\n"
+        f"user_recommendation_refreshes_total {user_cache_stats['refreshes']}\n"
+    )
+    # 파일 기반 상품(펀드/주식/MMF) 변환 결과 캐시
+    for name in ('hits', 'loads', 'invalidations', 'missing'):
+        body += (
+            f"# TYPE product_file_cache_{name}_total counter\n"
+            f"product_file_cache_{name}_total {file_cache_stats[name]}\n"
+        )
+    body += "# TYPE product_file_cache_products gauge\n"
+    for entry in file_cache_entries:
+        body += f"product_file_cache_products{{file=\"{entry['file']}\"}} {entry['products']}\n"
+    return HttpResponse(body, content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+# 선호 카테고리에 따른 '전체' 추천 목적 문구
+PREFERRED_CATEGORY_INPUTS = {
+    'deposit': '안전한 예금상품',
+    'saving': '꾸준한 적금상품',
+    'fund': '전문가 운용 펀드',
+    'stock': '성장 가능성 높은 주식',
+    'mmf': '유동성 좋은 머니마켓펀드'
+}
+
+
+# 모델 보유 확률 1.0당 선호 카테고리 점수 가산점 (규칙 점수 차이가 작은 프로필에서 모델이 선호 카테고리를 결정)
+PREFERENCE_MODEL_WEIGHT = 5
+
+# 카탈로그 카테고리 → analyze_user_preference 카테고리 키
+PREFERENCE_KEYS = {'deposit': 'deposit', 'saving': 'saving', 'funds': 'fund', 'stocks': 'stock', 'mmf': 'mmf'}
+
+
+def build_ai_recommendation_input(profile, holding_probabilities=None):
+    """
+    '전체' 카테고리 추천 입력 생성
+    holding_probabilities: 모델 예측 카테고리별 보유 확률 (선호 카테고리 결정에 반영)
+    반환: (가상 사용자 입력, 선호 카테고리)
+    """
+    # 사용자 선호도 분석
+    preferred_category = analyze_user_preference(profile, holding_probabilities)
+    
+    # 선호 카테고리에 따른 목적 결정
+    purpose = PREFERRED_CATEGORY_INPUTS.get(preferred_category, '적금')
+    base_info_str = build_base_user_input(profile)
+    user_input = f"{base_info_str} {purpose}" if base_info_str else purpose
+    
+    # 가상 사용자 입력 생성
+    return user_input + ' 추천해주세요', preferred_category
+
+
+def convert_ai_recommendations(result, preferred_category):
+    """추천 결과를 템플릿에서 사용할 수 있는 형식으로 변환"""
+    recommended_products = []
+    for product in result.get('products', []):
+        # 종류/금융회사 코드는 상세 색인에서 상품 코드로 찾음 (색인에 없을 때만 이름으로 추정)
+        located = product_detail_index.locate(product.get('product_id'), product['bank'])
+        if located:
+            product_type = located['product_type']
+            product_type_name = dict(FinancialProduct.CATEGORY_CHOICES)[product_type]
+        else:
+            product_type = get_product_type_from_ai_result(product)
+            product_type_name = get_product_type_name_from_ai_result(product)
+        
+        # 기존 상품 형식에 맞게 변환
+        converted_product = {
+            'fin_prdt_cd': product.get('product_id'),
+            'fin_co_no': located['company_code'] if located else '',
+            'fin_prdt_nm': product['name'],
+            'kor_co_nm': product['bank'],
+            'join_way': product.get('join_way', '온라인 가입 가능'),
+            'product_type': product_type,
+            'product_type_name': product_type_name,
+            'rate': product.get('rate', 0),
+            'return_rate': product.get('rate', 0),  # 펀드/MMF용
+            'score': product.get('score', 0),
+            'preferred_category': preferred_category  # 선호 카테고리 추가
+        }
+        recommended_products.append(converted_product)
+    return recommended_products
+
+
 def get_ai_recommendations_for_user(user):
     """
     로그인한 사용자에게 AI 추천 상품 제공
@@ -431,89 +756,16 @@ def get_ai_recommendations_for_user(user):
     '전체' 카테고리에서는 사용자가 선호할 가능성이 가장 높은 카테고리 상품 3개 추천
     """
     try:
-        profile = user.profile
-        
-        # 사용자 선호도 분석
-        preferred_category = analyze_user_preference(profile)
-        print(f"사용자 {user.username}의 선호 카테고리: {preferred_category}")
-        
-        # 선호 카테고리 기반으로 추천 입력 생성
-        user_input_parts = []
-        
-        # 연령대 정보
-        age_map = {
-            1: '23세',  # 18-25세
-            2: '30세',  # 26-35세 
-            3: '40세',  # 36-45세
-            4: '50세',  # 46-55세
-            5: '60세',  # 56-65세
-            6: '70세'   # 66세 이상
-        }
-        
-        if profile.연령대분류:
-            user_input_parts.append(age_map.get(profile.연령대분류, '30세'))
-        
-        # 성별 정보
-        if profile.가구주성별 == 1:
-            user_input_parts.append('남성')
-        elif profile.가구주성별 == 2:
-            user_input_parts.append('여성')
-        
-        # 결혼 상태
-        if profile.결혼상태 == 1:
-            user_input_parts.append('기혼')
-        elif profile.결혼상태 == 2:
-            user_input_parts.append('미혼')
-        
-        # 직업 및 소득 추정
-        income_map = {
-            1: '월급 350만원',  # 일반 직장인
-            2: '월급 600만원',  # 고소득 전문직
-            3: '연금 수급자',   # 은퇴자
-            4: '월급 200만원'   # 저소득층
-        }
-        
-        if profile.직업분류1:
-            user_input_parts.append(income_map.get(profile.직업분류1, '월급 300만원'))
-        
-        # 선호 카테고리에 따른 목적 결정
-        category_purpose_map = {
-            'deposit': '안전한 예금상품',
-            'saving': '꾸준한 적금상품',
-            'fund': '전문가 운용 펀드',
-            'stock': '성장 가능성 높은 주식',
-            'mmf': '유동성 좋은 머니마켓펀드'
-        }
-        purpose = category_purpose_map.get(preferred_category, '적금')
-        user_input_parts.append(purpose)
-        
-        # 가상 사용자 입력 생성
-        user_input = ' '.join(user_input_parts) + ' 추천해주세요'
+        # AI 추천 시스템 호출 (프로세스 공유 인스턴스)
+        recommender = get_recommender()
+        holding_probabilities = recommender.predict_holding_probabilities([user.profile])[0]
         
+        user_input, preferred_category = build_ai_recommendation_input(user.profile, holding_probabilities)
         print(f"사용자 {user.username}에 대한 AI 추천 입력: {user_input}")
-        
-        # AI 추천 시스템 호출
-        from .matching import HighPerformanceFinancialRecommender
-        recommender = HighPerformanceFinancialRecommender()
+        user_input = with_holding_probabilities(recommender, [user_input], holding_probabilities)[0]
         result = recommender.recommend(user_input, top_n=3)  # 3개 추천
         
-        # 추천 결과를 템플릿에서 사용할 수 있는 형식으로 변환
-        recommended_products = []
-        for product in result.get('products', []):
-            # 기존 상품 형식에 맞게 변환
-            converted_product = {
-                'fin_prdt_nm': product['name'],
-                'kor_co_nm': product['bank'],
-                'join_way': product.get('join_way', '온라인 가입 가능'),
-                'product_type': get_product_type_from_ai_result(product),
-                'product_type_name': get_product_type_name_from_ai_result(product),
-                'rate': product.get('rate', 0),
-                'return_rate': product.get('rate', 0),  # 펀드/MMF용
-                'score': product.get('score', 0),
-                'preferred_category': preferred_category  # 선호 카테고리 추가
-            }
-            recommended_products.append(converted_product)
-        
+        recommended_products = convert_ai_recommendations(result, preferred_category)
         print(f"AI 추천 완료: {len(recommended_products)}개 상품 추천 (선호 카테고리: {preferred_category})")
         return recommended_products
         
@@ -524,10 +776,90 @@ def get_ai_recommendations_for_user(user):
         return None
 
 
-def analyze_user_preference(profile):
+def compute_user_recommendations(recommender, profiles):
+    """
+    여러 프로필의 '전체' 추천 + 카테고리별 추천을 한 번의 배치 호출로 계산
+    반환: 프로필 순서대로 ('전체' 추천 상품 리스트, 카테고리별 추천 컨텍스트 dict) 리스트
+    """
+    holding_probabilities = recommender.predict_holding_probabilities(profiles)
+    
+    user_inputs = []
+    preferred_categories = []
+    for profile, probabilities in zip(profiles, holding_probabilities):
+        user_input, preferred_category = build_ai_recommendation_input(profile, probabilities)
+        category_inputs = build_category_inputs(profile)
+        user_inputs.extend(with_holding_probabilities(
+            recommender, [user_input] + list(category_inputs.values()), probabilities
+        ))
+        preferred_categories.append(preferred_category)
+    
+    results = recommender.recommend_many(user_inputs, top_n=3)
+    
+    recommendations = []
+    stride = 1 + len(CATEGORY_INPUTS)
+    for i, preferred_category in enumerate(preferred_categories):
+        profile_results = results[i * stride:(i + 1) * stride]
+        recommended_products = convert_ai_recommendations(profile_results[0], preferred_category)
+        category_recommendations = {
+            f'recommended_{category_key}': convert_category_products(category_key, result)
+            for category_key, result in zip(CATEGORY_INPUTS, profile_results[1:])
+        }
+        recommendations.append((recommended_products, category_recommendations))
+    return recommendations
+
+
+def compute_profile_recommendations(recommender, profile):
+    """
+    한 프로필의 ('전체' 추천, 카테고리별 추천) 계산 후 사용자 캐시에 저장
+    사전 계산 테이블이 현재 카탈로그 기준이면 테이블 결과, 아니면 한 번의 배치 호출로 계산
+    """
+    start_time = time.perf_counter()
+    recommendations = recommendation_table.lookup(profile, recommender.catalog_version)
+    if recommendations is None:
+        recommendations = compute_user_recommendations(recommender, [profile])[0]
+    compute_ms = (time.perf_counter() - start_time) * 1000
+    user_recommendation_cache.set(profile, recommender.catalog_version, recommendations, compute_ms)
+    return recommendations
+
+
+def refresh_user_recommendations(profile):
+    """프로필 저장 후 백그라운드 갱신 작업 (signals.py에서 사용)"""
+    return compute_profile_recommendations(get_recommender(), profile)
+
+
+def get_user_recommendations(user):
+    """
+    상품 목록 페이지용 '전체' 추천 + 카테고리별 추천 생성
+    사용자 캐시(프로필 updated_at + 카탈로그 버전 키)에 있으면 추천 계산 없이 반환
+    - 프로필이 저장되면 백그라운드에서 새 키로 미리 계산해 두므로 대부분 캐시 적중
+    없으면 사전 계산 테이블 조회 또는 한 번의 배치 호출로 직접 계산 후 저장
+    반환: ('전체' 추천 상품 리스트 또는 None, 카테고리별 추천 컨텍스트 dict)
+    """
+    try:
+        profile = user.profile
+        recommender = get_recommender()
+        
+        cached = user_recommendation_cache.get(profile, recommender.catalog_version)
+        if cached is not None:
+            print(f"사용자 {user.username} 추천 캐시 적중")
+            return cached
+        
+        recommended_products, category_recommendations = compute_profile_recommendations(recommender, profile)
+        print(f"사용자 {user.username} 추천 완료: 전체 {len(recommended_products or [])}개 + {len(category_recommendations)}개 카테고리")
+        return recommended_products, category_recommendations
+        
+    except Exception as e:
+        print(f"AI 추천 오류: {e}")
+        import traceback
+        traceback.print_exc()
+        return None, {}
+
+
+def analyze_user_preference(profile, holding_probabilities=None):
     """
     사용자 프로필을 분석하여 선호할 가능성이 가장 높은 상품 카테고리 결정
     펀드, 주식, MMF도 더 선호되도록 개선
+    holding_probabilities가 있으면 모델 예측 보유 확률 x PREFERENCE_MODEL_WEIGHT를 카테고리 점수에 더함
     """
     # 기본값 설정
     risk_attitude = profile.금융위험태도 or 0
@@ -593,6 +925,12 @@ def analyze_user_preference(profile):
         scores['fund'] += 2
         scores['stock'] += 1
     
+    # 4. 모델 예측 보유 확률 (카탈로그 카테고리 → 선호 카테고리 키)
+    for category, probability in (holding_probabilities or {}).items():
+        preference_key = PREFERENCE_KEYS.get(category)
+        if preference_key:
+            scores[preference_key] += probability * PREFERENCE_MODEL_WEIGHT
+    
     # 가장 높은 점수의 카테고리 반환
     preferred_category = max(scores, key=scores.get)
     